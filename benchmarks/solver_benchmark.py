@@ -0,0 +1,227 @@
+"""
+Full-corpus solver benchmark.
+
+Plays the assistant's top-ranked suggestion as an automated solver against every
+common word and reports the guess-count distribution, failure rate, wall time,
+per-turn add_guess/rank_candidates latency and peak RSS. Results are printed and written as JSON
+so runs can be compared between versions.
+
+Usage:
+    python -m benchmarks.solver_benchmark --strategy entropy --workers 4 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.feedback import feedback_pattern
+from wordle_assistant.game_manager import WordleUser
+from wordle_assistant.ranking import rank_candidates
+
+
+def peak_rss_mb(who: int = resource.RUSAGE_SELF) -> float:
+    """
+    Returns the peak resident set size in MB (ru_maxrss is KB on Linux and bytes on macOS).
+    """
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def play_game(answer: str, strategy: str, max_turns: int) -> Dict[str, Any]:
+    """
+    Plays one game, always guessing the top-ranked remaining word.
+
+    Args:
+      answer (str): The hidden answer.
+      strategy (str): Ranking strategy passed to rank_candidates().
+      max_turns (int): Turns allowed before the game is abandoned.
+
+    Returns:
+      Dict[str, Any]: The guesses made, whether the answer was found, and per-turn latencies in ms.
+    """
+    user = WordleUser("benchmark")
+    user.answer = answer
+    add_guess_ms, rank_ms = [], []
+
+    while len(user.guesses) < max_turns:
+        start = time.perf_counter()
+        ids, _ = rank_candidates(user.corpus, user.candidates, strategy, limit=1)
+        rank_ms.append((time.perf_counter() - start) * 1000)
+
+        if not len(ids):
+            break
+        guess = str(user.corpus.words[ids[0]])
+
+        letter_state = feedback_pattern(guess, answer)
+        start = time.perf_counter()
+        user.add_guess(guess, letter_state)
+        add_guess_ms.append((time.perf_counter() - start) * 1000)
+
+        if guess == answer:
+            break
+
+    return {
+        "answer": answer,
+        "guesses": list(user.guesses),
+        "solved": bool(user.guesses) and user.guesses[-1] == answer,
+        "add_guess_ms": add_guess_ms,
+        "rank_ms": rank_ms,
+    }
+
+
+def play_games(answers: List[str], strategy: str, max_turns: int) -> Dict[str, Any]:
+    """
+    Plays a batch of games in one worker process.
+    """
+    # Load the shared corpus before timing anything
+    corpus = get_corpus()
+    if strategy != "frequency":
+        corpus.patterns
+    games = [play_game(answer, strategy, max_turns) for answer in answers]
+    return {"games": games, "peak_rss_mb": peak_rss_mb()}
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarizes latency samples in ms.
+    """
+    if not samples:
+        return {"count": 0, "p50": None, "p99": None, "mean": None, "max": None}
+    values = np.asarray(samples)
+    return {
+        "count": len(values),
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "mean": round(float(values.mean()), 3),
+        "max": round(float(values.max()), 3),
+    }
+
+
+def git_revision() -> Optional[str]:
+    """
+    Returns the current git commit, if the benchmark runs from a checkout.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=config.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure_user_memory(n_users: int = 1000) -> float:
+    """
+    Measures the memory held per WordleUser after one guess, in KB.
+
+    Args:
+      n_users (int): Number of users to create. Defaults to 1000.
+
+    Returns:
+      float: Traced allocation growth divided by the number of users.
+    """
+    get_corpus()  # The shared corpus is not part of the per-user cost
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    users = []
+    for i in range(n_users):
+        user = WordleUser(f"user-{i}")
+        user.add_guess("crate", (0, 2, 1, 0, 0))
+        users.append(user)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used / n_users / 1024
+
+
+def run_benchmark(strategy: str, workers: int, limit: int = None, max_turns: int = 12, chunk_size: int = 32) -> Dict[str, Any]:
+    """
+    Plays every common answer (or the first `limit`) across a process pool and aggregates the results.
+
+    Args:
+      strategy (str): Ranking strategy passed to rank_candidates().
+      workers (int): Number of worker processes.
+      limit (int): Optional number of answers to play, for quick runs.
+      max_turns (int): Turns allowed per game before it is abandoned. Defaults to 12.
+      chunk_size (int): Answers sent to a worker per task. Defaults to 32.
+
+    Returns:
+      Dict[str, Any]: The benchmark report.
+    """
+    corpus = get_corpus()
+    answers = corpus.words[corpus.answer_ids].tolist()[:limit]
+    chunks = [answers[i:i + chunk_size] for i in range(0, len(answers), chunk_size)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(play_games, chunks, [strategy] * len(chunks), [max_turns] * len(chunks)))
+    wall_time = time.perf_counter() - start
+
+    games = [game for result in results for game in result["games"]]
+    solved = [len(game["guesses"]) for game in games if game["solved"]]
+    distribution = Counter(solved)
+    failures = sum(1 for game in games if not game["solved"] or len(game["guesses"]) > config.MAX_GUESSES)
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "strategy": strategy,
+        "workers": workers,
+        "games": len(games),
+        "distribution": {str(turns): distribution[turns] for turns in sorted(distribution)},
+        "mean_guesses": round(float(np.mean(solved)), 4) if solved else None,
+        "failure_rate": round(failures / len(games), 6) if games else None,
+        "failed_answers": [game["answer"] for game in games if not game["solved"] or len(game["guesses"]) > config.MAX_GUESSES],
+        "wall_time_s": round(wall_time, 3),
+        "latency_ms": {
+            "add_guess": percentiles([ms for game in games for ms in game["add_guess_ms"]]),
+            "rank_candidates": percentiles([ms for game in games for ms in game["rank_ms"]]),
+        },
+        "peak_rss_mb": {
+            "worker_max": round(max(result["peak_rss_mb"] for result in results), 1) if results else None,
+            "children": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        },
+        "memory_per_user_kb": round(measure_user_memory(), 2),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """
+    Prints a human-readable summary of a benchmark report.
+    """
+    print(f"Strategy: {report['strategy']} | games: {report['games']} | workers: {report['workers']} | wall time: {report['wall_time_s']}s")
+    print(f"Mean guesses: {report['mean_guesses']} | failure rate: {report['failure_rate']:.2%}")
+    print("Guess distribution: " + ", ".join(f"{turns}: {count}" for turns, count in report["distribution"].items()))
+    for name, stats in report["latency_ms"].items():
+        print(f"{name}: p50 {stats['p50']} ms | p99 {stats['p99']} ms | n={stats['count']}")
+    print(f"Peak RSS per worker: {report['peak_rss_mb']['worker_max']} MB | memory per user: {report['memory_per_user_kb']} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the assistant as an automated solver over every common answer.")
+    parser.add_argument("--strategy", type=str, choices=config.RANK_STRATEGIES, default=config.DEFAULT_RANK_STRATEGY, help="Word ranking strategy.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--limit", type=int, default=None, help="Only play the first N common answers.")
+    parser.add_argument("--max-turns", type=int, default=12, help="Turns allowed per game before giving up.")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this path.")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.strategy, args.workers, args.limit, args.max_turns)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
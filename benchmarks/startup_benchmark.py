@@ -0,0 +1,76 @@
+"""
+Cold-start benchmark.
+
+Times fresh interpreter processes doing the work the CLI does before its first
+prompt, loading the corpus either from the prebuilt artifact or from the CSVs,
+and records whether pandas was imported along the way.
+
+Usage:
+    python -m benchmarks.startup_benchmark --repeat 10 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import *
+from wordle_assistant import core_config as config
+
+REPO_DIR = os.path.dirname(config.BASE_DIR)
+
+SCENARIOS = {
+    "interpreter": "pass",
+    "cli_imports": "import wordle_cli.__main__",
+    "corpus_artifact": "import wordle_cli.__main__\nfrom wordle_assistant.corpus import get_corpus\nget_corpus()",
+    "corpus_csv": (
+        "import wordle_cli.__main__\nfrom wordle_assistant.core import create_words_df\n"
+        "from wordle_assistant.corpus import WordCorpus\nWordCorpus.from_df(create_words_df())"
+    ),
+    "first_prompt": (
+        "import wordle_cli.__main__\nfrom wordle_assistant.corpus import get_corpus\n"
+        "from wordle_assistant.opening_book import get_opening_book\n"
+        "get_corpus()\nget_opening_book('frequency').shortlist(())"
+    ),
+}
+
+
+def time_scenario(code: str, repeat: int) -> Dict[str, Any]:
+    """
+    Runs a snippet in `repeat` fresh interpreters and summarizes the wall time in ms.
+    """
+    probe = f"{code}\nimport sys\nprint('pandas' in sys.modules)"
+    samples = []
+    pandas_loaded = False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", probe], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+        pandas_loaded = result.stdout.strip().endswith("True")
+    return {
+        "min_ms": round(min(samples), 1),
+        "median_ms": round(statistics.median(samples), 1),
+        "pandas_imported": pandas_loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the assistant in fresh processes.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per scenario.")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this path.")
+    args = parser.parse_args()
+
+    # Make sure caches exist so the timings measure loading, not building
+    subprocess.run([sys.executable, "-c", SCENARIOS["first_prompt"]], cwd=REPO_DIR, check=True)
+
+    report = {name: time_scenario(code, args.repeat) for name, code in SCENARIOS.items()}
+    for name, stats in report.items():
+        print(f"{name}: min {stats['min_ms']} ms | median {stats['median_ms']} ms | pandas imported: {stats['pandas_imported']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
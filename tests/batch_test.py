@@ -0,0 +1,50 @@
+import io
+import json
+from wordle_assistant.batch import read_games, replay_games
+from wordle_assistant.feedback import feedback_pattern
+from wordle_assistant.game_manager import WordleUser
+from wordle_assistant.opening_book import OpeningBook
+
+def test_replay_matches_user_filtering():
+    """
+    Test that batch replay gives the same candidates as replaying each game through a WordleUser.
+    """
+    histories = [("pious", ["crate", "sling"]), ("eerie", ["speed", "there", "eerie"]), ("crane", [])]
+    lines = []
+    for game_id, (answer, guesses) in enumerate(histories):
+        letter_states = [feedback_pattern(guess, answer) for guess in guesses]
+        lines.append(json.dumps({"id": game_id, "guesses": guesses, "letter_states": letter_states}))
+    lines.insert(1, "{broken")
+    lines.append(json.dumps({"id": 9, "guesses": ["crate"], "letter_states": []}))
+
+    results = list(replay_games(read_games(io.StringIO("\n".join(lines))), strategy="frequency", chunk_size=2))
+    assert len(results) == 5
+    assert "error" in results[1] and results[4]["error"]
+
+    for result, (answer, guesses) in zip([results[0], results[2], results[3]], histories):
+        user = WordleUser("replay")
+        for guess in guesses:
+            user.add_guess(guess, feedback_pattern(guess, answer))
+        assert result["remaining"] == int(user.candidates.sum())
+        assert [turn["guess"] for turn in result["turns"]] == guesses
+        assert all(turn["recommended"] for turn in result["turns"])
+    assert results[2]["solved"] and results[2]["candidates"] == ["eerie"]
+
+def test_shared_histories_are_ranked_once(monkeypatch):
+    """
+    Test that games with the same history share one ranking per turn and that non-list fields are rejected.
+    """
+    calls = []
+    shortlist = OpeningBook.shortlist
+    def count_calls(book, key, candidates=None):
+        calls.append(key)
+        return shortlist(book, key, candidates)
+    monkeypatch.setattr(OpeningBook, "shortlist", count_calls)
+
+    guesses = ["crate", "sling"]
+    games = [{"guesses": guesses, "letter_states": [feedback_pattern(guess, "pious") for guess in guesses]}] * 3
+    games.append({"guesses": "crate", "letter_states": ["02100"]})
+    results = list(replay_games(games, strategy="frequency"))
+    assert len(calls) == len(set(calls)) == 3  # Before each guess, and the final state
+    assert results[0] == results[1] == results[2] and results[0]["suggestions"]
+    assert results[3]["error"] == "'guesses' must be a JSON array."
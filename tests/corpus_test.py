@@ -0,0 +1,84 @@
+from wordle_assistant import core_config as config
+from wordle_assistant.core import create_words_df
+from wordle_assistant.corpus import WordCorpus, get_corpus, load_corpus_records
+from wordle_assistant.game_manager import WordleGame
+
+def test_corpus_is_shared():
+    """
+    Test that every user shares one corpus and only keeps a candidate mask.
+    """
+    game = WordleGame()
+    game.add_user("alice")
+    game.add_user("bob")
+
+    alice, bob = game.users["alice"], game.users["bob"]
+    assert alice.corpus is bob.corpus is get_corpus()
+    assert alice.candidates.all() and alice.candidates is not bob.candidates
+    assert alice.answer in get_corpus()
+
+def test_filter_updates_candidates():
+    """
+    Test that guesses narrow the user's candidate mask without touching the corpus.
+    """
+    game = WordleGame()
+    game.add_user("alice")
+    user = game.users["alice"]
+    user.answer = "crane"
+    game.process_guess_feedback("alice", "crate")
+
+    assert user.candidates.sum() < get_corpus().size
+    assert user.candidates[get_corpus().index_of("crane")]
+    word_list_df = user.word_list_df
+    assert not word_list_df.loc[word_list_df["word"] == "crane", "eliminated"].any()
+
+def test_incremental_filter_and_undo():
+    """
+    Test that incremental filtering matches a full replay and that undo restores the previous candidates.
+    """
+    game = WordleGame()
+    game.add_user("alice")
+    user = game.users["alice"]
+    user.add_guess("crate", (0, 2, 1, 0, 0))
+    after_first = user.candidates.copy()
+    user.add_guess("sough", (0, 0, 0, 0, 0))
+    incremental = user.candidates.copy()
+
+    user.filter_word_list()
+    assert (user.candidates == incremental).all()
+
+    assert user.undo_guess() == ("sough", (0, 0, 0, 0, 0))
+    assert (user.candidates == after_first).all()
+    assert user.guesses == ["crate"]
+
+def test_candidates_are_packed():
+    """
+    Test that each user stores its candidates as one bit per corpus word.
+    """
+    game = WordleGame()
+    game.add_user("alice")
+    user = game.users["alice"]
+    user.add_guess("crate", (0, 2, 1, 0, 0))
+    assert user._packed_candidates.nbytes == (get_corpus().size + 7) // 8
+    assert user.candidates.dtype == bool and len(user.candidates) == get_corpus().size
+
+def test_corpus_artifact(tmp_path, monkeypatch):
+    """
+    Test that the prebuilt corpus matches the CSV loader and is rebuilt when a source list changes.
+    """
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    common_path, valid_path = tmp_path / "common.csv", tmp_path / "valid.csv"
+    common_path.write_text("Crane\nslate\n")
+    valid_path.write_text("crane\nabbey\n\nzonal\n")
+
+    records = load_corpus_records(str(common_path), str(valid_path))
+    corpus = WordCorpus.from_records(records)
+    assert corpus.words.tolist() == ["abbey", "crane", "slate", "zonal"]
+    assert corpus.common.tolist() == [False, True, True, False]
+    assert (load_corpus_records(str(common_path), str(valid_path)) == records).all()
+
+    valid_path.write_text("crane\nabbey\n")
+    assert len(load_corpus_records(str(common_path), str(valid_path))) == 3
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    full = WordCorpus.from_df(create_words_df())
+    assert (get_corpus().words == full.words).all() and (get_corpus().common == full.common).all()
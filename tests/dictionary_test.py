@@ -0,0 +1,141 @@
+import gc
+import json
+import os
+import weakref
+import numpy as np
+import pytest
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import corpus_artifact_path, get_corpus, read_word_list
+from wordle_assistant.dictionary import apply_diff, check_sources, fix_sources, has_issues, read_diff
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.letter_index import LetterIndex
+from wordle_assistant.opening_book import OpeningBook, get_opening_book
+from wordle_assistant.pattern_matrix import build_pattern_matrix
+
+def write_lists(tmp_path, monkeypatch, step=40):
+    """
+    Points the default variant at small copies of the bundled lists, reloaded on every call.
+
+    Returns the common and valid words and a few other words to add.
+    """
+    common = read_word_list(config.WORDLE_COMMON_WORDS)[::step]
+    valid = sorted(set(read_word_list(config.WORDLE_VALID_WORDS)[::step]).union(common))
+    spare = [word for word in read_word_list(config.WORDLE_COMMON_WORDS)[1::step] if word not in valid][:2]
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "WORDLE_COMMON_WORDS", str(tmp_path / "common.csv"))
+    monkeypatch.setattr(config, "WORDLE_VALID_WORDS", str(tmp_path / "valid.csv"))
+    monkeypatch.setattr(config, "CORPUS_RELOAD_INTERVAL", 0)
+    (tmp_path / "common.csv").write_text("".join(f"{word}\n" for word in common))
+    (tmp_path / "valid.csv").write_text("".join(f"{word}\n" for word in valid))
+    return common, valid, spare
+
+def test_check_and_fix(tmp_path, monkeypatch):
+    """
+    Test that malformed source entries are reported and rewritten in canonical form.
+    """
+    write_lists(tmp_path, monkeypatch)
+    (tmp_path / "common.csv").write_text("crane\nFALSE\nabbey\nabbey\n")
+    (tmp_path / "valid.csv").write_text("crane\nabbey\nxyz\nfalse\n")
+    (tmp_path / "copy.txt").write_text("abbey\ncrane\nfalse\n")
+    report = check_sources()
+    assert report["common"] == {"case": ["FALSE"], "malformed": [], "duplicates": ["abbey"], "unsorted": ["abbey"]}
+    assert report["valid"]["malformed"] == ["xyz"] and report["valid"]["unsorted"] == ["abbey", "false"]
+    assert report["copies"] == [str(tmp_path / "copy.txt")] and not report["common_not_valid"]
+
+    (tmp_path / "common.csv").write_text("crane\nFALSE\nabbey\nmoist\n")
+    assert check_sources()["common_not_valid"] == ["moist"]
+    assert fix_sources() == (4, 4)
+    assert (tmp_path / "valid.csv").read_text() == "abbey\ncrane\nfalse\nmoist\n"
+    (tmp_path / "copy.txt").unlink()
+    assert not has_issues(check_sources())
+
+def test_apply_diff_updates_artifacts(tmp_path, monkeypatch):
+    """
+    Test that the incrementally updated index, pattern matrix and opening book match full rebuilds.
+    """
+    common, valid, spare = write_lists(tmp_path, monkeypatch)
+    previous = get_corpus()
+    previous.index, previous.patterns
+    book = OpeningBook(previous, "frequency")
+    book.precompute(2)
+    book.save()
+
+    uncommon = [word for word in valid if word not in common]
+    diff = {"add": {spare[0]: "common", spare[1]: "uncommon"}, "remove": [uncommon[0], common[-1]], "rarity": {common[0]: "uncommon"}}
+    report = apply_diff(diff)
+    corpus = get_corpus()
+    assert corpus is not previous and corpus.version == report["version"] != previous.version
+    assert spare[0] in corpus and uncommon[0] not in corpus and not corpus.common[corpus.index_of(common[0])]
+
+    index = LetterIndex(corpus.words, corpus.alphabet)
+    assert all(np.array_equal(getattr(corpus.index, name), getattr(index, name)) for name in ("at", "contains", "counts"))
+    assert report["pattern_matrix"] is not None
+    assert np.array_equal(corpus.patterns, build_pattern_matrix(corpus.codes, corpus.codes[corpus.answer_ids]))
+
+    entry = report["opening_books"]["frequency"]
+    assert entry["kept"] and entry["computed"]
+    rebuilt = OpeningBook(corpus, "frequency")
+    rebuilt.precompute(2)
+    assert OpeningBook.load(corpus, "frequency").entries == rebuilt.entries
+
+def test_hot_reload(tmp_path, monkeypatch):
+    """
+    Test that new games get a new corpus version while running games keep theirs.
+    """
+    common, valid, spare = write_lists(tmp_path, monkeypatch)
+    game = WordleGame()
+    game.add_user("hana", answer=common[3])
+    game.process_guess_feedback("hana", common[5])
+    old = game.users["hana"].corpus
+
+    apply_diff({"add": {spare[0]: "common"}, "remove": [common[7]], "rarity": {}})
+    game.add_user("dora", answer=spare[0])
+    assert game.users["dora"].corpus is get_corpus() is not old
+    assert game.process_guess_feedback("dora", spare[0]) == (1,) * 5
+    assert get_corpus(version=old.version) is old
+    assert get_opening_book("frequency", version=old.version).corpus is old
+    game.process_guess_feedback("hana", common[3])
+    assert game.users["hana"].completed and game.users["hana"].corpus is old
+
+def test_index_update_with_word_before_first(tmp_path, monkeypatch):
+    """
+    Test that adding a word sorting before the current first word keeps the index exact.
+    """
+    common, valid, spare = write_lists(tmp_path, monkeypatch)
+    previous = get_corpus()
+    previous.index
+    first = "aaaaa"  # Sorts before every word of the lists
+    apply_diff({"add": {first: "common", spare[0]: "uncommon"}, "remove": [], "rarity": {}})
+    corpus = get_corpus()
+    assert corpus.words[0] == first and "index" in corpus.__dict__
+    index = LetterIndex(corpus.words, corpus.alphabet)
+    assert all(np.array_equal(getattr(corpus.index, name), getattr(index, name)) for name in ("at", "contains", "counts"))
+
+def test_old_versions_are_freed(tmp_path, monkeypatch):
+    """
+    Test that corpus versions no game holds are freed and only recent versions keep artifacts.
+    """
+    common, valid, spare = write_lists(tmp_path, monkeypatch, step=37)  # A version no other test loaded
+    monkeypatch.setattr(config, "CORPUS_CACHE_SIZE", 1)
+    first = weakref.ref(get_corpus())
+    first_path = corpus_artifact_path(length=5, version=first().version)
+    get_opening_book("frequency")
+    assert os.path.exists(first_path)
+
+    apply_diff({"add": {spare[0]: "common"}, "remove": [], "rarity": {}})
+    report = apply_diff({"add": {spare[1]: "common"}, "remove": [], "rarity": {}})
+    assert report["pruned"] == [first_path] and not os.path.exists(first_path)
+    gc.collect()
+    assert first() is None
+
+def test_read_diff_checks_section_types(tmp_path):
+    """
+    Test that sections of the wrong JSON type are rejected with a ValueError.
+    """
+    path = tmp_path / "diff.json"
+    path.write_text(json.dumps({"add": {" Crane": "common"}, "remove": ["MOIST"]}))
+    assert read_diff(str(path)) == {"add": {"crane": "common"}, "remove": ["moist"], "rarity": {}}
+    for diff in ({"add": ["crane"]}, {"rarity": ["crane"]}, {"remove": {"moist": 1}}, {"remove": "moist"}, {"add": None}):
+        path.write_text(json.dumps(diff))
+        with pytest.raises(ValueError, match="section of a diff must be"):
+            read_diff(str(path))
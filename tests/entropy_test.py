@@ -0,0 +1,29 @@
+import numpy as np
+from wordle_assistant.core import get_word_rank
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.entropy import expected_information, expected_remaining, pattern_entropy
+
+def test_pattern_entropy():
+    """
+    Test entropy and expected remaining candidates on hand-made pattern rows.
+    """
+    patterns = np.array([[0, 0, 0, 0], [0, 0, 1, 1], [0, 1, 2, 3]], dtype=np.uint8)
+    assert np.allclose(pattern_entropy(patterns), [0.0, 1.0, 2.0])
+    assert np.allclose(expected_remaining(patterns), [4.0, 2.0, 1.0])
+
+def test_information_rank():
+    """
+    Test that the information strategies rank guesses that split the candidates well first.
+    """
+    corpus = get_corpus()
+    word_list_df = corpus.to_df(corpus.full_mask())
+    for strategy in ["entropy", "remaining"]:
+        ranked_df = get_word_rank(word_list_df, strategy)
+        assert len(ranked_df) == len(word_list_df)
+        assert ranked_df["word"].iloc[0] in ["soare", "roate", "raise", "slate"]
+
+    # With two candidates left, a candidate beats a word that cannot be the answer
+    candidates = np.zeros(corpus.size, dtype=bool)
+    candidates[[corpus.index_of("crane"), corpus.index_of("crate")]] = True
+    scores = expected_information(corpus, candidates)
+    assert corpus.words[scores.argmax()] in ["crane", "crate"]
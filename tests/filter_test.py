@@ -0,0 +1,65 @@
+from wordle_assistant.core import *
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.feedback import feedback_pattern, feedback_patterns, pattern_id, pattern_to_state
+
+def naive_feedback(guess, answer):
+    """
+    Reference Wordle scoring, one letter at a time.
+    """
+    states = [0] * len(guess)
+    remaining = list(answer)
+    for i, letter in enumerate(guess):
+        if answer[i] == letter:
+            states[i] = 1
+            remaining.remove(letter)
+    for i, letter in enumerate(guess):
+        if states[i] == 0 and letter in remaining:
+            states[i] = 2
+            remaining.remove(letter)
+    return tuple(states)
+
+CASES = [("crate", "trace"), ("speed", "abide"), ("eerie", "there"), ("llama", "hello"), ("sassy", "essay"), ("aaaaa", "banal")]
+
+def test_feedback_duplicate_letters():
+    """
+    Test that repeated guess letters are only yellow for the copies the answer still has.
+    """
+    assert feedback_pattern("speed", "abide") == (0, 0, 2, 0, 2)
+    assert feedback_pattern("eerie", "there") == (2, 0, 2, 0, 1)
+    for guess, answer in CASES:
+        assert feedback_pattern(guess, answer) == naive_feedback(guess, answer)
+
+def test_vectorized_patterns_match_reference():
+    """
+    Test the batched engine against the reference on a slice of the corpus.
+    """
+    corpus = get_corpus()
+    answers = corpus.words[::97]
+    for guess in ["crate", "speed", "llama", "sassy"]:
+        patterns = feedback_patterns(encode_words([guess])[0], corpus.codes[::97])
+        expected = [pattern_id(naive_feedback(guess, answer)) for answer in answers]
+        assert patterns.tolist() == expected
+    assert pattern_to_state(pattern_id((2, 0, 1, 1, 0))) == (2, 0, 1, 1, 0)
+
+def test_filter_keeps_matching_patterns():
+    """
+    Test that filtering keeps exactly the words that would give the observed feedback.
+    """
+    corpus = get_corpus()
+    for guess, answer in CASES:
+        letter_state = naive_feedback(guess, answer)
+        mask = wordle_filter_mask(corpus.codes, [guess], [letter_state])
+        expected = [word for word in corpus.words if naive_feedback(guess, word) == letter_state]
+        assert list(corpus.words[mask]) == expected
+
+def test_wordle_filter_marks_eliminated():
+    """
+    Test that wordle_filter keeps the DataFrame interface and only flags eliminated rows.
+    """
+    df = create_words_df()
+    filtered_df = wordle_filter(df, ["crate"], [(0, 2, 1, 0, 0)])
+    assert len(filtered_df) == len(df)
+    assert "trace" not in get_possible_words(filtered_df)["word"].tolist()
+    assert get_possible_words(filtered_df)["word"].tolist() == [
+        word for word in df["word"] if naive_feedback("crate", word) == (0, 2, 1, 0, 0)
+    ]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from collections import Counter
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.ranking import rank_guesses, score_words
+
+def naive_hard_mode_allowed(word, guess, letter_state):
+    """
+    Reference hard-mode rule: greens stay in place and revealed letters are reused as often as revealed.
+    """
+    revealed = Counter(letter for letter, state in zip(guess, letter_state) if state in (1, 2))
+    if any(state == 1 and word[i] != guess[i] for i, state in enumerate(letter_state)):
+        return False
+    return all(word.count(letter) >= count for letter, count in revealed.items())
+
+def test_hard_mode_mask_matches_reference():
+    """
+    Test that the indexed hard-mode mask agrees with a letter-by-letter check, including duplicate letters.
+    """
+    corpus = get_corpus()
+    words = corpus.words[::37].tolist()
+    for guess, letter_state in [("crate", (0, 2, 1, 0, 0)), ("speed", (0, 0, 1, 2, 0)), ("llama", (1, 0, 0, 0, 2))]:
+        mask = corpus.index.hard_mode_mask(guess, letter_state)[::37]
+        assert mask.tolist() == [naive_hard_mode_allowed(word, guess, letter_state) for word in words]
+
+def test_hard_mode_game_rejects_and_undoes():
+    """
+    Test that a hard-mode user may only play legal guesses and that undo restores the allowed set.
+    """
+    game = WordleGame(hard_mode=True)
+    game.add_user("alice")
+    user = game.users["alice"]
+    user.answer = "crane"
+    game.process_guess_feedback("alice", "trace")
+
+    assert user.candidates[~user.allowed].sum() == 0  # Every possible answer is a legal guess
+    assert user.allowed.sum() > user.candidates.sum()
+    assert not user.is_allowed("moist")
+    with pytest.raises(ValueError):
+        game.process_guess_feedback("alice", "moist")
+    assert user.guesses == ["trace"]
+
+    allowed = user.allowed.copy()
+    game.process_guess_feedback("alice", "brace")
+    user.undo_guess()
+    assert (user.allowed == allowed).all()
+    user.filter_word_list()
+    assert (user.allowed == allowed).all()
+
+    game.add_user("bob", hard_mode=False)
+    assert game.users["bob"].is_allowed("moist") and game.users["bob"].packed_allowed is None
+
+def test_rank_guesses_scores_only_allowed():
+    """
+    Test that ranking a restricted allowed set gives the same scores as ranking every word.
+    """
+    corpus = get_corpus()
+    candidates = corpus.full_mask() & corpus.index.hard_mode_mask("slate", (0, 0, 2, 0, 1))
+    allowed = corpus.index.hard_mode_mask("slate", (0, 0, 2, 0, 1))
+    ids, scores = rank_guesses(corpus, candidates, "entropy", allowed, limit=20)
+
+    assert allowed[ids].all()
+    assert np.allclose(scores, score_words(corpus, candidates, "entropy")[ids])
@@ -0,0 +1,51 @@
+import tracemalloc
+from wordle_assistant import metrics
+from wordle_assistant.core import create_words_df, get_word_rank, wordle_filter
+from wordle_cli.display import display_ranked_words
+
+def test_metrics_record_hot_paths(monkeypatch, capsys):
+    """
+    Test that instrumented functions record calls, timings and candidate counts only while enabled.
+    """
+    word_list_df = create_words_df()
+    assert metrics.registry() is None
+
+    registry = metrics.Registry()
+    monkeypatch.setattr(metrics, "_registry", registry)  # enable() without the exit hook
+    filtered_df = wordle_filter(create_words_df(), ["crate"], [(0, 2, 1, 0, 0)])
+    display_ranked_words(get_word_rank(filtered_df[filtered_df["eliminated"] == False]))
+    capsys.readouterr()
+
+    report = registry.to_json()["functions"]
+    assert set(report) == {"create_words_df", "wordle_filter", "wordle_filter_mask", "get_word_rank", "get_letter_frequency", "display_ranked_words"}
+    assert report["create_words_df"]["candidates"]["max"] == len(word_list_df)
+    remaining = int((filtered_df["eliminated"] == False).sum())
+    assert report["wordle_filter"]["candidates"]["max"] == report["get_word_rank"]["candidates"]["max"] == remaining
+    assert report["get_letter_frequency"]["calls"] == 2  # Common and uncommon words are scored separately
+    assert report["get_word_rank"]["histogram_ms"]["+Inf"] == 1
+
+    text = registry.to_prometheus()
+    assert 'wordle_call_seconds_count{function="get_word_rank"} 1' in text
+    assert 'wordle_candidates_bucket{function="wordle_filter",le="+Inf"} 1' in text
+
+def test_enable_again_updates_the_report(tmp_path, monkeypatch, capsys):
+    """
+    Test that a second enable() switches the output and adds memory tracing, also to Prometheus reports.
+    """
+    monkeypatch.setattr(metrics, "_registry", None)
+    monkeypatch.setattr(metrics, "_settings", {"output": None, "profiler": None, "trace_memory": False})
+    monkeypatch.setattr(metrics.atexit, "register", lambda func: None)
+    registry = metrics.enable()  # As with WORDLE_METRICS=1 at import
+    output = tmp_path / "metrics.prom"
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        assert metrics.enable(str(output), trace_memory=True) is registry
+        get_word_rank(create_words_df())
+        metrics.dump()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    text = output.read_text()
+    assert 'wordle_call_seconds_count{function="get_word_rank"} 1' in text
+    assert 'wordle_memory_bytes{kind="peak"}' in text and "wordle_memory_top_bytes{location=" in text
+    assert (tmp_path / "metrics.tracemalloc").exists()
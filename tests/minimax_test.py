@@ -0,0 +1,88 @@
+import numpy as np
+from collections import Counter
+from wordle_assistant import core_config as config
+from wordle_assistant.core import create_words_df
+from wordle_assistant.corpus import WordCorpus, get_corpus, read_word_list
+from wordle_assistant.feedback import feedback_pattern, pattern_id
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.minimax import MinimaxSolver, analyze, answer_depths, save_analysis, solve_subtree
+from wordle_assistant.opening_book import encode_key
+
+def small_corpus():
+    """
+    Every 25th word of the full list, so the analysis runs in a moment.
+    """
+    words_df = create_words_df().iloc[::25].reset_index(drop=True)
+    return WordCorpus.from_df(words_df)
+
+def test_analysis_policy_reaches_every_answer(tmp_path, monkeypatch):
+    """
+    Test that following the saved policy solves each answer in exactly its reported depth.
+    """
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path))
+    corpus = small_corpus()
+    report = analyze(corpus)
+
+    for answer, depth in report["depths"].items():
+        history = ()
+        for turn in range(1, 10):
+            guess = report["policy"][encode_key(history)]
+            if guess == answer:
+                break
+            history += ((guess, pattern_id(feedback_pattern(guess, answer))),)
+        assert turn == depth
+    assert report["worst_case"] == max(report["depths"].values())
+    assert sum(report["distribution"].values()) == len(corpus.answer_ids)
+
+def test_memo_and_breadth():
+    """
+    Test that identical candidate sets are solved once and that a wider search is never worse.
+    """
+    corpus = small_corpus()
+    columns = np.arange(len(corpus.answer_ids))
+    greedy = MinimaxSolver(corpus, breadth=1)
+    _, depths = greedy.solve(columns)
+    states = len(greedy.memo)
+    assert greedy.solve(columns)[1] is depths and len(greedy.memo) == states and greedy.hits >= 1
+
+    _, wide_depths = MinimaxSolver(corpus, breadth=3).solve(columns)
+    assert (wide_depths.max(), wide_depths.sum()) <= (depths.max(), depths.sum())
+
+def test_difficulty_weighted_answers(tmp_path, monkeypatch):
+    """
+    Test that a positive difficulty favours the answers with the deepest worst case.
+    """
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path))
+    corpus = get_corpus()
+    game = WordleGame(difficulty=8.0)
+    assert answer_depths(corpus) is None
+    assert game.choose_random_answer() in corpus  # Uniform until the corpus is analyzed
+
+    answers = corpus.words[corpus.answer_ids].tolist()
+    depths = {word: 1 for word in answers}
+    depths["joker"] = 6
+    save_analysis(corpus, {"depths": depths})
+    np.random.seed(0)
+    picks = Counter(game.choose_random_answer() for _ in range(200))
+    assert picks["joker"] > 100
+
+def test_subtrees_use_the_parent_version(tmp_path, monkeypatch):
+    """
+    Test that a subtree is solved against the corpus version of the analysis, even after the word lists change.
+    """
+    common = read_word_list(config.WORDLE_COMMON_WORDS)[::50]
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "WORDLE_COMMON_WORDS", str(tmp_path / "common.csv"))
+    monkeypatch.setattr(config, "WORDLE_VALID_WORDS", str(tmp_path / "valid.csv"))
+    monkeypatch.setattr(config, "CORPUS_RELOAD_INTERVAL", 0)
+    for path in ("common.csv", "valid.csv"):
+        (tmp_path / path).write_text("".join(f"{word}\n" for word in common))
+    corpus = get_corpus()
+    columns = np.arange(len(corpus.answer_ids))
+    expected = MinimaxSolver(corpus).solve(columns)[1]
+
+    for path in ("common.csv", "valid.csv"):
+        (tmp_path / path).write_text("".join(f"{word}\n" for word in common[1:]))  # Shifts every answer id
+    assert get_corpus().version != corpus.version
+    depths, policy, _ = solve_subtree(corpus.length, corpus.language, corpus.version, 1, columns, ())
+    assert np.array_equal(depths, expected) and set(policy.values()) <= set(common)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.entropy import board_information, expected_information
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.ranking import rank_board_guesses, rank_guesses
+
+ANSWERS = ["crane", "pious", "eerie", "joker", "mount", "shall", "dwarf", "flock",
+           "nymph", "vivid", "gaudy", "tepid", "ozone", "quirk", "baker", "rowdy"]
+
+def test_boards_filter_like_single_games():
+    """
+    Test that one batched pass per guess leaves every board with the candidates of its own single-board game.
+    """
+    game = WordleGame()
+    game.add_multi_board_user("quad", len(ANSWERS), answers=ANSWERS)
+    user = game.users["quad"]
+    for guess in ["slate", "crane", "dumpy"]:
+        game.process_guess_feedback("quad", guess)
+    assert user.solved_at[0] == 2 and user.letter_states[2][0] is None
+
+    for board, answer in enumerate(ANSWERS):
+        single = WordleGame()
+        single.add_user("solo", answer=answer)
+        for guess in ["slate", "crane", "dumpy"][:user.solved_at[board] or 3]:
+            single.process_guess_feedback("solo", guess)
+        assert np.array_equal(user.candidates[board], single.users["solo"].candidates)
+
+    user.undo_guess()
+    user.undo_guess()
+    assert user.solved_at[0] is None and user.guesses == ["slate"]
+
+def test_board_scores_add_up():
+    """
+    Test that the batched board scores equal the sum of single-board scores.
+    """
+    corpus = get_corpus()
+    boards = np.zeros((3, corpus.size), dtype=bool)
+    for board in range(3):
+        boards[board, np.random.default_rng(board).choice(corpus.answer_ids, 40, replace=False)] = True
+    guess_ids = np.arange(0, corpus.size, 7)
+    for metric in ("entropy", "remaining"):
+        expected = sum(expected_information(corpus, board, guess_ids, metric=metric) for board in boards)
+        assert np.allclose(board_information(corpus, boards, guess_ids, metric=metric), expected, atol=1e-3)
+
+    # Identical boards rank like a single board
+    ids, _ = rank_board_guesses(corpus, np.repeat(boards[:1], 4, axis=0), "entropy", limit=5)
+    assert np.array_equal(ids, rank_guesses(corpus, boards[0], "entropy", limit=5)[0])
+
+def test_game_completes_when_every_board_is_solved():
+    """
+    Test that the game is won once every answer has been guessed and lost after the guess limit.
+    """
+    game = WordleGame()
+    game.add_multi_board_user("duo", 2, answers=["crane", "pious"])
+    game.add_multi_board_user("lost", 2, answers=["crane", "pious"])
+    for guess in ["pious", "crane"]:
+        game.process_guess_feedback("duo", guess)
+    assert game.users["duo"].completed and game.users["duo"].word_found
+    for _ in range(game.users["lost"].max_guesses):
+        game.process_guess_feedback("lost", "slate")
+    assert game.users["lost"].completed and not game.users["lost"].word_found
+
+def test_board_count_is_checked():
+    """
+    Test that random answers are distinct and that board counts outside 2-16 are rejected.
+    """
+    game = WordleGame()
+    game.add_multi_board_user("sixteen", 16)
+    answers = game.users["sixteen"].answers
+    corpus = get_corpus()
+    assert len(set(answers)) == 16 and all(corpus.common[corpus.index_of(answer)] for answer in answers)
+    for boards in (-1, 0, 1, 17):
+        with pytest.raises(ValueError):
+            game.add_multi_board_user("bad", boards)
+    assert "bad" not in game.users
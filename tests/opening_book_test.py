@@ -0,0 +1,33 @@
+from wordle_assistant.core import create_words_df
+from wordle_assistant.corpus import WordCorpus
+from wordle_assistant.feedback import feedback_pattern
+from wordle_assistant.opening_book import OpeningBook, decode_key, encode_key, history_key
+
+def test_opening_book(tmp_path):
+    """
+    Test precomputing, persisting and looking up the opening book on a small corpus.
+    """
+    corpus = WordCorpus.from_df(create_words_df().iloc[::25].reset_index(drop=True))
+    book = OpeningBook(corpus, "frequency")
+    book.precompute(depth=2)
+
+    opening = book.recommend(())
+    answer = corpus.words[corpus.answer_ids[3]]
+    key = history_key([opening], [feedback_pattern(opening, answer)])
+    assert () in book.entries and (key in book.entries or opening == answer)
+    assert decode_key(encode_key(key)) == key
+
+    path = str(tmp_path / "book.json")
+    book.save(path)
+    loaded = OpeningBook.load(corpus, "frequency", path)
+    assert loaded.entries == book.entries
+
+    # Precomputed states hit; deeper ones are computed once then served from the LRU cache
+    loaded.shortlist(())
+    assert (loaded.hits, loaded.misses) == (1, 0)
+    second = loaded.recommend(key)
+    deeper = key + history_key([second], [feedback_pattern(second, answer)])
+    first = loaded.shortlist(deeper)
+    assert loaded.shortlist(deeper) == first
+    assert loaded.misses == 1
+    assert loaded.recommend(deeper) == first[0][0]
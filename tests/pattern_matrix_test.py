@@ -0,0 +1,25 @@
+import numpy as np
+from wordle_assistant import core_config as config
+from wordle_assistant.core import create_words_df
+from wordle_assistant.corpus import WordCorpus
+from wordle_assistant.feedback import feedback_patterns
+from wordle_assistant.pattern_matrix import load_pattern_matrix, pattern_matrix_path
+
+def test_pattern_matrix_cache(tmp_path, monkeypatch):
+    """
+    Test that the pattern matrix is built once, memory-mapped from disk and matches the feedback engine.
+    """
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path))
+    corpus = WordCorpus.from_df(create_words_df().iloc[::40].reset_index(drop=True))
+
+    matrix = load_pattern_matrix(corpus)
+    assert isinstance(matrix, np.memmap)
+    assert matrix.shape == (corpus.size, len(corpus.answer_ids))
+    for word_id in [0, 7, corpus.size - 1]:
+        expected = feedback_patterns(corpus.codes[word_id], corpus.codes[corpus.answer_ids])
+        assert (matrix[word_id] == expected).all()
+
+    # A changed word list hashes to a different file
+    answers = corpus.words[corpus.answer_ids]
+    assert pattern_matrix_path(corpus.words, answers) != pattern_matrix_path(corpus.words, answers[1:])
+    assert len(list(tmp_path.iterdir())) == 1
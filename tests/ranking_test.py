@@ -0,0 +1,62 @@
+import numpy as np
+from collections import Counter
+from wordle_assistant.core import get_letter_frequency, get_possible_words, get_word_rank, wordle_filter_mask
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.game_manager import WordleUser
+from wordle_assistant.opening_book import OpeningBook
+from wordle_assistant.ranking import rank_candidates, top_k_order
+from wordle_cli.display import ranked_pages
+
+def test_array_ranking_matches_dataframe_ranking():
+    """
+    Test that the array frequency ranking gives the same scores as get_word_rank() on the remaining words.
+    """
+    corpus = get_corpus()
+    candidates = wordle_filter_mask(corpus.codes, ["crate"], [(0, 0, 2, 0, 2)])
+    ids, scores = rank_candidates(corpus, candidates, "frequency")
+
+    ranked_df = get_word_rank(get_possible_words(corpus.to_df(candidates)))
+    expected = dict(zip(ranked_df["word"], ranked_df["rank"]))
+
+    assert scores.dtype == np.float32
+    assert sorted(corpus.words[ids]) == sorted(expected)
+    assert np.allclose(scores, [expected[word] for word in corpus.words[ids]])
+    assert (np.diff(scores) <= 0).all()
+
+def test_top_k_order_matches_full_sort():
+    """
+    Test that the partial selection returns the same order as a full sort, ties included.
+    """
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 20, 500).astype(np.float32)
+    common = rng.random(500) < 0.3
+    full = np.lexsort((np.arange(500), ~common, -scores))
+    for k in (1, 10, 37, 500, None):
+        assert (top_k_order(scores, k, (~common,)) == full[:k]).all()
+
+def test_letter_frequency_matches_reference():
+    """
+    Test that the vectorized letter frequency matches counting letters word by word.
+    """
+    word_list_df = get_possible_words(get_corpus().to_df(wordle_filter_mask(get_corpus().codes, ["crate"], [(0, 0, 2, 0, 0)])))
+    letter_counts = Counter("".join(word_list_df["word"]))
+    total = sum(letter_counts.values())
+    expected = [sum(letter_counts[letter] / total for letter in set(word)) for word in word_list_df["word"]]
+    assert np.allclose(get_letter_frequency(word_list_df.copy())["letter_freq"].to_numpy(dtype=float), expected)
+
+    top = get_word_rank(word_list_df, limit=5)
+    assert top["word"].tolist() == get_word_rank(word_list_df)["word"].head(5).tolist()
+
+def test_ranked_pages_extend_past_shortlist():
+    """
+    Test that paging continues past the opening book shortlist in the same order as a full ranking.
+    """
+    corpus = get_corpus()
+    book = OpeningBook(corpus, "frequency")
+    user = WordleUser("pager")
+    user.add_guess("crate", (0, 0, 0, 0, 2))
+    pages = list(ranked_pages(book, user, page_size=40))
+
+    ids, _ = rank_candidates(corpus, user.candidates, "frequency")
+    assert [start for start, _ in pages] == list(range(1, len(ids) + 1, 40))
+    assert [word for _, page in pages for word in page["word"]] == corpus.words[ids].tolist()
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from wordle_assistant import core_config as config
+from wordle_assistant.opening_book import get_opening_book
+from wordle_assistant.ranking import rank_guesses
+from wordle_server.loadgen import Client, play
+from wordle_assistant.sessions import SessionLog
+from wordle_server.server import GameServer
+
+def test_server_plays_games():
+    """
+    Test a few concurrent games and protocol errors against an in-process server.
+    """
+    async def scenario():
+        game_server = GameServer("frequency", executor=ThreadPoolExecutor(2))
+        server = await asyncio.start_server(game_server.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        guess_threads = set()
+        process_guess_feedback = game_server.game.process_guess_feedback
+        def record_thread(*args):
+            guess_threads.add(threading.get_ident())
+            return process_guess_feedback(*args)
+        game_server.game.process_guess_feedback = record_thread
+        latencies = defaultdict(list)
+        clients = [await Client.connect(latencies, port=port) for _ in range(3)]
+
+        turns = await asyncio.gather(*(play(client, f"user-{i}", answer) for i, (client, answer) in enumerate(zip(clients, ["crane", "pious", "eerie"]))))
+        assert all(1 <= turn <= 6 for turn in turns)
+        assert guess_threads and threading.get_ident() not in guess_threads  # Guesses are filtered off the event loop
+
+        client = clients[0]
+        assert (await client.request(op="join", user="dora", answer="crane"))["ok"]
+        assert not (await client.request(op="join", user="dora"))["ok"]
+        assert not (await client.request(op="guess", user="dora", guess="zzzzz"))["ok"]
+        response = await client.request(op="guess", user="dora", guess="trace", id=7)
+        assert response["letter_state"] == [0, 1, 1, 2, 1] and response["id"] == 7
+        assert (await client.request(op="undo", user="dora"))["removed"] == "trace"
+        assert not (await clients[1].request(op="guess", user="dora", guess="crane"))["ok"]
+        assert (await client.request(op="stats"))["users"] == 1
+        for malformed in ({"length": [5]}, {"language": {"en": 1}}, {"hard_mode": "yes"}, {"answer": 5}):
+            assert "must be of type" in (await client.request(op="join", user="mika", **malformed))["error"]
+        assert not (await client.request(op="suggest", user="dora", limit="10"))["ok"]
+        assert (await client.request(op="stats"))["users"] == 1  # The connection survives malformed requests
+
+        assert (await client.request(op="join", user="hana", answer="crane", hard_mode=True))["hard_mode"]
+        await client.request(op="guess", user="hana", guess="trace")
+        assert not (await client.request(op="guess", user="hana", guess="moist"))["ok"]
+        guesses = (await client.request(op="suggest", user="hana", pool="guesses", limit=5))["suggestions"]
+        assert len(guesses) == 5 and all(word[1:3] == "ra" and word[4] == "e" and "c" in word for word, _ in guesses)
+
+        for client in clients:
+            await client.close()
+        server.close()
+        await server.wait_closed()
+        game_server.close()
+
+    asyncio.run(scenario())
+
+def test_server_with_worker_processes():
+    """
+    Test ranking in a real worker process: work items and results are pickled and the worker warms up its own corpus.
+    """
+    async def scenario():
+        game_server = GameServer("frequency", workers=1, hard_mode=True)
+        server = await asyncio.start_server(game_server.handle_connection, "127.0.0.1", 0)
+        client = await Client.connect(defaultdict(list), port=server.sockets[0].getsockname()[1])
+
+        assert (await client.request(op="join", user="hana", answer="crane"))["hard_mode"]
+        opening = (await client.request(op="suggest", user="hana", limit=3))["suggestions"]
+        book = get_opening_book("frequency").shortlist(())[:3]
+        assert [(word, rank) for word, rank in opening] == [tuple(item) for item in book]
+        await client.request(op="guess", user="hana", guess="trace")
+        user = game_server.game.users["hana"]
+        guesses = (await client.request(op="suggest", user="hana", pool="guesses", limit=5))["suggestions"]
+        ids, _ = rank_guesses(user.corpus, user.candidates, "frequency", user.allowed, 5)
+        assert [word for word, _ in guesses] == user.corpus.words[ids].tolist()
+
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        game_server.close()
+
+    asyncio.run(scenario())
+
+def test_detached_games_leave_memory(tmp_path, monkeypatch):
+    """
+    Test that games of closed connections are dropped from memory and resumed from the session log.
+    """
+    monkeypatch.setattr(config, "SESSION_DETACHED_TTL", 0)
+    async def scenario():
+        game_server = GameServer("frequency", executor=ThreadPoolExecutor(1), session_log=SessionLog(str(tmp_path / "sessions.jsonl")))
+        server = await asyncio.start_server(game_server.handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = await Client.connect(defaultdict(list), port=port)
+        await client.request(op="join", user="hana", answer="crane")
+        await client.request(op="guess", user="hana", guess="trace")
+        await client.request(op="join", user="dora", answer="pious")
+        await client.request(op="guess", user="dora", guess="pious")
+        await client.close()
+        while game_server.connections:
+            await asyncio.sleep(0.01)
+        assert not game_server.game.users and game_server.evicted == {"hana", "dora"}
+
+        client = await Client.connect(defaultdict(list), port=port)
+        response = await client.request(op="join", user="hana")
+        assert response["resumed"] and response["guesses"] == ["trace"]
+        assert (await client.request(op="guess", user="hana", guess="crane"))["word_found"]
+        assert (await client.request(op="join", user="dora"))["completed"]
+
+        await client.close()
+        server.close()
+        await server.wait_closed()
+        game_server.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,81 @@
+import json
+import time
+import numpy as np
+import pytest
+from wordle_assistant import game_manager
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.sessions import SessionLog
+
+def play(game, username, answer, guesses, hard_mode=False):
+    game.add_user(username, hard_mode=hard_mode, answer=answer)
+    for guess in guesses:
+        game.process_guess_feedback(username, guess)
+    return game.users[username]
+
+def test_restore_skips_filtering(tmp_path, monkeypatch):
+    """
+    Test that restored users match the originals, undo history included, without refiltering.
+    """
+    path = str(tmp_path / "sessions.jsonl")
+    game = WordleGame(session_log=SessionLog(path))
+    hana = play(game, "hana", "crane", ["trace", "brace", "grace"], hard_mode=True)
+    hana.undo_guess()
+    dora = play(game, "dora", "pious", ["pious"])
+    play(game, "gone", "crane", ["trace"])
+    game.remove_user("gone")
+    game.session_log.close()
+    with open(path, "a") as f:
+        f.write('{"op": "guess", "user": "dora", "gue')  # A write cut short by a crash
+
+    def no_filtering(*args, **kwargs):
+        raise AssertionError("restore should not filter")
+    monkeypatch.setattr(game_manager, "wordle_filter_mask", no_filtering)
+    restored = WordleGame(session_log=SessionLog(path))
+    assert restored.session_log.restore(restored) == 2 and set(restored.users) == {"hana", "dora"}
+
+    user = restored.users["hana"]
+    assert user.guesses == ["trace", "brace"] and user.answer == "crane" and user.hard_mode
+    assert np.array_equal(user.packed_candidates, hana.packed_candidates)
+    assert np.array_equal(user.packed_allowed, hana.packed_allowed)
+    user.undo_guess()
+    assert np.array_equal(user.packed_candidates, hana.candidate_history[1])
+    assert restored.users["dora"].completed and restored.users["dora"].word_found == dora.word_found
+
+def test_compaction_drops_finished_sessions(tmp_path):
+    """
+    Test that compaction keeps only live records and that later appends survive it.
+    """
+    path = str(tmp_path / "sessions.jsonl")
+    log = SessionLog(path, compact_every=0, completed_ttl=0)
+    game = WordleGame(session_log=log)
+    hana = play(game, "hana", "crane", ["trace", "moist"])
+    hana.undo_guess()
+    play(game, "dora", "pious", ["pious"])
+    assert log.compact(now=time.time() + 1) == 1
+    play(game, "mika", "eerie", ["crane"])
+    log.close()
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [(record["op"], record["user"]) for record in records] == [
+        ("join", "hana"), ("guess", "hana"), ("join", "mika"), ("guess", "mika")
+    ]
+    restored = WordleGame(session_log=SessionLog(path))
+    restored.session_log.restore(restored)
+    assert restored.users["hana"].guesses == ["trace"] and restored.users["mika"].guesses == ["crane"]
+
+def test_restore_skips_missing_variants(tmp_path):
+    """
+    Test that a session of a variant without word lists is skipped instead of failing the restore.
+    """
+    path = str(tmp_path / "sessions.jsonl")
+    game = WordleGame(session_log=SessionLog(path))
+    play(game, "hana", "crane", ["trace"])
+    game.session_log.close()
+    with open(path, "a") as f:
+        f.write(json.dumps({"op": "join", "user": "kai", "t": time.time(), "length": 5, "language": "xx", "hard_mode": False, "answer": "abcde"}) + "\n")
+
+    restored = WordleGame(session_log=SessionLog(path))
+    with pytest.warns(UserWarning, match="kai"):
+        assert restored.session_log.restore(restored) == 1
+    assert set(restored.users) == {"hana"} and "No word lists" in restored.session_log.skipped["kai"]
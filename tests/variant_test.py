@@ -0,0 +1,65 @@
+import numpy as np
+from wordle_assistant import core_config as config
+from wordle_assistant.core import get_word_rank, wordle_filter
+from wordle_assistant.corpus import available_variants, get_corpus
+from wordle_assistant.feedback import feedback_pattern
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.ranking import rank_candidates
+
+def write_variant(tmp_path, monkeypatch):
+    """
+    Writes a small 6-letter German variant with its own alphabet.
+    """
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "WORD_LIST_DIR", str(tmp_path / "words"))
+    (tmp_path / "words").mkdir()
+    (tmp_path / "words" / "de_alphabet.txt").write_text("abcdefghijklmnopqrstuvwxyzäöüß\n", encoding="utf-8")
+    (tmp_path / "words" / "de_6_common.txt").write_text("straße\nbrücke\nkäfers\n", encoding="utf-8")
+    (tmp_path / "words" / "de_6_valid.txt").write_text("blumen\nkatze\nfenster\ngrößer\nbrücke\n", encoding="utf-8")
+
+def test_variant_corpus_loads_lazily(tmp_path, monkeypatch):
+    """
+    Test that another word length and alphabet gets its own corpus, separate from the default one.
+    """
+    write_variant(tmp_path, monkeypatch)
+    assert (6, "de") in available_variants()
+
+    corpus = get_corpus(6, "de")
+    assert corpus is get_corpus(6, "de") and corpus is not get_corpus()
+    assert corpus.length == 6 and corpus.language == "de"
+    assert corpus.words.tolist() == ["blumen", "brücke", "größer", "käfers", "straße"]  # Wrong lengths are left out
+    assert corpus.common.tolist() == [False, True, False, True, True]
+    assert corpus.index.at[5, corpus.index.letter_code("e")].sum() == 2
+
+    ids, _ = rank_candidates(corpus, corpus.full_mask(), "entropy")
+    assert corpus.patterns.shape == (5, 3) and corpus.patterns.dtype == np.uint16
+    assert sorted(corpus.words[ids]) == sorted(corpus.words)
+
+def test_variant_game(tmp_path, monkeypatch):
+    """
+    Test a game of another word length, with the guess limit set by the game.
+    """
+    write_variant(tmp_path, monkeypatch)
+    game = WordleGame(word_length=6, language="de", max_guesses=2)
+    game.add_user("jonas")
+    game.add_user("alice", word_length=5, language="en")
+    user = game.users["jonas"]
+    user.answer = "straße"
+
+    assert game.users["alice"].corpus is get_corpus() and len(game.users["alice"].answer) == 5
+    assert game.process_guess_feedback("jonas", "größer") == feedback_pattern("größer", "straße") == (0, 2, 0, 2, 2, 0)
+    assert user.candidates.sum() == 1
+    game.process_guess_feedback("jonas", "blumen")
+    assert user.completed and not user.word_found
+
+def test_variant_dataframe_ranking(tmp_path, monkeypatch):
+    """
+    Test that DataFrame filtering and information ranking use the variant the DataFrame came from.
+    """
+    write_variant(tmp_path, monkeypatch)
+    corpus = get_corpus(6, "de")
+    filtered_df = wordle_filter(corpus.to_df(), ["größer"], [feedback_pattern("größer", "straße")])
+    assert filtered_df.loc[~filtered_df["eliminated"], "word"].tolist() == ["straße"]
+    ranked_df = get_word_rank(filtered_df[~filtered_df["eliminated"]], "entropy")
+    assert ranked_df["word"].tolist() == ["straße"]
+    assert get_word_rank(corpus.to_df(), "remaining", limit=2, corpus=corpus)["word"].isin(corpus.words).all()
@@ -0,0 +1,236 @@
+import json
+import sys
+import numpy as np
+from contextlib import contextmanager
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.feedback import feedback_patterns, pattern_id
+from wordle_assistant.letter_index import ALPHABET
+from wordle_assistant.opening_book import HistoryKey, Shortlist, get_opening_book
+
+
+@contextmanager
+def open_stream(path: str, mode: str):
+    """
+    Opens a file, or stdin/stdout when path is '-'.
+    """
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+    else:
+        with open(path, mode, encoding="utf-8") as f:
+            yield f
+
+
+def read_games(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily parses recorded games from JSONL lines, skipping blank lines.
+
+    Each line holds one game: {"id": ..., "guesses": ["crate", ...], "letter_states": [[0, 2, 1, 0, 0], ...]}.
+    Letter states may also be given as strings such as "02100". Lines that are not valid JSON
+    are yielded as {"error": ...} so the output stays aligned with the input.
+
+    Args:
+      lines (Iterable[str]): An open file or any iterable of lines.
+
+    Yields:
+      Dict[str, Any]: One decoded game per non-blank line.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            game = json.loads(line)
+        except ValueError as e:
+            game = {"error": f"Line {line_number}: invalid JSON ({e})."}
+        if not isinstance(game, dict):
+            game = {"error": f"Line {line_number}: expected a JSON object."}
+        yield game
+
+
+def parse_game(game: Dict[str, Any], length: int = config.DEFAULT_WORD_LENGTH, alphabet: str = ALPHABET) -> Tuple[List[str], List[Tuple[int, ...]]]:
+    """
+    Validates a recorded game and returns its guesses and letter states.
+
+    Raises:
+      ValueError: If the game is malformed.
+    """
+    if "error" in game:
+        raise ValueError(game["error"])
+    for field in ("guesses", "letter_states"):
+        if not isinstance(game.get(field, []), list):
+            raise ValueError(f"'{field}' must be a JSON array.")
+    guesses = [str(guess).strip().lower() for guess in game.get("guesses", [])]
+    letter_states = [tuple(int(state) for state in letter_state) for letter_state in game.get("letter_states", [])]
+    if len(guesses) != len(letter_states):
+        raise ValueError("'guesses' and 'letter_states' have different lengths.")
+    for guess, letter_state in zip(guesses, letter_states):
+        if len(guess) != length or not set(alphabet).issuperset(guess):
+            raise ValueError(f"Invalid guess '{guess}'.")
+        if len(letter_state) != length or any(state not in (0, 1, 2) for state in letter_state):
+            raise ValueError(f"Invalid letter states for '{guess}'.")
+    return guesses, letter_states
+
+
+def shortlist_states(book, keys: List[HistoryKey], masks: np.ndarray) -> List[Shortlist]:
+    """
+    Ranks the state of every game of a chunk, each distinct feedback history only once.
+
+    Games of a chunk often share their history (the same opening guess and feedback), so
+    identical states are grouped before ranking instead of relying on the book's cache.
+
+    Args:
+      book (OpeningBook): The opening book ranking the states.
+      keys (List[HistoryKey]): The feedback history of each game.
+      masks (np.ndarray): Candidate masks of shape (games, N), one per key.
+
+    Returns:
+      List[Shortlist]: The shortlist of each game, in the order of the keys.
+    """
+    first: Dict[HistoryKey, int] = {}
+    for row, key in enumerate(keys):
+        first.setdefault(key, row)
+    shortlists = {key: book.shortlist(key, masks[row]) for key, row in first.items()}
+    return [shortlists[key] for key in keys]
+
+
+def replay_chunk(
+    corpus,
+    chunk: List[Dict[str, Any]],
+    book=None,
+    top_k: int = 5
+) -> Iterator[Dict[str, Any]]:
+    """
+    Replays a chunk of games together, one vectorized filtering pass per turn.
+
+    All games in the chunk advance one turn at a time; each distinct guess of the turn is
+    scored once against the whole corpus and the patterns are shared by every game that
+    made it. When an opening book is given, the recommended guess before every turn is
+    recorded so the assistant's advice can be audited; games sharing a history share one
+    ranking, see shortlist_states().
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      chunk (List[Dict[str, Any]]): Decoded games, see read_games().
+      book (OpeningBook): Optional opening book used to audit advice and rank the final state.
+      top_k (int): Number of suggestions reported for the final state. Defaults to 5.
+
+    Yields:
+      Dict[str, Any]: One result per game, in input order.
+    """
+    parsed: List[Optional[Tuple[List[str], List[Tuple[int, ...]]]]] = []
+    errors: List[Optional[str]] = []
+    for game in chunk:
+        try:
+            parsed.append(parse_game(game, corpus.length, corpus.alphabet))
+            errors.append(None)
+        except (ValueError, TypeError) as e:
+            parsed.append(None)
+            errors.append(str(e))
+
+    valid = [i for i, game in enumerate(parsed) if game is not None]
+    masks = np.ones((len(chunk), corpus.size), dtype=bool)
+    turns: List[List[Dict[str, Any]]] = [[] for _ in chunk]
+    keys: List[HistoryKey] = [() for _ in chunk]  # Feedback history of each game so far
+    max_turns = max((len(parsed[i][0]) for i in valid), default=0)
+
+    for turn in range(max_turns):
+        active = np.array([i for i in valid if len(parsed[i][0]) > turn], dtype=np.intp)
+        guesses = [parsed[i][0][turn] for i in active]
+        active_masks = masks[active]
+        remaining = active_masks.sum(axis=1)
+        shortlists = shortlist_states(book, [keys[i] for i in active], active_masks) if book is not None else None
+        for row, (i, guess) in enumerate(zip(active, guesses)):
+            record = {"guess": guess, "remaining": int(remaining[row])}
+            if book is not None:
+                record["recommended"] = shortlists[row][0][0] if shortlists[row] else None
+            turns[i].append(record)
+
+        unique_guesses, inverse = np.unique(guesses, return_inverse=True)
+        patterns = feedback_patterns(corpus.encode(unique_guesses), corpus.codes).reshape(len(unique_guesses), -1)
+        observed = np.array([pattern_id(parsed[i][1][turn]) for i in active])
+        masks[active] &= patterns[inverse.ravel()] == observed[:, None]
+        for i, guess, pattern in zip(active, guesses, observed.tolist()):
+            keys[i] += ((guess, pattern),)
+
+    if book is not None:
+        solvable = [i for i in valid if masks[i].any()]
+        final = dict(zip(solvable, shortlist_states(book, [keys[i] for i in solvable], masks[solvable])))
+    for i, game in enumerate(chunk):
+        result: Dict[str, Any] = {"id": game["id"]} if "id" in game else {}
+        if errors[i] is not None:
+            result["error"] = errors[i]
+            yield result
+            continue
+        guesses, letter_states = parsed[i]
+        remaining = int(masks[i].sum())
+        result.update({
+            "guesses": len(guesses),
+            "solved": bool(letter_states) and all(state == 1 for state in letter_states[-1]),
+            "remaining": remaining,
+            "candidates": corpus.words[masks[i]][:top_k].tolist(),
+            "turns": turns[i],
+        })
+        if book is not None:
+            result["suggestions"] = [[word, rank] for word, rank in final.get(i, [])[:top_k]]
+        yield result
+
+
+def replay_games(
+    games: Iterable[Dict[str, Any]],
+    strategy: Optional[str] = config.DEFAULT_RANK_STRATEGY,
+    chunk_size: int = 256,
+    top_k: int = 5,
+    word_length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Filters and ranks a stream of recorded games in chunks, yielding one result per game.
+
+    Only one chunk is held in memory at a time, so memory use does not depend on the
+    size of the archive.
+
+    Args:
+      games (Iterable[Dict[str, Any]]): Decoded games, e.g. from read_games().
+      strategy (str): Ranking strategy used to audit advice, or None to only filter.
+      chunk_size (int): Number of games replayed together. Defaults to 256.
+      top_k (int): Number of candidates and suggestions reported per game. Defaults to 5.
+      word_length (int): Word length of the recorded games.
+      language (str): Language of the recorded games.
+
+    Yields:
+      Dict[str, Any]: One result per game, in input order.
+    """
+    corpus = get_corpus(word_length, language)
+    book = get_opening_book(strategy, word_length, language, corpus.version) if strategy else None
+    chunk: List[Dict[str, Any]] = []
+    for game in games:
+        chunk.append(game)
+        if len(chunk) == chunk_size:
+            yield from replay_chunk(corpus, chunk, book, top_k)
+            chunk = []
+    if chunk:
+        yield from replay_chunk(corpus, chunk, book, top_k)
+
+
+def replay_file(
+    input_path: str,
+    output_path: str,
+    strategy: Optional[str] = config.DEFAULT_RANK_STRATEGY,
+    chunk_size: int = 256,
+    top_k: int = 5,
+    word_length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE
+) -> int:
+    """
+    Replays a JSONL archive of games into a JSONL file of results ('-' for stdin/stdout).
+
+    Returns:
+      int: Number of games written.
+    """
+    count = 0
+    with open_stream(input_path, "r") as source, open_stream(output_path, "w") as sink:
+        for result in replay_games(read_games(source), strategy, chunk_size, top_k, word_length, language):
+            sink.write(json.dumps(result) + "\n")
+            count += 1
+    return count
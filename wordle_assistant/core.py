@@ -1,8 +1,18 @@
-import pandas as pd
+from __future__ import annotations
+
+import numpy as np
 from typing import *
 from wordle_assistant import core_config as config 
+from wordle_assistant.feedback import feedback_patterns, pattern_id
+from wordle_assistant.letter_index import ALPHABET, encode_words
+from wordle_assistant.metrics import input_rows, instrument, result_count, result_rows
+from wordle_assistant.ranking import top_k_order
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
+@instrument("create_words_df", size=result_rows)
 def create_words_df():
     """
     Loads and merges two word lists into a single Pandas DataFrame with metadata.
@@ -10,6 +20,8 @@ def create_words_df():
     Dataframe Schema:
     [index][word][rarity][valid][eliminated][rank][letter_freq]
     """
+    import pandas as pd  # Deferred so importing core stays cheap
+
     try:
         # Load common words and mark them as "common"
         common_words_df = pd.read_csv(
@@ -58,46 +70,103 @@ def create_words_df():
         print(f"Unexpected error: {e}")
         return pd.DataFrame(columns=["index", "word", "rarity", "valid", "eliminated", "rank", "letter_freq"])
 
+def frame_corpus(word_list_df: pd.DataFrame, corpus=None):
+    """
+    Returns the corpus a word list DataFrame was built from.
+
+    DataFrames from WordCorpus.to_df() carry their word length, language and corpus version;
+    others (e.g. from create_words_df()) are taken as the default language at the length of
+    their words.
+
+    Args:
+      word_list_df (pd.DataFrame): The word list DataFrame.
+      corpus (WordCorpus): The corpus, if the caller knows it; returned as is.
+
+    Returns:
+      WordCorpus: The corpus whose word ids the 'index' column refers to.
+    """
+    if corpus is not None:
+        return corpus
+    from wordle_assistant.corpus import get_corpus
+
+    attrs = word_list_df.attrs
+    length = attrs.get("length") or (len(word_list_df["word"].iat[0]) if len(word_list_df) else config.DEFAULT_WORD_LENGTH)
+    return get_corpus(length, attrs.get("language", config.DEFAULT_LANGUAGE), attrs.get("version"))
+
+@instrument("wordle_filter_mask", size=result_count)
+def wordle_filter_mask(
+    word_codes: np.ndarray,
+    guesses: List[str],
+    letter_states: List[Tuple[int, ...]],
+    mask: np.ndarray = None,
+    alphabet: str = ALPHABET
+) -> np.ndarray:
+    """
+    Narrows a candidate mask to the words that would have produced every observed letter state.
+
+    Only the words still in the mask are scored, so each guess gets cheaper as candidates shrink.
+
+    Args:
+      word_codes (np.ndarray): Encoded word list of shape (N, L), see encode_words().
+      guesses (List[str]): List of guessed words.
+      letter_states (List[Tuple[int, ...]]): Corresponding letter states for each guess.
+      mask (np.ndarray): Optional starting candidate mask; defaults to every word.
+      alphabet (str): Alphabet word_codes were encoded with. Defaults to English a-z.
+
+    Returns:
+      np.ndarray: Boolean mask over the words, True where the word is still possible.
+    """
+    mask = np.ones(len(word_codes), dtype=bool) if mask is None else mask.copy()
+    for guess, letter_state in zip(guesses, letter_states):
+        candidate_ids = np.flatnonzero(mask)
+        patterns = feedback_patterns(encode_words([guess], alphabet)[0], word_codes[candidate_ids])
+        mask[candidate_ids[patterns != pattern_id(letter_state)]] = False
+    return mask
+
+@instrument("wordle_filter", size=result_rows)
 def wordle_filter(
     word_list_df: pd.DataFrame, 
     guesses: List[str] = None, 
-    letter_states: List[Tuple[int, int, int, int, int]] = None, 
-    user = None 
+    letter_states: List[Tuple[int, ...]] = None, 
+    user = None,
+    word_codes: np.ndarray = None,
+    corpus = None
 ) -> pd.DataFrame:
     """
     Filters the word list based on either a WordleUser instance or separate guess/letter state inputs.
 
+    A word survives when scoring the guess against it gives exactly the observed letter states,
+    so repeated letters follow the real Wordle rules.
+
     Args: 
       :param word_list_df: DataFrame containing possible words.
       :param guesses: List of guessed words (optional if passing a user instance).
       :param letter_states: Corresponding letter states for each guess (optional if passing a user instance).
-        0 = Gray - Letter must NOT be in the word at all
+        0 = Gray - Letter is not in the word (beyond any copies marked green or yellow)
         1 = Green - Letter must be in the exact position
         2 = Yellow - Letter must be present but in a different position
       :param user: Optional WordleUser instance to use instead of separate inputs.
+      :param word_codes: Optional encoded words of word_list_df; encoded on the fly if omitted.
+      :param corpus: Optional corpus of word_list_df, for its alphabet; see frame_corpus().
       
     Returns:
      filtered_df: A DataFrame with updated 'eliminated' column instead of removing words.
     """
     # Ensure user does not modify parameters in place
     if user:
-        from wordle_assistant.game_manager import WordleUser
         guesses = list(user.guesses) if user.guesses else []
         letter_states = list(user.letter_states) if user.letter_states else []
 
     if not guesses or not letter_states:
         return word_list_df  # No filtering needed if no guesses made
 
-    filtered_df = word_list_df.copy()
+    alphabet = frame_corpus(word_list_df, corpus or getattr(user, "corpus", None)).alphabet
+    if word_codes is None:
+        word_codes = encode_words(word_list_df["word"], alphabet)
 
-    for guess, letter_state in zip(guesses, letter_states):
-        for i, (letter, state) in enumerate(zip(guess, letter_state)):
-            if state == 1:  # Green - Letter must be in the exact position
-                filtered_df.loc[filtered_df["word"].str[i] != letter, "eliminated"] = True
-            elif state == 2:  # Yellow - Letter must be present but in a different position
-                filtered_df.loc[~filtered_df["word"].str.contains(letter) | (filtered_df["word"].str[i] == letter), "eliminated"] = True
-            elif state == 0:  # Gray - Letter must NOT be in the word at all
-                filtered_df.loc[filtered_df["word"].str.contains(letter), "eliminated"] = True
+    filtered_df = word_list_df.copy()
+    mask = wordle_filter_mask(word_codes, guesses, letter_states, ~filtered_df["eliminated"].to_numpy(dtype=bool), alphabet)
+    filtered_df["eliminated"] = ~mask
 
     return filtered_df
 
@@ -155,6 +224,7 @@ def sort_words(word_list_df: pd.DataFrame, by: str = "alphabetical", ascending:
         print(f"Warning: Invalid sorting criteria '{by}', defaulting to alphabetical.")
         return word_list_df.sort_values(by="word", ascending=ascending).reset_index(drop=True)
 
+@instrument("get_letter_frequency", size=input_rows)
 def get_letter_frequency(word_list_df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculates letter frequency across the dataset and assigns a letter frequency score to each word.
@@ -168,27 +238,36 @@ def get_letter_frequency(word_list_df: pd.DataFrame) -> pd.DataFrame:
     if word_list_df.empty:
         return word_list_df
 
-    # Count letter occurrences across all words
-    all_letters = "".join(word_list_df["word"])
-    letter_counts = Counter(all_letters)
+    # Letter codes of every word; shorter words are padded with code point 0
+    words = word_list_df["word"].to_numpy(dtype=str)
+    points = np.ascontiguousarray(words).view(np.uint32).reshape(len(words), -1)
+    letters, codes = np.unique(points, return_inverse=True)
+    codes = codes.reshape(points.shape)
+    is_letter = letters[codes] != 0
 
-    # Normalize frequencies
-    total_letters = sum(letter_counts.values())
-    letter_freq_map = {letter: count / total_letters for letter, count in letter_counts.items()}
+    # Normalized letter frequencies over all words
+    letter_counts = np.bincount(codes[is_letter], minlength=len(letters))
+    letter_freq = letter_counts / letter_counts.sum()
 
-    # Assign letter frequency score to each word (sum of unique letter frequencies)
-    word_list_df["letter_freq"] = word_list_df["word"].apply(
-        lambda word: sum(letter_freq_map[letter] for letter in set(word))  # Only count unique letters per word
-    )
+    # Per-word letter-set matrix, so each word scores the sum of its unique letter frequencies
+    letter_sets = np.zeros((len(words), len(letters)), dtype=bool)
+    rows = np.broadcast_to(np.arange(len(words))[:, None], codes.shape)
+    letter_sets[rows[is_letter], codes[is_letter]] = True
+    word_list_df["letter_freq"] = letter_sets @ letter_freq
 
     return word_list_df
 
-def get_word_rank(word_list_df: pd.DataFrame) -> pd.DataFrame:
+@instrument("get_word_rank", size=input_rows)
+def get_word_rank(word_list_df: pd.DataFrame, strategy: str = config.DEFAULT_RANK_STRATEGY, limit: int = None, corpus = None) -> pd.DataFrame:
     """
     Calculates word ranking based on letter frequency and prioritizes common words.
 
     Args:
       word_list_df (pd.DataFrame): The word list DataFrame.
+      strategy (str): Ranking strategy, one of config.RANK_STRATEGIES. "frequency" (default) uses
+        letter frequency; "entropy" and "remaining" use get_information_rank().
+      limit (int): Optional number of top words to return; only those are sorted.
+      corpus (WordCorpus): Optional corpus of the DataFrame for the information strategies; see frame_corpus().
 
     Returns:
       pd.DataFrame: The updated DataFrame with word rankings.
@@ -196,6 +275,13 @@ def get_word_rank(word_list_df: pd.DataFrame) -> pd.DataFrame:
     if word_list_df.empty:
         return word_list_df
 
+    if strategy in ("entropy", "remaining"):
+        return get_information_rank(word_list_df, metric=strategy, limit=limit, corpus=corpus)
+    elif strategy != "frequency":
+        print(f"Warning: Invalid ranking strategy '{strategy}', defaulting to frequency.")
+
+    import pandas as pd
+
     # Split into common and uncommon words
     common_words_df = word_list_df[word_list_df["rarity"] == "common"].copy()
     uncommon_words_df = word_list_df[word_list_df["rarity"] == "uncommon"].copy()
@@ -212,6 +298,49 @@ def get_word_rank(word_list_df: pd.DataFrame) -> pd.DataFrame:
     ranked_df = pd.concat([common_words_df, uncommon_words_df]).reset_index(drop=True)
 
     # Sort with common words always first, then by rank
-    ranked_df = ranked_df.sort_values(by=["rank", "rarity"], ascending=[False, True])
+    return top_ranked(ranked_df, limit)
+
+def get_information_rank(word_list_df: pd.DataFrame, metric: str = "entropy", limit: int = None, corpus = None) -> pd.DataFrame:
+    """
+    Ranks every word in the DataFrame as a guess by the information it is expected to reveal
+    about the words that are not yet eliminated.
+
+    The DataFrame must come from a shared corpus (its 'index' column holds corpus word ids),
+    since the scores are read from the cached pattern matrix. The corpus is the one given or
+    the one the DataFrame was built from (see frame_corpus()).
+
+    Args:
+      word_list_df (pd.DataFrame): The word list DataFrame.
+      metric (str): "entropy" (expected bits of information) or "remaining" (negated expected
+        number of candidates left). Defaults to "entropy".
+      limit (int): Optional number of top words to return; only those are sorted.
+      corpus (WordCorpus): Optional corpus of the DataFrame.
 
-    return ranked_df
\ No newline at end of file
+    Returns:
+      pd.DataFrame: The DataFrame with 'rank' set to the score, sorted best first.
+    """
+    from wordle_assistant.entropy import expected_information
+
+    corpus = frame_corpus(word_list_df, corpus)
+    guess_ids = word_list_df["index"].to_numpy(dtype=np.int64)
+    if (guess_ids >= corpus.size).any() or (corpus.words[guess_ids] != word_list_df["word"].to_numpy(dtype=str)).any():
+        raise ValueError("Information ranking needs a word list DataFrame built from the shared corpus.")
+
+    candidates = np.zeros(corpus.size, dtype=bool)
+    candidates[guess_ids[~word_list_df["eliminated"].to_numpy(dtype=bool)]] = True
+
+    ranked_df = word_list_df.copy()
+    ranked_df["rank"] = expected_information(corpus, candidates, guess_ids, metric=metric)
+    return top_ranked(ranked_df, limit)
+
+
+def top_ranked(ranked_df: pd.DataFrame, limit: int = None) -> pd.DataFrame:
+    """
+    Orders a ranked DataFrame best first (common words win ties), keeping only the top rows if limit is given.
+
+    Uses a partial selection, so asking for the top 10 does not sort the whole word list.
+    """
+    order = top_k_order(
+        ranked_df["rank"].to_numpy(dtype=np.float64), limit, ((ranked_df["rarity"] != "common").to_numpy(),)
+    )
+    return ranked_df.iloc[order]
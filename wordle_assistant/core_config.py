@@ -8,4 +8,51 @@ TEST_MODE = False  # Change to True when testing
 
 # Variables
 WORDLE_COMMON_WORDS = os.path.join(DATA_DIR, "wordle_common_words.csv")
-WORDLE_VALID_WORDS = os.path.join(DATA_DIR, "wordle_valid_words.csv")
\ No newline at end of file
+WORDLE_VALID_WORDS = os.path.join(DATA_DIR, "wordle_valid_words.csv")
+
+# Variants: the lists above are the default 5-letter English game. Other lengths and languages
+# are read from {language}_{length}_common.txt / {language}_{length}_valid.txt in WORD_LIST_DIR
+DEFAULT_WORD_LENGTH = 5
+DEFAULT_LANGUAGE = "en"
+ALPHABETS = {"en": "abcdefghijklmnopqrstuvwxyz"}  # Other languages may add {language}_alphabet.txt
+WORD_LIST_DIR = os.environ.get("WORDLE_WORD_LIST_DIR", os.path.join(DATA_DIR, "words"))
+MAX_GUESSES = 6
+
+# Derived artifacts (pattern matrix, etc.) are cached here and rebuilt when the word lists change
+CACHE_DIR = os.environ.get("WORDLE_CACHE_DIR", os.path.join(DATA_DIR, "cache"))
+PATTERN_MATRIX_VERSION = 1
+CORPUS_ARTIFACT_VERSION = 2  # Prebuilt corpus: fixed-width unicode words + common flag
+CORPUS_RELOAD_INTERVAL = 1.0  # Seconds between checks of the word lists for a new version (hot reload)
+CORPUS_CACHE_SIZE = 4  # Recently used corpus versions kept loaded; older ones are freed with their last game
+CORPUS_KEEP_VERSIONS = 2  # Versions whose cached artifacts `dictionary apply` keeps on disk (the new one and the one before)
+
+# Instrumentation (opt-in, see wordle_assistant.metrics)
+METRICS_ENABLED = os.environ.get("WORDLE_METRICS", "0") not in ("", "0")
+METRICS_OUTPUT = os.environ.get("WORDLE_METRICS_OUTPUT", "wordle-metrics.json")  # .prom/.txt for Prometheus text
+METRICS_PROFILE = os.environ.get("WORDLE_PROFILE", "0") not in ("", "0")  # cProfile saved as <output>.prof
+METRICS_TRACE_MEMORY = os.environ.get("WORDLE_TRACEMALLOC", "0") not in ("", "0")
+
+# Ranking
+RANK_STRATEGIES = ["frequency", "entropy", "remaining"]
+DEFAULT_RANK_STRATEGY = "frequency"
+ENTROPY_SAMPLE_SIZE = 512  # Max candidate answers scored per turn by the entropy strategies
+MULTI_BOARD_SHORTLIST = 512  # Guesses scored board by board in multi-board games, picked by their score on all boards together
+MULTI_BOARD_EXTRA_GUESSES = 5  # Multi-board games allow one guess per board plus this many (Quordle: 4 + 5)
+MULTI_BOARD_MAX = 16  # Most boards in one game (Sedecordle)
+
+# Answer difficulty (see `python -m wordle_assistant.minimax`)
+MINIMAX_VERSION = 1
+ANSWER_DIFFICULTY = 0.0  # 0 picks answers uniformly; > 0 favours answers with a deeper minimax worst case
+
+# Session log (see wordle_assistant.sessions)
+SESSION_LOG = os.environ.get("WORDLE_SESSION_LOG")  # Path of the log, or None to keep sessions in memory only
+SESSION_COMPACT_EVERY = 10000  # Appended records between background compactions
+SESSION_COMPLETED_TTL = 3600  # Seconds a completed session stays in the log
+SESSION_IDLE_TTL = 7 * 24 * 3600  # Seconds an unfinished session stays in the log without moves
+SESSION_DETACHED_TTL = 600  # Seconds the server keeps a disconnected, unfinished game in memory; later it is resumed from the log
+
+# Opening book
+OPENING_BOOK_VERSION = 2
+OPENING_BOOK_DEPTH = 2  # Turns precomputed by `python -m wordle_assistant.opening_book`
+OPENING_BOOK_SHORTLIST = 100  # Ranked words stored per state, enough for the CLI "more" command
+OPENING_BOOK_CACHE_SIZE = 4096  # Deeper states kept in memory per process
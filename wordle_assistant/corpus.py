@@ -0,0 +1,416 @@
+import hashlib
+import os
+import time
+import weakref
+import numpy as np
+from collections import OrderedDict
+from functools import cached_property
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.letter_index import ALPHABET, LetterIndex, encode_words
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def corpus_dtype(length: int = config.DEFAULT_WORD_LENGTH) -> np.dtype:
+    """
+    Returns the fixed-width record of one word in the prebuilt corpus artifact.
+    """
+    return np.dtype([("word", f"<U{length}"), ("common", "?")])
+
+
+class WordCorpus:
+    """
+    Read-only word list shared by every user and game in the process.
+
+    Words are held as plain arrays sorted alphabetically, with a flag for common words.
+    Every word has the same length and only uses letters of the corpus alphabet; each
+    word length and alphabet gets its own corpus, index and pattern matrix. Callers track
+    their own progress with a boolean candidate mask over the corpus word ids and only
+    build DataFrames (via to_df()) when they need one.
+    """
+
+    def __init__(self, words: np.ndarray, common: np.ndarray, alphabet: str = ALPHABET, language: str = config.DEFAULT_LANGUAGE):
+        self.words = np.asarray(words, dtype=str)
+        self.common = np.asarray(common, dtype=bool)
+        self.alphabet = alphabet
+        self.language = language
+        self.codes = encode_words(self.words, alphabet)  # (N, L) letter codes for the feedback engine
+        self.length = self.codes.shape[1]
+        self.answer_ids = np.flatnonzero(self.common)  # Possible answers, in pattern matrix column order
+        self.size = len(self.words)
+        self._word_ids = {word: word_id for word_id, word in enumerate(self.words)}
+        self.version: Optional[str] = None  # Content hash of the source word lists, when loaded through get_corpus()
+        self.cache: Dict[str, Any] = {}  # Objects other modules build per corpus version (e.g. opening books), freed with it
+
+        # Shared arrays must never be modified in place by a single user
+        self.words.flags.writeable = False
+        self.common.flags.writeable = False
+        self.codes.flags.writeable = False
+        self.answer_ids.flags.writeable = False
+
+    @cached_property
+    def index(self) -> LetterIndex:
+        """
+        Letter-position bitset index over the corpus word ids, built on first use.
+        """
+        return LetterIndex(self.words, self.alphabet)
+
+    @cached_property
+    def patterns(self) -> np.ndarray:
+        """
+        Memory-mapped guess x answer pattern matrix, built and cached on disk on first use.
+        """
+        from wordle_assistant.pattern_matrix import load_pattern_matrix
+        return load_pattern_matrix(self)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._word_ids
+
+    def index_of(self, word: str) -> int:
+        """
+        Returns the corpus word id of a word.
+
+        Args:
+          word (str): The word to look up.
+
+        Returns:
+          int: The word id, or -1 if the word is not in the corpus.
+        """
+        return self._word_ids.get(word, -1)
+
+    def encode(self, words: Iterable[str]) -> np.ndarray:
+        """
+        Encodes words with the corpus alphabet, comparable with self.codes.
+        """
+        return encode_words(words, self.alphabet)
+
+    def id_map(self, other: "WordCorpus") -> np.ndarray:
+        """
+        Returns, for every word of this corpus, its id in another corpus (-1 if it is not there).
+
+        Both corpora are sorted, so the lookup is a single np.searchsorted.
+        """
+        if not other.size:
+            return np.full(self.size, -1, dtype=np.intp)
+        positions = np.minimum(np.searchsorted(other.words, self.words), other.size - 1)
+        return np.where(other.words[positions] == self.words, positions, -1)
+
+    def inherit(self, previous: "WordCorpus"):
+        """
+        Reuses what a previous version of this corpus already built instead of rebuilding it.
+
+        The letter index is updated for the added and removed words only.
+        """
+        if "index" in previous.__dict__ and "index" not in self.__dict__:
+            self.__dict__["index"] = previous.index.updated(self.id_map(previous), self.words)
+
+    def full_mask(self) -> np.ndarray:
+        """
+        Returns a fresh candidate mask with every word still possible.
+        """
+        return np.ones(self.size, dtype=bool)
+
+    @classmethod
+    def from_df(cls, words_df: "pd.DataFrame", alphabet: str = ALPHABET) -> "WordCorpus":
+        """
+        Builds a corpus from a DataFrame shaped like the output of create_words_df().
+        """
+        return cls(words_df["word"].to_numpy(dtype=str), (words_df["rarity"] == "common").to_numpy(dtype=bool), alphabet)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray, alphabet: str = ALPHABET, language: str = config.DEFAULT_LANGUAGE) -> "WordCorpus":
+        """
+        Builds a corpus from corpus_dtype() records, see load_corpus_records().
+        """
+        return cls(records["word"], records["common"], alphabet, language)
+
+    def to_df(self, mask: np.ndarray = None) -> "pd.DataFrame":
+        """
+        Builds a DataFrame of the corpus (same schema as create_words_df()) for display or ranking.
+
+        Args:
+          mask (np.ndarray): Optional candidate mask; words outside it are marked eliminated.
+
+        Returns:
+          pd.DataFrame: A new DataFrame of the corpus.
+        """
+        import pandas as pd
+
+        word_list_df = pd.DataFrame({
+            "index": np.arange(self.size),
+            "word": self.words,
+            "rarity": np.where(self.common, "common", "uncommon"),
+            "valid": True,
+            "eliminated": np.zeros(self.size, dtype=bool) if mask is None else ~mask,
+            "rank": None,
+            "letter_freq": None,
+        })
+        # The variant and version travel with the DataFrame (and its slices), see core.frame_corpus()
+        word_list_df.attrs.update(length=self.length, language=self.language, version=self.version)
+        return word_list_df
+
+    def random_common_word(self) -> str:
+        """
+        Selects a random common word from the corpus.
+        """
+        return str(np.random.choice(self.words[self.common]))
+
+
+def read_word_list(path: str) -> List[str]:
+    """
+    Reads one word per line, normalized to lowercase, skipping blank lines.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [word for word in (line.strip().lower() for line in f) if word]
+
+
+def get_alphabet(language: str = config.DEFAULT_LANGUAGE) -> str:
+    """
+    Returns the alphabet of a language, from config.ALPHABETS or an '{language}_alphabet.txt' file.
+
+    Raises:
+      ValueError: If the language has no known alphabet.
+    """
+    if language in config.ALPHABETS:
+        return config.ALPHABETS[language]
+    path = os.path.join(config.WORD_LIST_DIR, f"{language}_alphabet.txt")
+    if not os.path.exists(path):
+        raise ValueError(f"Unknown language '{language}'.")
+    with open(path, encoding="utf-8") as f:
+        return "".join(f.read().split())
+
+
+def word_list_paths(length: int = config.DEFAULT_WORD_LENGTH, language: str = config.DEFAULT_LANGUAGE) -> Tuple[str, str]:
+    """
+    Returns the common and valid word list files of a word length and language.
+
+    The default variant uses the bundled Wordle lists; other variants are read from
+    '{language}_{length}_common.txt' and '{language}_{length}_valid.txt' in config.WORD_LIST_DIR.
+
+    Raises:
+      ValueError: If the variant has no word lists.
+    """
+    if (length, language) == (config.DEFAULT_WORD_LENGTH, config.DEFAULT_LANGUAGE):
+        return config.WORDLE_COMMON_WORDS, config.WORDLE_VALID_WORDS
+    paths = tuple(os.path.join(config.WORD_LIST_DIR, f"{language}_{length}_{kind}.txt") for kind in ("common", "valid"))
+    if not all(os.path.exists(path) for path in paths):
+        raise ValueError(f"No word lists for {length}-letter '{language}' words in {config.WORD_LIST_DIR}.")
+    return paths
+
+
+def available_variants() -> List[Tuple[int, str]]:
+    """
+    Lists the (word length, language) variants that have word lists, without loading them.
+    """
+    variants = {(config.DEFAULT_WORD_LENGTH, config.DEFAULT_LANGUAGE)}
+    if os.path.isdir(config.WORD_LIST_DIR):
+        for filename in os.listdir(config.WORD_LIST_DIR):
+            parts = filename[:-len("_common.txt")].rsplit("_", 1) if filename.endswith("_common.txt") else []
+            if len(parts) == 2 and parts[1].isdigit():
+                try:
+                    word_list_paths(int(parts[1]), parts[0])
+                    variants.add((int(parts[1]), parts[0]))
+                except ValueError:
+                    continue
+    return sorted(variants)
+
+
+def build_corpus_records(
+    common_path: str = None,
+    valid_path: str = None,
+    length: int = config.DEFAULT_WORD_LENGTH,
+    alphabet: str = ALPHABET
+) -> np.ndarray:
+    """
+    Merges the common and valid word lists into sorted corpus_dtype() records.
+
+    Follows create_words_df(): a word in both lists counts as common, and words are
+    sorted alphabetically. Words of another length or with letters outside the
+    alphabet are left out.
+
+    Args:
+      common_path (str): Common words file. Defaults to config.WORDLE_COMMON_WORDS.
+      valid_path (str): Valid words file. Defaults to config.WORDLE_VALID_WORDS.
+      length (int): Word length of the corpus. Defaults to config.DEFAULT_WORD_LENGTH.
+      alphabet (str): Letters words may use. Defaults to English a-z.
+
+    Returns:
+      np.ndarray: One record per distinct word.
+    """
+    letters = set(alphabet)
+
+    def usable(words: List[str]) -> Set[str]:
+        return {word for word in words if len(word) == length and letters.issuperset(word)}
+
+    common_words = usable(read_word_list(common_path or config.WORDLE_COMMON_WORDS))
+    words = sorted(common_words.union(usable(read_word_list(valid_path or config.WORDLE_VALID_WORDS))))
+    records = np.empty(len(words), dtype=corpus_dtype(length))
+    records["word"] = words
+    records["common"] = [word in common_words for word in words]
+    return records
+
+
+def corpus_version(
+    common_path: str = None,
+    valid_path: str = None,
+    length: int = config.DEFAULT_WORD_LENGTH,
+    alphabet: str = ALPHABET
+) -> str:
+    """
+    Returns the content hash of a variant's source word lists, which names its corpus version.
+
+    The word length and alphabet are part of the hash, so each variant has its own versions.
+    """
+    digest = hashlib.sha256(f"{length}:{alphabet}".encode("utf-8"))
+    for path in (common_path or config.WORDLE_COMMON_WORDS, valid_path or config.WORDLE_VALID_WORDS):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def corpus_artifact_path(
+    common_path: str = None,
+    valid_path: str = None,
+    length: int = config.DEFAULT_WORD_LENGTH,
+    alphabet: str = ALPHABET,
+    version: str = None
+) -> str:
+    """
+    Returns the cache path of the prebuilt corpus, named by its version (see corpus_version()).
+
+    Any edit to a source list changes the name, so a stale artifact is never loaded, and
+    artifacts of earlier versions stay loadable by processes still using them.
+    """
+    version = version or corpus_version(common_path, valid_path, length, alphabet)
+    filename = f"corpus-v{config.CORPUS_ARTIFACT_VERSION}-{length}-{version}.bin"
+    return os.path.join(config.CACHE_DIR, filename)
+
+
+def load_corpus_records(
+    common_path: str = None,
+    valid_path: str = None,
+    length: int = config.DEFAULT_WORD_LENGTH,
+    alphabet: str = ALPHABET
+) -> np.ndarray:
+    """
+    Loads the prebuilt corpus with a single np.fromfile call, building it from the word lists if needed.
+
+    Returns:
+      np.ndarray: corpus_dtype(length) records.
+    """
+    path = corpus_artifact_path(common_path, valid_path, length, alphabet)
+    if not os.path.exists(path):
+        records = build_corpus_records(common_path, valid_path, length, alphabet)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        records.tofile(tmp_path)
+        os.replace(tmp_path, path)
+        return records
+    return np.fromfile(path, dtype=corpus_dtype(length))
+
+
+# (length, language) -> (last check, source files, their signature, version)
+_current_versions: Dict[Tuple[int, str], Tuple[float, Tuple[str, ...], Tuple[Tuple[int, int], ...], str]] = {}
+# (length, language) -> newest corpus handed out, whose derived data the next version inherits
+_latest: Dict[Tuple[int, str], WordCorpus] = {}
+
+
+def current_version(length: int = config.DEFAULT_WORD_LENGTH, language: str = config.DEFAULT_LANGUAGE, force: bool = False) -> str:
+    """
+    Returns the version of a variant's source word lists as they are on disk now.
+
+    The files are only stat'ed once every config.CORPUS_RELOAD_INTERVAL seconds (always with
+    force=True or when the configured paths changed) and only hashed again when their size
+    or modification time changed.
+    """
+    key = (int(length), language)
+    paths = word_list_paths(*key)
+    now = time.monotonic()
+    checked = _current_versions.get(key)
+    if checked is not None and checked[1] != paths:
+        checked = None
+    if checked is not None and not force and now - checked[0] < config.CORPUS_RELOAD_INTERVAL:
+        return checked[3]
+    signature = tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, paths))
+    if checked is not None and checked[2] == signature:
+        version = checked[3]
+    else:
+        version = corpus_version(*paths, key[0], get_alphabet(language))
+    _current_versions[key] = (now, paths, signature, version)
+    return version
+
+
+def get_corpus(
+    length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE,
+    version: str = None
+) -> WordCorpus:
+    """
+    Returns the process-wide word corpus of a word length and language, loading it on first use.
+
+    Variants are loaded independently, so only the ones actually played take memory. When
+    the source word lists change on disk, the next call (after at most
+    config.CORPUS_RELOAD_INTERVAL seconds) loads and returns the new version: running
+    processes hot-reload without a restart. Games already holding the previous corpus keep
+    it, since their candidate masks are over its word ids; passing their corpus.version
+    returns that exact version (e.g. in worker processes).
+
+    Raises:
+      ValueError: If the variant has no word lists, or the asked version is no longer available.
+    """
+    key = (int(length), language)
+    corpus = _load_corpus(*key, version or current_version(*key))
+    if version is None and _latest.get(key) is not corpus:
+        previous = _latest.get(key)
+        if previous is not None:
+            corpus.inherit(previous)
+        _latest[key] = corpus
+    return corpus
+
+
+def reload_corpus(length: int = config.DEFAULT_WORD_LENGTH, language: str = config.DEFAULT_LANGUAGE) -> WordCorpus:
+    """
+    Checks the source word lists right away and returns the (possibly new) current corpus.
+    """
+    current_version(length, language, force=True)
+    return get_corpus(length, language)
+
+
+# Loaded corpora by (length, language, version). Entries go away once nothing holds the
+# corpus any more: no game, no recent lookup and no newest version of its variant
+_corpora: "weakref.WeakValueDictionary[Tuple[int, str, str], WordCorpus]" = weakref.WeakValueDictionary()
+# The last config.CORPUS_CACHE_SIZE corpora looked up, kept even while no game holds them (e.g. in worker processes)
+_recent: "OrderedDict[Tuple[int, str, str], WordCorpus]" = OrderedDict()
+
+
+def _load_corpus(length: int, language: str, version: str) -> WordCorpus:
+    key = (length, language, version)
+    corpus = _corpora.get(key)
+    if corpus is None:
+        corpus = _corpora[key] = _read_corpus(length, language, version)
+    _recent[key] = corpus
+    _recent.move_to_end(key)
+    while len(_recent) > config.CORPUS_CACHE_SIZE:
+        _recent.popitem(last=False)
+    return corpus
+
+
+def _read_corpus(length: int, language: str, version: str) -> WordCorpus:
+    alphabet = get_alphabet(language)
+    path = corpus_artifact_path(length=length, alphabet=alphabet, version=version)
+    if os.path.exists(path):
+        records = np.fromfile(path, dtype=corpus_dtype(length))
+    else:
+        common_path, valid_path = word_list_paths(length, language)
+        if corpus_version(common_path, valid_path, length, alphabet) != version:
+            raise ValueError(f"Corpus version {version} of {length}-letter '{language}' words is no longer available.")
+        records = load_corpus_records(common_path, valid_path, length, alphabet)
+    corpus = WordCorpus.from_records(records, alphabet, language)
+    corpus.version = version
+    return corpus
@@ -0,0 +1,348 @@
+"""
+Dictionary update pipeline: validates the source word lists and applies word diffs.
+
+`check` reports entries that are not lowercase, have the wrong length or letters,
+duplicates, unsorted lists, common words missing from the valid list and redundant copies
+of a source list; `--fix` rewrites the sources in canonical form (lowercase, sorted,
+distinct). `apply` takes a JSON diff such as
+
+    {"add": {"zonal": "uncommon"}, "remove": ["aahed"], "rarity": {"abbey": "uncommon"}}
+
+and writes the new lists, which makes a new corpus version. Its derived artifacts are
+updated incrementally from the previous version instead of being rebuilt: the pattern
+matrix only computes the rows and columns of the changed words, and the opening books only
+recompute the states the changed words can reach. Running CLIs and servers pick the new
+version up on their own (see corpus.get_corpus()), updating their letter index in place.
+
+Usage:
+    python -m wordle_assistant.dictionary check [--fix]
+    python -m wordle_assistant.dictionary apply changes.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import corpus_artifact_path, get_alphabet, reload_corpus, word_list_paths
+from wordle_assistant.minimax import answer_difficulty_path
+from wordle_assistant.opening_book import opening_book_path, update_opening_book
+from wordle_assistant.pattern_matrix import pattern_matrix_path, update_pattern_matrix
+
+RARITIES = ("common", "uncommon")
+
+# {"add": {word: rarity}, "remove": [word, ...], "rarity": {word: rarity}}
+Diff = Dict[str, Any]
+
+
+def check_word_list(path: str, length: int = config.DEFAULT_WORD_LENGTH, alphabet: str = None) -> Dict[str, List[str]]:
+    """
+    Finds the entries of one source list that are not in canonical form.
+
+    Args:
+      path (str): The word list, one word per line.
+      length (int): Word length of the variant.
+      alphabet (str): Letters words may use. Defaults to the English alphabet.
+
+    Returns:
+      Dict[str, List[str]]: Offending entries under 'case' (not stripped lowercase),
+        'malformed' (wrong length or letters), 'duplicates' and 'unsorted' (entries
+        smaller than the one before them). Empty lists mean the list is canonical.
+    """
+    letters = set(alphabet or get_alphabet())
+    issues: Dict[str, List[str]] = {"case": [], "malformed": [], "duplicates": [], "unsorted": []}
+    seen: Set[str] = set()
+    previous = ""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = line.rstrip("\n")
+            word = entry.strip().lower()
+            if not word:
+                continue
+            if entry != word:
+                issues["case"].append(entry)
+            if len(word) != length or not letters.issuperset(word):
+                issues["malformed"].append(entry)
+            if word in seen:
+                issues["duplicates"].append(word)
+            elif word < previous:
+                issues["unsorted"].append(word)
+            seen.add(word)
+            previous = max(previous, word)
+    return issues
+
+
+def canonical_words(path: str, length: int = config.DEFAULT_WORD_LENGTH, alphabet: str = None) -> List[str]:
+    """
+    Returns the usable words of a source list: lowercase, of the right length and letters, sorted and distinct.
+    """
+    letters = set(alphabet or get_alphabet())
+    with open(path, encoding="utf-8") as f:
+        words = {line.strip().lower() for line in f}
+    return sorted(word for word in words if len(word) == length and letters.issuperset(word))
+
+
+def source_copies(paths: Sequence[str], length: int = config.DEFAULT_WORD_LENGTH, alphabet: str = None) -> List[str]:
+    """
+    Finds other .txt/.csv files next to the sources that hold the same words as one of them.
+
+    Such copies are never read, so they silently drift from the sources after an update.
+    """
+    sources = {os.path.abspath(path) for path in paths}
+    contents = [canonical_words(path, length, alphabet) for path in paths]
+    copies = []
+    for directory in sorted({os.path.dirname(path) for path in sources}):
+        for filename in sorted(os.listdir(directory)):
+            path = os.path.join(directory, filename)
+            if path in sources or not filename.endswith((".txt", ".csv")) or not os.path.isfile(path):
+                continue
+            try:
+                if canonical_words(path, length, alphabet) in contents:
+                    copies.append(path)
+            except UnicodeDecodeError:
+                continue
+    return copies
+
+
+def check_sources(length: int = config.DEFAULT_WORD_LENGTH, language: str = config.DEFAULT_LANGUAGE) -> Dict[str, Any]:
+    """
+    Validates the common and valid word lists of a variant.
+
+    Returns:
+      Dict[str, Any]: check_word_list() issues under 'common' and 'valid', the common words
+        missing from the valid list under 'common_not_valid' and redundant source copies
+        under 'copies'.
+    """
+    alphabet = get_alphabet(language)
+    common_path, valid_path = word_list_paths(length, language)
+    valid = set(canonical_words(valid_path, length, alphabet))
+    return {
+        "common": check_word_list(common_path, length, alphabet),
+        "valid": check_word_list(valid_path, length, alphabet),
+        "common_not_valid": [word for word in canonical_words(common_path, length, alphabet) if word not in valid],
+        "copies": source_copies((common_path, valid_path), length, alphabet),
+    }
+
+
+def has_issues(report: Dict[str, Any]) -> bool:
+    """
+    Returns True if a check_sources() report found anything.
+    """
+    lists = (report["common"], report["valid"])
+    return bool(report["common_not_valid"] or report["copies"] or any(any(issues.values()) for issues in lists))
+
+
+def write_word_lists(lists: Dict[str, Iterable[str]]):
+    """
+    Writes word lists (path -> words), one word per line.
+
+    Every list is written to a temporary file first and then all of them are swapped in
+    together, so readers never see a partially written list.
+    """
+    tmp_paths = {}
+    for path, words in lists.items():
+        tmp_paths[path] = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_paths[path], "w", encoding="utf-8") as f:
+            f.writelines(f"{word}\n" for word in words)
+    for path, tmp_path in tmp_paths.items():
+        os.replace(tmp_path, path)
+
+
+def fix_sources(length: int = config.DEFAULT_WORD_LENGTH, language: str = config.DEFAULT_LANGUAGE) -> Tuple[int, int]:
+    """
+    Rewrites the word lists of a variant in canonical form; every common word is also made valid.
+
+    Entries that are not words of the variant are dropped. Redundant copies are left alone.
+
+    Returns:
+      Tuple[int, int]: Number of common and valid words written.
+    """
+    alphabet = get_alphabet(language)
+    common_path, valid_path = word_list_paths(length, language)
+    common = canonical_words(common_path, length, alphabet)
+    valid = sorted(set(canonical_words(valid_path, length, alphabet)).union(common))
+    write_word_lists({common_path: common, valid_path: valid})
+    return len(common), len(valid)
+
+
+def read_diff(path: str) -> Diff:
+    """
+    Reads a JSON diff, see the module docstring. Missing sections are empty.
+
+    Raises:
+      ValueError: If the diff has unknown sections or a section of the wrong JSON type.
+    """
+    with open(path, encoding="utf-8") as f:
+        diff = json.load(f)
+    if not isinstance(diff, dict) or set(diff) - {"add", "remove", "rarity"}:
+        raise ValueError("A diff is an object with 'add', 'remove' and 'rarity' sections.")
+    for section, kind, example in (("add", dict, '{"word": "common"}'), ("remove", list, '["word"]'), ("rarity", dict, '{"word": "uncommon"}')):
+        if not isinstance(diff.get(section, kind()), kind):
+            raise ValueError(f"The '{section}' section of a diff must be a JSON {'object' if kind is dict else 'array'}, e.g. {example}.")
+    return {
+        "add": {str(word).strip().lower(): rarity for word, rarity in diff.get("add", {}).items()},
+        "remove": [str(word).strip().lower() for word in diff.get("remove", [])],
+        "rarity": {str(word).strip().lower(): rarity for word, rarity in diff.get("rarity", {}).items()},
+    }
+
+
+def validate_diff(diff: Diff, corpus) -> List[str]:
+    """
+    Checks a diff against the corpus it applies to.
+
+    Returns:
+      List[str]: One message per problem; empty if the diff can be applied.
+    """
+    letters = set(corpus.alphabet)
+    errors = []
+    for section in ("add", "rarity"):
+        for word, rarity in diff[section].items():
+            if rarity not in RARITIES:
+                errors.append(f"{section}: '{word}' has unknown rarity '{rarity}' (expected one of {', '.join(RARITIES)}).")
+    for word in diff["add"]:
+        if len(word) != corpus.length or not letters.issuperset(word):
+            errors.append(f"add: '{word}' is not a {corpus.length}-letter word of the alphabet.")
+        elif word in corpus:
+            errors.append(f"add: '{word}' is already in the word list.")
+    for section in ("remove", "rarity"):
+        errors.extend(f"{section}: '{word}' is not in the word list." for word in diff[section] if word not in corpus)
+    sections = [set(diff["add"]), set(diff["remove"]), set(diff["rarity"])]
+    for word in sorted((sections[0] & sections[1]) | (sections[0] & sections[2]) | (sections[1] & sections[2])):
+        errors.append(f"'{word}' appears in more than one section.")
+    return errors
+
+
+def artifact_paths(corpus) -> List[str]:
+    """
+    Returns the cache files a corpus version has or may get: the corpus itself, its pattern
+    matrix, the opening book of every strategy and the answer difficulty analysis.
+    """
+    return [
+        corpus_artifact_path(length=corpus.length, alphabet=corpus.alphabet, version=corpus.version),
+        pattern_matrix_path(corpus.words, corpus.words[corpus.answer_ids]),
+        *(opening_book_path(corpus, strategy) for strategy in config.RANK_STRATEGIES),
+        answer_difficulty_path(corpus),
+    ]
+
+
+def prune_versions(previous, corpus, keep: int = config.CORPUS_KEEP_VERSIONS) -> List[str]:
+    """
+    Records a new corpus version in its variant's manifest and deletes the artifacts of old ones.
+
+    The manifest ('versions-{length}-{language}.json' in config.CACHE_DIR) lists the versions
+    applied so far with their artifact paths, oldest first. Only the last `keep` versions keep
+    their files, so processes still playing the previous version can load it, while older
+    ones no longer pile up in the cache.
+
+    Returns:
+      List[str]: The deleted files.
+    """
+    path = os.path.join(config.CACHE_DIR, f"versions-{corpus.length}-{corpus.language}.json")
+    versions: List[Dict[str, Any]] = []
+    if os.path.exists(path):
+        with open(path) as f:
+            versions = json.load(f)["versions"]
+    for version in (previous, corpus):
+        if not any(entry["version"] == version.version for entry in versions):
+            versions.append({"version": version.version, "paths": artifact_paths(version)})
+    live = {artifact for entry in versions[-keep:] for artifact in entry["paths"]}
+    removed = []
+    for entry in versions[:-keep]:
+        for artifact in entry["paths"]:
+            if artifact not in live and os.path.exists(artifact):
+                os.remove(artifact)
+                removed.append(artifact)
+    os.makedirs(config.CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"versions": versions[-keep:]}, f, indent=2)
+    os.replace(tmp_path, path)
+    return removed
+
+
+def apply_diff(diff: Diff, length: int = config.DEFAULT_WORD_LENGTH, language: str = config.DEFAULT_LANGUAGE) -> Dict[str, Any]:
+    """
+    Applies a diff to the word lists of a variant and updates the derived artifacts incrementally.
+
+    The new lists are written in canonical form (the valid list holds every word), which
+    makes a new corpus version. The cached pattern matrix and the saved opening book of
+    every strategy of the previous version are then carried over (see
+    update_pattern_matrix() and update_opening_book()); artifacts the previous version did
+    not have are left to be built on demand. Artifacts of versions before the previous one
+    are deleted (see prune_versions()).
+
+    Raises:
+      ValueError: If the diff does not apply to the current word lists (see validate_diff()).
+
+    Returns:
+      Dict[str, Any]: A report of the update.
+    """
+    start = time.perf_counter()
+    previous = reload_corpus(length, language)
+    errors = validate_diff(diff, previous)
+    if errors:
+        raise ValueError("Invalid diff:\n" + "\n".join(errors))
+
+    words = dict(zip(previous.words.tolist(), previous.common.tolist()))
+    for word in diff["remove"]:
+        del words[word]
+    for section in ("add", "rarity"):
+        words.update((word, rarity == "common") for word, rarity in diff[section].items())
+    common_path, valid_path = word_list_paths(length, language)
+    write_word_lists({common_path: sorted(word for word, common in words.items() if common), valid_path: sorted(words)})
+    corpus = reload_corpus(length, language)
+
+    matrix_path = update_pattern_matrix(previous, corpus)  # Before the books, whose rankings may need the matrix
+    changed = [*diff["add"], *diff["remove"], *diff["rarity"]]
+    books = {}
+    for strategy in config.RANK_STRATEGIES:
+        updated = update_opening_book(previous, corpus, strategy, changed)
+        if updated is not None:
+            books[strategy] = {"path": updated[0], "kept": updated[1], "computed": updated[2]}
+    removed = prune_versions(previous, corpus)
+    return {
+        "previous_version": previous.version,
+        "version": corpus.version,
+        "added": len(diff["add"]),
+        "removed": len(diff["remove"]),
+        "rarity_changed": len(diff["rarity"]),
+        "words": corpus.size,
+        "answers": len(corpus.answer_ids),
+        "pattern_matrix": matrix_path,
+        "opening_books": books,
+        "pruned": removed,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the word lists and apply dictionary updates.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check_parser = subparsers.add_parser("check", help="Validate the source word lists.")
+    check_parser.add_argument("--fix", action="store_true", help="Rewrite the lists in canonical form.")
+    apply_parser = subparsers.add_parser("apply", help="Apply a JSON diff of added, removed and re-rated words.")
+    apply_parser.add_argument("diff", type=str, help="Path of the diff.")
+    for subparser in (check_parser, apply_parser):
+        subparser.add_argument("--length", type=int, default=config.DEFAULT_WORD_LENGTH, help="Word length of the variant.")
+        subparser.add_argument("--language", type=str, default=config.DEFAULT_LANGUAGE, help="Language of the variant.")
+    args = parser.parse_args()
+
+    if args.command == "check":
+        report = check_sources(args.length, args.language)
+        print(json.dumps(report, indent=2))
+        if args.fix:
+            common, valid = fix_sources(args.length, args.language)
+            print(f"Rewrote the word lists: {common} common and {valid} valid words.")
+        elif has_issues(report):
+            sys.exit(1)
+    else:
+        try:
+            report = apply_diff(read_diff(args.diff), args.length, args.language)
+        except ValueError as error:
+            sys.exit(str(error))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
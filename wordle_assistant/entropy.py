@@ -0,0 +1,208 @@
+import numpy as np
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.feedback import feedback_patterns, pattern_count
+
+
+def bucket_counts(patterns: np.ndarray, n_patterns: int = 243, chunk_size: int = 64) -> np.ndarray:
+    """
+    Counts how many answers fall in each feedback pattern bucket, for every guess.
+
+    Histograms are built with np.bincount over row-offset pattern ids, a few dozen
+    guesses at a time so the counters stay in cache.
+
+    Args:
+      patterns (np.ndarray): Pattern ids of shape (G, N).
+      n_patterns (int): Number of distinct pattern ids. Defaults to 243 (five letters).
+      chunk_size (int): Number of guesses counted per np.bincount call. Defaults to 64.
+
+    Returns:
+      np.ndarray: Bucket sizes of shape (G, n_patterns).
+    """
+    n_guesses = patterns.shape[0]
+    counts = np.empty((n_guesses, n_patterns), dtype=np.int64)
+    offsets = (np.arange(chunk_size, dtype=np.intp) * n_patterns)[:, None]
+    for start in range(0, n_guesses, chunk_size):
+        chunk = patterns[start:start + chunk_size]
+        rows = len(chunk)
+        flat = (chunk + offsets[:rows]).ravel()
+        counts[start:start + rows] = np.bincount(flat, minlength=rows * n_patterns).reshape(rows, n_patterns)
+    return counts
+
+
+def pattern_entropy(patterns: np.ndarray, n_patterns: int = 243) -> np.ndarray:
+    """
+    Computes the Shannon entropy (in bits) of the feedback pattern distribution of each guess.
+
+    Uses H = log2(N) - sum(c * log2(c)) / N over the bucket sizes c, with c * log2(c)
+    read from a lookup table instead of taking logs of every bucket.
+
+    Args:
+      patterns (np.ndarray): Pattern ids of shape (G, N), one row per guess over N equally likely answers.
+      n_patterns (int): Number of distinct pattern ids. Defaults to 243 (five letters).
+
+    Returns:
+      np.ndarray: float32 entropies of shape (G,).
+    """
+    n_guesses, n_answers = patterns.shape
+    if n_answers == 0:
+        return np.zeros(n_guesses, dtype=np.float32)
+    sizes = np.arange(n_answers + 1, dtype=np.float64)
+    c_log_c = np.zeros(n_answers + 1, dtype=np.float32)
+    c_log_c[1:] = sizes[1:] * np.log2(sizes[1:])
+    spread = c_log_c[bucket_counts(patterns, n_patterns)].sum(axis=1)
+    return (np.log2(n_answers) - spread / n_answers).astype(np.float32)
+
+
+def expected_remaining(patterns: np.ndarray, n_patterns: int = 243) -> np.ndarray:
+    """
+    Computes the expected number of answers left after each guess (sum of squared bucket sizes / N).
+
+    Args:
+      patterns (np.ndarray): Pattern ids of shape (G, N).
+      n_patterns (int): Number of distinct pattern ids. Defaults to 243 (five letters).
+
+    Returns:
+      np.ndarray: float32 expected candidate counts of shape (G,).
+    """
+    n_guesses, n_answers = patterns.shape
+    if n_answers == 0:
+        return np.zeros(n_guesses, dtype=np.float32)
+    counts = bucket_counts(patterns, n_patterns)
+    return ((counts * counts).sum(axis=1) / n_answers).astype(np.float32)
+
+
+def candidate_patterns(
+    corpus,
+    candidates: np.ndarray,
+    guess_ids: np.ndarray = None,
+    max_answers: int = None,
+    seed: int = 0,
+    rows: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gathers the feedback patterns of the given guesses against the remaining candidate answers.
+
+    Common candidates are read from the cached pattern matrix. If no common word is left,
+    the remaining (uncommon) candidates are scored on the fly. Answer sets larger than
+    max_answers are sampled uniformly so the cost per turn stays bounded.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      candidates (np.ndarray): Boolean mask of words that are still possible.
+      guess_ids (np.ndarray): Corpus ids of the guesses to score; defaults to every word.
+      max_answers (int): Sample size limit; defaults to config.ENTROPY_SAMPLE_SIZE.
+      seed (int): Seed of the sampling generator, so rankings are reproducible.
+      rows (np.ndarray): The pattern matrix rows of guess_ids, if already gathered.
+
+    Returns:
+      Tuple[np.ndarray, np.ndarray]: The (G, N) pattern ids and the N corpus ids of the answers used.
+    """
+    max_answers = config.ENTROPY_SAMPLE_SIZE if max_answers is None else max_answers
+    columns = np.flatnonzero(candidates[corpus.answer_ids])
+    use_matrix = len(columns) > 0
+    answer_ids = corpus.answer_ids[columns] if use_matrix else np.flatnonzero(candidates)
+
+    if len(answer_ids) > max_answers:
+        sample = np.sort(np.random.default_rng(seed).choice(len(answer_ids), max_answers, replace=False))
+        columns = columns[sample] if use_matrix else columns
+        answer_ids = answer_ids[sample]
+
+    if use_matrix:
+        if rows is None:
+            rows = corpus.patterns if guess_ids is None else corpus.patterns[guess_ids]
+        return rows[:, columns], answer_ids
+    guess_codes = corpus.codes if guess_ids is None else corpus.codes[guess_ids]
+    return feedback_patterns(guess_codes, corpus.codes[answer_ids]).reshape(len(guess_codes), -1), answer_ids
+
+
+def expected_information(
+    corpus,
+    candidates: np.ndarray,
+    guess_ids: np.ndarray = None,
+    max_answers: int = None,
+    metric: str = "entropy"
+) -> np.ndarray:
+    """
+    Scores guesses by how much they are expected to narrow the remaining candidates.
+
+    With metric="entropy" the score is the entropy of the guess's feedback distribution;
+    with metric="remaining" it is the negated expected number of candidates left, so that
+    higher is better for both. Each guess also gets its chance of being the answer
+    outright, so candidates win ties against non-candidates.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      candidates (np.ndarray): Boolean mask of words that are still possible.
+      guess_ids (np.ndarray): Corpus ids of the guesses to score; defaults to every word.
+      max_answers (int): Sample size limit; defaults to config.ENTROPY_SAMPLE_SIZE.
+      metric (str): "entropy" or "remaining". Defaults to "entropy".
+
+    Returns:
+      np.ndarray: float32 scores, one per guess.
+    """
+    patterns, answer_ids = candidate_patterns(corpus, candidates, guess_ids, max_answers)
+    n_patterns = pattern_count(corpus.length)
+    if metric == "entropy":
+        scores = pattern_entropy(patterns, n_patterns)
+    elif metric == "remaining":
+        scores = -expected_remaining(patterns, n_patterns)
+    else:
+        raise ValueError(f"Unknown metric '{metric}'.")
+    if len(answer_ids):
+        is_candidate = candidates if guess_ids is None else candidates[guess_ids]
+        scores += is_candidate.astype(np.float32) / max(int(candidates.sum()), 1)
+    return scores
+
+
+def board_information(
+    corpus,
+    boards: np.ndarray,
+    guess_ids: np.ndarray,
+    weights: np.ndarray = None,
+    max_answers: int = None,
+    metric: str = "entropy"
+) -> np.ndarray:
+    """
+    Sums expected_information() over several boards' candidates with one histogram pass.
+
+    The guesses' pattern matrix rows are gathered once, and each board's pattern ids are
+    offset into a block of their own, so a single bucket_counts() call counts every board.
+    Meant for a shortlist of guesses: the histogram has boards * 3 ** length buckets per guess.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      boards (np.ndarray): Boolean candidate masks of shape (B, N).
+      guess_ids (np.ndarray): Corpus ids of the guesses to score.
+      weights (np.ndarray): Multiplier of each board's score (e.g. how many boards share it); defaults to 1.
+      max_answers (int): Sample size limit per board; defaults to config.ENTROPY_SAMPLE_SIZE.
+      metric (str): "entropy" or "remaining". Defaults to "entropy".
+
+    Returns:
+      np.ndarray: float32 summed scores, one per guess.
+    """
+    if metric not in ("entropy", "remaining"):
+        raise ValueError(f"Unknown metric '{metric}'.")
+    weights = np.ones(len(boards)) if weights is None else weights
+    n_patterns = pattern_count(corpus.length)
+    rows = np.asarray(corpus.patterns[guess_ids])
+    blocks, sizes = [], []
+    for board, mask in enumerate(boards):
+        patterns, answer_ids = candidate_patterns(corpus, mask, guess_ids, max_answers, rows=rows)
+        blocks.append(patterns.astype(np.int32) + board * n_patterns)
+        sizes.append(len(answer_ids))
+    counts = bucket_counts(np.hstack(blocks), len(boards) * n_patterns).reshape(len(guess_ids), len(boards), n_patterns)
+    sizes = np.array(sizes, dtype=np.float64)
+    live = sizes > 0
+    if metric == "entropy":
+        size_range = np.arange(int(sizes.max(initial=0)) + 1, dtype=np.float64)
+        c_log_c = np.zeros(len(size_range), dtype=np.float32)
+        c_log_c[1:] = size_range[1:] * np.log2(size_range[1:])
+        per_board = np.log2(np.maximum(sizes, 1)) - c_log_c[counts].sum(axis=2) / np.maximum(sizes, 1)
+    else:
+        per_board = -(counts * counts).sum(axis=2) / np.maximum(sizes, 1)
+    scores = (per_board[:, live] * weights[live]).sum(axis=1)
+    # Chance of solving each board outright, as in expected_information()
+    remaining = boards.sum(axis=1)
+    scores += (boards[live][:, guess_ids] * (weights[live] / np.maximum(remaining[live], 1))[:, None]).sum(axis=0)
+    return scores.astype(np.float32)
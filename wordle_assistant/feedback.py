@@ -0,0 +1,101 @@
+import numpy as np
+from typing import *
+
+# Letter states, matching the 0/1/2 feedback entered in the CLI
+GRAY = 0
+GREEN = 1
+YELLOW = 2
+
+
+def pattern_count(length: int = 5) -> int:
+    """
+    Returns the number of distinct feedback patterns for a word length (3 ** length).
+    """
+    return 3 ** length
+
+
+def pattern_dtype(length: int = 5) -> np.dtype:
+    """
+    Returns the smallest unsigned dtype able to hold every pattern id for a word length.
+    """
+    return np.dtype(np.uint8) if pattern_count(length) <= 256 else np.dtype(np.uint16)
+
+
+def pattern_id(letter_state: Sequence[int]) -> int:
+    """
+    Encodes a letter state tuple as a base-3 pattern id (first letter is the lowest digit).
+
+    Args:
+      letter_state (Sequence[int]): 0 = Gray, 1 = Green, 2 = Yellow for each letter.
+
+    Returns:
+      int: The pattern id.
+    """
+    return sum(int(state) * 3 ** i for i, state in enumerate(letter_state))
+
+
+def pattern_to_state(pattern: int, length: int = 5) -> Tuple[int, ...]:
+    """
+    Decodes a base-3 pattern id back into a letter state tuple.
+
+    Args:
+      pattern (int): The pattern id.
+      length (int): The word length. Defaults to 5.
+
+    Returns:
+      Tuple[int, ...]: The letter states.
+    """
+    pattern = int(pattern)
+    return tuple((pattern // 3 ** i) % 3 for i in range(length))
+
+
+def feedback_patterns(guess_codes: np.ndarray, answer_codes: np.ndarray) -> np.ndarray:
+    """
+    Scores one or many guesses against many answers in a single vectorized pass.
+
+    Duplicate letters follow Wordle rules: greens are assigned first, then a repeated
+    guess letter is only yellow while the answer still has unmatched copies of it,
+    left to right.
+
+    Args:
+      guess_codes (np.ndarray): Encoded guess of shape (L,) or guesses of shape (G, L).
+      answer_codes (np.ndarray): Encoded answers of shape (N, L).
+
+    Returns:
+      np.ndarray: Pattern ids of shape (N,) for one guess or (G, N) for many.
+    """
+    single = guess_codes.ndim == 1
+    guesses = np.atleast_2d(guess_codes)[:, None, :]  # (G, 1, L)
+    answers = answer_codes[None, :, :]  # (1, N, L)
+    length = answer_codes.shape[1]
+
+    green = guesses == answers  # (G, N, L)
+    patterns = np.zeros(green.shape[:2], dtype=pattern_dtype(length))
+    for i in range(length):
+        letter = guesses[:, :, i]
+        # Copies of this letter in the answer that are not already matched by a green
+        unmatched = ((answers == letter[:, :, None]) & ~green).sum(axis=2)
+        # Earlier non-green copies of the same letter in the guess claim yellows first
+        claimed = np.zeros_like(unmatched)
+        for j in range(i):
+            claimed += (guesses[:, :, j] == letter) & ~green[:, :, j]
+        yellow = ~green[:, :, i] & (claimed < unmatched)
+        patterns += (green[:, :, i] * GREEN + yellow * YELLOW).astype(patterns.dtype) * 3 ** i
+    return patterns[0] if single else patterns
+
+
+def feedback_pattern(guess: str, answer: str) -> Tuple[int, ...]:
+    """
+    Returns the letter states Wordle would show for a guess against an answer.
+
+    Args:
+      guess (str): The guessed word.
+      answer (str): The answer word.
+
+    Returns:
+      Tuple[int, ...]: 0 = Gray, 1 = Green, 2 = Yellow for each letter.
+    """
+    if len(guess) != len(answer):
+        raise ValueError("The guess and the answer must have the same length.")
+    codes = np.array([guess, answer]).view(np.uint32).reshape(2, -1)  # Code points work for any alphabet
+    return pattern_to_state(feedback_patterns(codes[0], codes[1:])[0], len(guess))
@@ -1,31 +1,139 @@
-import pandas as pd
-from typing import List, Tuple, Dict
-from wordle_assistant.core import wordle_filter, create_words_df
+import numpy as np
+from typing import TYPE_CHECKING, List, Optional, Tuple, Dict, Union
+from wordle_assistant import core_config as config
+from wordle_assistant.core import wordle_filter_mask
+from wordle_assistant.corpus import WordCorpus, get_corpus
+from wordle_assistant.feedback import GREEN, feedback_pattern, feedback_patterns, pattern_id, pattern_to_state
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from wordle_assistant.sessions import SessionLog
 
 
 class WordleUser:
-    def __init__(self, username: str):
+    def __init__(self, username: str, hard_mode: bool = False, corpus: WordCorpus = None):
         self.username = username
+        self.hard_mode = hard_mode
         self.guesses: List[str] = []
-        self.letter_states: List[Tuple[int, int, int, int, int]] = []
+        self.letter_states: List[Tuple[int, ...]] = []
         self.completed = False
         self.word_found = False
-        self.word_list_df = create_words_df()  # Each user has their own word list
+        self.corpus = corpus or get_corpus()  # Shared, read-only word list of the user's word length and language
+        self._packed_candidates = np.packbits(self.corpus.full_mask())  # Each user only tracks which words remain, 1 bit per word
+        self.candidate_history: List[np.ndarray] = []  # Packed candidate masks before each guess, for undo
         self.answer = None 
+        # Hard mode also tracks which words may still be guessed, with its own undo history
+        self._packed_allowed = self._packed_candidates if hard_mode else None
+        self.allowed_history: List[np.ndarray] = []
+        self.session_log: Optional["SessionLog"] = None  # Set when the game persists its sessions
+
+    @property
+    def candidates(self) -> np.ndarray:
+        """
+        Boolean mask over the corpus word ids of the words still possible for this user.
+        """
+        return np.unpackbits(self._packed_candidates, count=self.corpus.size).view(bool)
+
+    @candidates.setter
+    def candidates(self, mask: np.ndarray):
+        self._packed_candidates = np.packbits(mask)
+
+    @property
+    def packed_candidates(self) -> np.ndarray:
+        """
+        The candidate mask packed one bit per word, cheap to send to other processes.
+        """
+        return self._packed_candidates
+
+    @property
+    def allowed(self) -> np.ndarray:
+        """
+        Boolean mask over the corpus word ids of the words this user may guess next.
+
+        Outside hard mode every word is allowed.
+        """
+        if self._packed_allowed is None:
+            return self.corpus.full_mask()
+        return np.unpackbits(self._packed_allowed, count=self.corpus.size).view(bool)
 
-    def add_guess(self, guess: str, letter_state: Tuple[int, int, int, int, int]):
+    @property
+    def packed_allowed(self) -> Optional[np.ndarray]:
+        """
+        The hard-mode allowed mask packed one bit per word, or None outside hard mode.
+        """
+        return self._packed_allowed
+
+    def is_allowed(self, guess: str) -> bool:
+        """
+        Checks whether a guess is a known word that respects the hard-mode hints so far.
+        """
+        if not self.hard_mode:
+            return True
+        word_id = self.corpus.index_of(guess)
+        return word_id >= 0 and bool(self.allowed[word_id])
+
+    @property
+    def word_list_df(self) -> "pd.DataFrame":
+        """
+        Returns a DataFrame copy of the corpus with this user's eliminated words marked.
+        """
+        return self.corpus.to_df(self.candidates)
+
+    def add_guess(self, guess: str, letter_state: Tuple[int, ...]):
         """
         Adds a guess and its corresponding letter states.
         """
         self.guesses.append(guess)
         self.letter_states.append(letter_state)
-        self.filter_word_list()  # Update their word list after each guess
+        self.candidate_history.append(self._packed_candidates)
+        # Only the newest guess needs applying, earlier ones already narrowed the candidates
+        self.candidates = wordle_filter_mask(self.corpus.codes, [guess], [letter_state], self.candidates, self.corpus.alphabet)
+        if self.hard_mode:
+            self.allowed_history.append(self._packed_allowed)
+            self._packed_allowed = np.packbits(self.allowed & self.corpus.index.hard_mode_mask(guess, letter_state))
+        if self.session_log is not None:
+            self.session_log.record_guess(self)
+
+    def restore_guess(self, guess: str, letter_state: Tuple[int, ...], packed_candidates: np.ndarray, packed_allowed: Optional[np.ndarray]):
+        """
+        Adds a guess whose resulting masks are already known (e.g. from a session log) without filtering.
+        """
+        self.guesses.append(guess)
+        self.letter_states.append(letter_state)
+        self.candidate_history.append(self._packed_candidates)
+        self._packed_candidates = packed_candidates
+        if self.hard_mode:
+            self.allowed_history.append(self._packed_allowed)
+            self._packed_allowed = packed_allowed
+
+    def undo_guess(self) -> Tuple[str, Tuple[int, ...]]:
+        """
+        Removes the most recent guess and restores the candidates from before it.
+
+        Returns:
+          Tuple[str, Tuple[int, ...]]: The removed guess and its letter states.
+        """
+        if not self.guesses:
+            raise ValueError("No guesses to undo.")
+        self._packed_candidates = self.candidate_history.pop()
+        if self.hard_mode:
+            self._packed_allowed = self.allowed_history.pop()
+        self.completed = False
+        self.word_found = False
+        if self.session_log is not None:
+            self.session_log.record_undo(self)
+        return self.guesses.pop(), self.letter_states.pop()
     
     def filter_word_list(self):
         """
-        Updates the possible word list based on the user's guesses and feedback.
+        Rebuilds the possible word list from scratch by replaying every guess and its feedback.
         """
-        self.word_list_df = wordle_filter(self.word_list_df, user=self)
+        self.candidates = wordle_filter_mask(self.corpus.codes, self.guesses, self.letter_states, alphabet=self.corpus.alphabet)
+        if self.hard_mode:
+            allowed = self.corpus.full_mask()
+            for guess, letter_state in zip(self.guesses, self.letter_states):
+                allowed &= self.corpus.index.hard_mode_mask(guess, letter_state)
+            self._packed_allowed = np.packbits(allowed)
 
     def mark_completed(self, word_found: bool):
         """
@@ -33,60 +141,283 @@ class WordleUser:
         """
         self.completed = True
         self.word_found = word_found
+        if self.session_log is not None:
+            self.session_log.record_done(self)
     
 
+class MultiBoardUser:
+    """
+    A multi-board game (Dordle, Quordle, ...): every guess is played on all unsolved boards at once.
+
+    Candidates are one packed row per board. Each guess is scored once against the union
+    of the unsolved boards' candidates and every board is filtered by comparing that
+    single pattern row with its own feedback, so a turn costs about the same for 16
+    boards as for one.
+    """
+
+    def __init__(self, username: str, boards: int = 4, corpus: WordCorpus = None, max_guesses: int = None):
+        """
+        Args:
+          username (str): The player's username.
+          boards (int): Number of boards, each with its own answer.
+          corpus (WordCorpus): The shared word corpus; defaults to the default variant.
+          max_guesses (int): Guesses allowed; defaults to one per board plus config.MULTI_BOARD_EXTRA_GUESSES.
+        """
+        self.username = username
+        self.boards = boards
+        self.hard_mode = False  # Hard mode is not defined across boards
+        self.corpus = corpus or get_corpus()
+        self.max_guesses = max_guesses or boards + config.MULTI_BOARD_EXTRA_GUESSES
+        self.answers: List[Optional[str]] = [None] * boards
+        self.guesses: List[str] = []
+        self.letter_states: List[List[Optional[Tuple[int, ...]]]] = []  # Per guess, one entry per board (None once solved)
+        self.solved_at: List[Optional[int]] = [None] * boards  # Guess number that solved each board
+        self.completed = False
+        self.word_found = False
+        self._packed_candidates = np.packbits(np.ones((boards, self.corpus.size), dtype=bool), axis=1)
+        self.candidate_history: List[np.ndarray] = []
+        self.solved_pattern = pattern_id((GREEN,) * self.corpus.length)
+
+    @property
+    def candidates(self) -> np.ndarray:
+        """
+        Boolean masks of shape (boards, N) of the words still possible on each board.
+        """
+        return np.unpackbits(self._packed_candidates, axis=1, count=self.corpus.size).view(bool)
+
+    @property
+    def unsolved(self) -> np.ndarray:
+        """
+        Boolean mask of the boards not solved yet.
+        """
+        return np.array([turn is None for turn in self.solved_at])
+
+    def add_guess(self, guess: str, letter_states: List[Optional[Tuple[int, ...]]]):
+        """
+        Adds a guess with the letter states of every board, filtering all boards in one pass.
+
+        Args:
+          guess (str): The guess.
+          letter_states (List[Optional[Tuple[int, ...]]]): Feedback of each board; ignored for solved boards.
+        """
+        active = np.flatnonzero(self.unsolved)
+        observed = np.array([pattern_id(letter_states[board]) for board in active], dtype=np.int64)
+        candidates = self.candidates
+        ids = np.flatnonzero(candidates[active].any(axis=0))  # Only words still possible on some board
+        patterns = feedback_patterns(self.corpus.encode([guess])[0], self.corpus.codes[ids])
+        candidates[np.ix_(active, ids)] &= patterns[None, :] == observed[:, None]
+
+        self.candidate_history.append(self._packed_candidates)
+        self._packed_candidates = np.packbits(candidates, axis=1)
+        self.guesses.append(guess)
+        self.letter_states.append([None if self.solved_at[board] is not None else tuple(letter_states[board]) for board in range(self.boards)])
+        for board, pattern in zip(active, observed):
+            if pattern == self.solved_pattern:
+                self.solved_at[board] = len(self.guesses)
+
+    def undo_guess(self) -> Tuple[str, List[Optional[Tuple[int, ...]]]]:
+        """
+        Removes the most recent guess and restores every board from before it.
+
+        Returns:
+          Tuple[str, List[Optional[Tuple[int, ...]]]]: The removed guess and its letter states.
+        """
+        if not self.guesses:
+            raise ValueError("No guesses to undo.")
+        turn = len(self.guesses)
+        self.solved_at = [None if solved == turn else solved for solved in self.solved_at]
+        self._packed_candidates = self.candidate_history.pop()
+        self.completed = False
+        self.word_found = False
+        return self.guesses.pop(), self.letter_states.pop()
+
+    def mark_completed(self, word_found: bool):
+        """
+        Marks the game as completed for the user.
+        """
+        self.completed = True
+        self.word_found = word_found
+
+
 class WordleGame:
-    def __init__(self):
+    def __init__(
+        self,
+        hard_mode: bool = False,
+        word_length: int = config.DEFAULT_WORD_LENGTH,
+        language: str = config.DEFAULT_LANGUAGE,
+        max_guesses: int = config.MAX_GUESSES,
+        difficulty: float = config.ANSWER_DIFFICULTY,
+        session_log: "SessionLog" = None
+    ):
         """
         Initializes a new Wordle game where each user has their own answer.
+
+        Args:
+          hard_mode (bool): Whether users must reuse every revealed hint in their guesses.
+          word_length (int): Default word length of the users' games.
+          language (str): Default language of the users' games.
+          max_guesses (int): Guesses allowed before a game is lost.
+          difficulty (float): 0 picks answers uniformly; above 0 answers are weighted by their
+            minimax worst-case depth to this power (needs `python -m wordle_assistant.minimax`).
+          session_log (SessionLog): Optional log every user's moves are appended to, see wordle_assistant.sessions.
         """
-        self.users: Dict[str, WordleUser] = {}
+        self.hard_mode = hard_mode
+        self.word_length = word_length
+        self.language = language
+        self.max_guesses = max_guesses
+        self.difficulty = difficulty
+        self.session_log = session_log
+        self.users: Dict[str, Union[WordleUser, MultiBoardUser]] = {}
         self.active = True
 
-    def choose_random_answer(self) -> str:
+    def choose_random_answer(self, corpus: WordCorpus = None) -> str:
         """
-        Selects a random common word from the default word list and returns it.
+        Selects a random common word from a corpus (the game's default variant if omitted) and returns it.
+
+        With a non-zero difficulty, answers are weighted by depth ** difficulty, using the
+        saved minimax analysis of the corpus; without one, answers stay uniform.
         """
-        word_list_df = create_words_df()
-        return word_list_df[word_list_df["rarity"] == "common"].sample(n=1)["word"].values[0]
+        corpus = corpus or get_corpus(self.word_length, self.language)
+        weights = self.answer_weights(corpus)
+        if weights is not None:
+            return str(np.random.choice(corpus.words[corpus.answer_ids], p=weights))
+        return corpus.random_common_word()
 
-    def add_user(self, username: str):
+    def answer_weights(self, corpus: WordCorpus) -> Optional[np.ndarray]:
         """
-        Adds a new user to the game with their own word list and assigns them a random answer.
+        Returns the probability of each answer of a corpus (in answer_ids order) under the game's
+        difficulty, or None if answers are uniform (no difficulty, or no saved minimax analysis).
+        """
+        if self.difficulty:
+            from wordle_assistant.minimax import answer_depths  # Only needed for weighted games
+            depths = answer_depths(corpus)
+            if depths is not None:
+                weights = depths.astype(np.float64) ** self.difficulty
+                return weights / weights.sum()
+        return None
+
+    def add_user(self, username: str, hard_mode: bool = None, word_length: int = None, language: str = None, answer: str = None):
+        """
+        Adds a new user to the game with their own word list and assigns them an answer, random unless given.
+
+        The word list of the user's variant is loaded the first time any user plays it.
+
+        Args:
+          username (str): The player's username.
+          hard_mode (bool): Overrides the game's hard mode setting for this user.
+          word_length (int): Overrides the game's word length for this user.
+          language (str): Overrides the game's language for this user.
+          answer (str): The user's answer; a random answer is chosen if omitted.
+        """
+        if username not in self.users:
+            corpus = get_corpus(word_length or self.word_length, language or self.language)
+            user = WordleUser(username, self.hard_mode if hard_mode is None else hard_mode, corpus)
+            user.answer = answer or self.choose_random_answer(corpus)
+            if self.session_log is not None:
+                user.session_log = self.session_log
+                self.session_log.record_join(user)
+            self.users[username] = user
+
+    def add_multi_board_user(
+        self,
+        username: str,
+        boards: int,
+        word_length: int = None,
+        language: str = None,
+        answers: List[str] = None
+    ):
+        """
+        Adds a new user playing several boards at once, each with its own (distinct) answer.
+
+        Multi-board games are not written to the session log.
+
+        Args:
+          username (str): The player's username.
+          boards (int): Number of boards, from 2 to config.MULTI_BOARD_MAX.
+          word_length (int): Overrides the game's word length for this user.
+          language (str): Overrides the game's language for this user.
+          answers (List[str]): One answer per board; random distinct answers are chosen if omitted.
+
+        Raises:
+          ValueError: If the number of boards is out of range or above the number of possible answers.
         """
         if username not in self.users:
-            self.users[username] = WordleUser(username)
-            self.users[username].answer = self.choose_random_answer()
+            if not 2 <= boards <= config.MULTI_BOARD_MAX:
+                raise ValueError(f"A multi-board game has 2 to {config.MULTI_BOARD_MAX} boards, got {boards}.")
+            corpus = get_corpus(word_length or self.word_length, language or self.language)
+            if boards > len(corpus.answer_ids):
+                raise ValueError(f"Only {len(corpus.answer_ids)} possible answers for {boards} boards.")
+            user = MultiBoardUser(username, boards, corpus)
+            if answers is None:
+                answer_ids = np.random.choice(corpus.answer_ids, boards, replace=False, p=self.answer_weights(corpus))
+                answers = corpus.words[answer_ids].tolist()
+            if len(answers) != boards:
+                raise ValueError(f"Expected {boards} answers, got {len(answers)}.")
+            user.answers = list(answers)
+            self.users[username] = user
+
+    def remove_user(self, username: str):
+        """
+        Removes a user and their game, also from the session log.
+        """
+        if self.users.pop(username, None) is not None and self.session_log is not None:
+            self.session_log.record_leave(username)
 
-    def process_guess_feedback(self, username: str, guess: str) -> Tuple[int, int, int, int, int]:
+    def process_guess_feedback(self, username: str, guess: str) -> Tuple[int, ...]:
         """
         Processes a user's guess and returns letter states feedback.
         """
         if username not in self.users:
             raise ValueError("User not found in the game.")
         user = self.users[username]
+        if isinstance(user, MultiBoardUser):
+            return self.process_multi_board_guess(username, guess)
         if not user.answer:
             raise ValueError("No answer has been set for this user.")
 
         guess = guess.lower()
-        letter_state = []
-        for i, letter in enumerate(guess):
-            if letter == user.answer[i]:
-                letter_state.append(1)  # Green (correct position)
-            elif letter in user.answer:
-                letter_state.append(2)  # Yellow (wrong position)
-            else:
-                letter_state.append(0)  # Gray (not in word)
-        letter_state_tuple = tuple(letter_state)
+        if len(guess) != user.corpus.length:
+            raise ValueError(f"Guesses must have {user.corpus.length} letters.")
+        if user.hard_mode and not user.is_allowed(guess):
+            raise ValueError(f"Hard mode: '{guess}' does not use every revealed hint.")
+        letter_state_tuple = feedback_pattern(guess, user.answer)
         
         user.add_guess(guess, letter_state_tuple)
         
         if guess == user.answer:
             user.mark_completed(word_found=True)
-        elif len(user.guesses) >= 6:
+        elif len(user.guesses) >= self.max_guesses:
             user.mark_completed(word_found=False)
 
         return letter_state_tuple #should append this to a letter_state list for the user
+
+    def process_multi_board_guess(self, username: str, guess: str) -> List[Optional[Tuple[int, ...]]]:
+        """
+        Processes a multi-board user's guess and returns the letter states of every board (None for boards already solved).
+        """
+        user = self.users[username]
+        guess = guess.lower()
+        if len(guess) != user.corpus.length:
+            raise ValueError(f"Guesses must have {user.corpus.length} letters.")
+        # Every board's feedback from one vectorized call
+        patterns = feedback_patterns(user.corpus.encode([guess])[0], user.corpus.encode(user.answers))
+        letter_states = [
+            None if solved is not None else pattern_to_state(pattern, user.corpus.length)
+            for pattern, solved in zip(patterns, user.solved_at)
+        ]
+        self.add_board_feedback(username, guess, letter_states)
+        return letter_states
+
+    def add_board_feedback(self, username: str, guess: str, letter_states: List[Optional[Tuple[int, ...]]]):
+        """
+        Adds a multi-board guess with its feedback (scored or entered by hand) and updates completion.
+        """
+        user = self.users[username]
+        user.add_guess(guess, letter_states)
+        if not user.unsolved.any():
+            user.mark_completed(word_found=True)
+        elif len(user.guesses) >= user.max_guesses:
+            user.mark_completed(word_found=False)
     
     def check_game_status(self) -> bool:
         """
@@ -0,0 +1,141 @@
+import numpy as np
+from functools import lru_cache
+from typing import *
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+@lru_cache(maxsize=None)
+def code_table(alphabet: str = ALPHABET) -> np.ndarray:
+    """
+    Returns a lookup table from Unicode code points to letter codes (255 for letters outside the alphabet).
+    """
+    if len(alphabet) > 255 or len(set(alphabet)) != len(alphabet):
+        raise ValueError("An alphabet needs at most 255 distinct letters.")
+    points = np.array([ord(letter) for letter in alphabet])
+    table = np.full(points.max() + 1, 255, dtype=np.uint8)
+    table[points] = np.arange(len(alphabet), dtype=np.uint8)
+    return table
+
+
+def encode_words(words: Iterable[str], alphabet: str = ALPHABET) -> np.ndarray:
+    """
+    Encodes equal-length lowercase words as a 2D array of letter codes (position in the alphabet, a=0 ... z=25).
+
+    Args:
+      words (Iterable[str]): The words to encode.
+      alphabet (str): The letters words may use, in code order. Defaults to English a-z.
+
+    Returns:
+      np.ndarray: A uint8 array of shape (number of words, word length).
+
+    Raises:
+      ValueError: If the words differ in length or use letters outside the alphabet.
+    """
+    words = np.asarray(words if isinstance(words, np.ndarray) else list(words), dtype=str)
+    if not words.size:
+        return np.zeros((0, 0), dtype=np.uint8)
+    # Fixed-width unicode arrays store one code point per uint32; shorter words are zero padded
+    points = np.ascontiguousarray(words).view(np.uint32).reshape(len(words), -1)
+    table = code_table(alphabet)
+    codes = table[np.minimum(points, len(table) - 1)]
+    if (codes == 255).any() or (points >= len(table)).any():
+        raise ValueError("Words must have the same length and only use letters of the alphabet.")
+    return codes
+
+
+class LetterIndex:
+    """
+    Boolean bitsets over word ids for every (position, letter) pair and every letter.
+
+    Built once per word list so that hard-mode constraints reduce to AND operations and
+    letter-frequency ranking to matrix products instead of per-guess string scans.
+    Candidate filtering goes through feedback patterns instead (see core.wordle_filter_mask()).
+    """
+
+    def __init__(self, words: Iterable[str], alphabet: str = ALPHABET):
+        codes = encode_words(words, alphabet)
+        self.alphabet = alphabet
+        self.size, self.length = codes.shape
+        letters = np.arange(len(alphabet), dtype=np.uint8)[:, None]
+
+        # at[i, l] -> words with letter l at position i
+        self.at = np.stack([codes[:, i] == letters for i in range(self.length)])
+        # contains[l] -> words with letter l anywhere
+        self.contains = self.at.any(axis=0)
+        # counts[l] -> number of copies of letter l in each word
+        self.counts = self.at.sum(axis=0, dtype=np.uint8)
+
+    def updated(self, sources: np.ndarray, words: np.ndarray) -> "LetterIndex":
+        """
+        Returns the index of a new version of the word list, only encoding the added words.
+
+        Kept words copy their bitset columns over; only words new to the list are encoded,
+        so a dictionary diff of a few words costs a few slice copies instead of a full rebuild.
+
+        Args:
+          sources (np.ndarray): For each word of the new list, its id in this index or -1 if it is new.
+          words (np.ndarray): The new word list.
+
+        Returns:
+          LetterIndex: The index of the new list.
+        """
+        sources = np.asarray(sources)
+        index = object.__new__(LetterIndex)
+        index.alphabet = self.alphabet
+        index.size, index.length = len(sources), self.length
+        index.at = np.empty(self.at.shape[:2] + (index.size,), dtype=bool)
+        index.counts = np.empty((len(self.alphabet), index.size), dtype=np.uint8)
+        # Kept words form a few runs of consecutive ids, copied slice by slice. A run also
+        # breaks where a word is added, since -1 followed by old id 0 is a step of 1 too
+        new = sources < 0
+        starts = np.r_[0, np.flatnonzero((np.diff(sources) != 1) | (new[1:] != new[:-1])) + 1]
+        for start, end in zip(starts, np.r_[starts[1:], index.size]):
+            source = sources[start]
+            if source >= 0:
+                index.at[:, :, start:end] = self.at[:, :, source:source + end - start]
+                index.counts[:, start:end] = self.counts[:, source:source + end - start]
+        added = np.flatnonzero(new)
+        if len(added):
+            codes = encode_words(np.asarray(words)[added], self.alphabet)
+            letters = np.arange(len(self.alphabet), dtype=np.uint8)[:, None]
+            index.at[:, :, added] = np.stack([codes[:, i] == letters for i in range(self.length)])
+            index.counts[:, added] = index.at[:, :, added].sum(axis=0, dtype=np.uint8)
+        index.contains = index.counts > 0
+        return index
+
+    def letter_code(self, letter: str) -> int:
+        """
+        Returns the alphabet code of a letter, raising ValueError for unsupported letters.
+        """
+        code = self.alphabet.find(letter)
+        if code < 0:
+            raise ValueError(f"Unsupported letter '{letter}'.")
+        return code
+
+    def hard_mode_mask(self, guess: str, letter_state: Tuple[int, ...]) -> np.ndarray:
+        """
+        Returns the words that are still legal guesses in hard mode after one guess.
+
+        Hard mode only requires reusing revealed hints: green letters stay in place and
+        every green or yellow letter appears at least as many times as it was revealed.
+        Gray letters may be played again.
+
+        Args:
+          guess (str): The guessed word.
+          letter_state (Tuple[int, ...]): 0 = Gray, 1 = Green, 2 = Yellow for each letter.
+
+        Returns:
+          np.ndarray: Boolean mask over word ids, True where the word may be guessed.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        revealed: Dict[int, int] = {}
+        for i, (letter, state) in enumerate(zip(guess, letter_state)):
+            code = self.letter_code(letter)
+            if state == 1:
+                mask &= self.at[i, code]
+            if state in (1, 2):
+                revealed[code] = revealed.get(code, 0) + 1
+        for code, count in revealed.items():
+            mask &= self.counts[code] >= count
+        return mask
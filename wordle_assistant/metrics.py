@@ -0,0 +1,284 @@
+"""
+Opt-in instrumentation of the hot paths: call counts, timing histograms and candidate-set sizes.
+
+Switched on with WORDLE_METRICS=1 (or the CLI's --metrics flag). While off, an instrumented
+function costs one global lookup per call. At exit the snapshot is written as JSON, or as
+Prometheus text when the output file ends in .prom/.txt; a cProfile profile and a
+tracemalloc snapshot can be saved next to it.
+"""
+import atexit
+import bisect
+import json
+import os
+import sys
+import time
+import tracemalloc
+from functools import wraps
+from typing import *
+from wordle_assistant import core_config as config
+
+# Histogram upper bounds: seconds per call and candidate-set sizes (+Inf is implicit)
+TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (1, 2, 10, 100, 1000, 10000, 100000)
+
+# Extracts the candidate-set size of one call from (args, kwargs, result), or None to skip it
+SizeOf = Callable[[tuple, dict, Any], Optional[int]]
+
+
+class Histogram:
+    """
+    Cumulative-friendly bucket counts plus count, sum and max, as in a Prometheus histogram.
+    """
+
+    __slots__ = ("bounds", "buckets", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        Returns (upper bound, observations at or below it) pairs, ending with '+Inf'.
+        """
+        running, pairs = 0, []
+        for bound, count in zip([*map(str, self.bounds), "+Inf"], self.buckets):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class Registry:
+    """
+    Metrics of every instrumented function in this process.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, Histogram] = {}
+        self.sizes: Dict[str, Histogram] = {}
+        self.started = time.perf_counter()
+
+    def record(self, name: str, seconds: float, size: Optional[int] = None):
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Histogram(TIME_BUCKETS)
+        timing.observe(seconds)
+        if size is not None:
+            sizes = self.sizes.get(name)
+            if sizes is None:
+                sizes = self.sizes[name] = Histogram(SIZE_BUCKETS)
+            sizes.observe(size)
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Summarizes the metrics as a JSON-serializable report.
+        """
+        report: Dict[str, Any] = {"uptime_s": round(time.perf_counter() - self.started, 3), "functions": {}}
+        for name, timing in sorted(self.timings.items()):
+            entry = {
+                "calls": timing.count,
+                "total_ms": round(timing.total * 1000, 3),
+                "mean_ms": round(timing.total * 1000 / timing.count, 3),
+                "max_ms": round(timing.max * 1000, 3),
+                "histogram_ms": {bound if bound == "+Inf" else str(float(bound) * 1000): count for bound, count in timing.cumulative()},
+            }
+            sizes = self.sizes.get(name)
+            if sizes is not None:
+                entry["candidates"] = {"mean": round(sizes.total / sizes.count, 1), "max": int(sizes.max), "histogram": dict(sizes.cumulative())}
+            report["functions"][name] = entry
+        return report
+
+    def to_prometheus(self, memory: Dict[str, Any] = None) -> str:
+        """
+        Formats the metrics in the Prometheus text exposition format.
+
+        Args:
+          memory (Dict[str, Any]): Optional tracemalloc summary (the "memory" entry of the JSON report), added as gauges.
+        """
+        lines = []
+        for metric, histograms, help_text in (
+            ("wordle_call_seconds", self.timings, "Time spent per call."),
+            ("wordle_candidates", self.sizes, "Candidate words per call."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, histogram in sorted(histograms.items()):
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{metric}_bucket{{function="{name}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_sum{{function="{name}"}} {histogram.total:.6f}')
+                lines.append(f'{metric}_count{{function="{name}"}} {histogram.count}')
+        if memory is not None:
+            lines.append("# HELP wordle_memory_bytes Memory traced by tracemalloc.")
+            lines.append("# TYPE wordle_memory_bytes gauge")
+            lines.append(f'wordle_memory_bytes{{kind="current"}} {round(memory["current_kb"] * 1024)}')
+            lines.append(f'wordle_memory_bytes{{kind="peak"}} {round(memory["peak_kb"] * 1024)}')
+            lines.append("# HELP wordle_memory_top_bytes Largest traced allocations by source line.")
+            lines.append("# TYPE wordle_memory_top_bytes gauge")
+            for stat in memory["top"]:
+                location = stat["location"].replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'wordle_memory_top_bytes{{location="{location}"}} {round(stat["size_kb"] * 1024)}')
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[Registry] = None
+# Report options of the active registry, updated by every enable() call
+_settings: Dict[str, Any] = {"output": None, "profiler": None, "trace_memory": False}
+
+
+def instrument(name: str, size: SizeOf = None) -> Callable:
+    """
+    Decorator recording the call count, duration and optionally the candidate-set size of a function.
+
+    Args:
+      name (str): Metric label of the function.
+      size (SizeOf): Optional function of (args, kwargs, result) returning the candidate count.
+
+    Returns:
+      Callable: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _registry is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            _registry.record(name, elapsed, size(args, kwargs, result) if size else None)
+            return result
+        return wrapper
+    return decorator
+
+
+def remaining_rows(word_list_df) -> int:
+    """
+    Counts the words of a DataFrame that are not eliminated (every row if there is no 'eliminated' column).
+    """
+    if "eliminated" not in word_list_df.columns:
+        return len(word_list_df)
+    return int((word_list_df["eliminated"] == False).sum())
+
+
+def input_rows(args: tuple, kwargs: dict, result: Any) -> Optional[int]:
+    """
+    SizeOf for functions taking a word list DataFrame first.
+    """
+    word_list_df = args[0] if args else kwargs.get("word_list_df")
+    return None if word_list_df is None else remaining_rows(word_list_df)
+
+
+def result_rows(args: tuple, kwargs: dict, result: Any) -> int:
+    """
+    SizeOf for functions returning a word list DataFrame.
+    """
+    return remaining_rows(result)
+
+
+def result_count(args: tuple, kwargs: dict, result: Any) -> int:
+    """
+    SizeOf for functions returning a boolean candidate mask.
+    """
+    return int(result.sum())
+
+
+def candidates_arg(args: tuple, kwargs: dict, result: Any) -> Optional[int]:
+    """
+    SizeOf for functions taking (corpus, candidates, ...) with a boolean candidate mask.
+    """
+    candidates = args[1] if len(args) > 1 else kwargs.get("candidates")
+    return None if candidates is None else int(candidates.sum())
+
+
+def enabled() -> bool:
+    """
+    Returns True while instrumentation is on.
+    """
+    return _registry is not None
+
+
+def registry() -> Optional[Registry]:
+    """
+    Returns the active registry, or None while instrumentation is off.
+    """
+    return _registry
+
+
+def enable(output: str = None, profile: bool = False, trace_memory: bool = False) -> Registry:
+    """
+    Switches instrumentation on for the rest of the process and writes the report at exit.
+
+    Calling it again (e.g. with the CLI's flags after WORDLE_METRICS=1 enabled it at import)
+    keeps the metrics recorded so far, switches to the given output, and adds profiling or
+    memory tracing if asked for.
+
+    Args:
+      output (str): Report path; '.prom' or '.txt' selects Prometheus text, anything else JSON.
+        Defaults to config.METRICS_OUTPUT.
+      profile (bool): Also run cProfile, saved next to the report as '<name>.prof'.
+      trace_memory (bool): Also run tracemalloc; the top allocations go in the JSON report and
+        the snapshot is saved as '<name>.tracemalloc'.
+
+    Returns:
+      Registry: The active registry.
+    """
+    global _registry
+    if _registry is None:
+        _registry = Registry()
+        atexit.register(dump)
+    if output:
+        _settings["output"] = output
+    if profile and _settings["profiler"] is None:
+        import cProfile  # Only imported when asked for
+        _settings["profiler"] = cProfile.Profile()
+        _settings["profiler"].enable()
+    if trace_memory:
+        _settings["trace_memory"] = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    return _registry
+
+
+def dump(output: str = None):
+    """
+    Writes the report, and the profile and memory snapshot if they were recorded.
+
+    Args:
+      output (str): Report path; defaults to the one given to enable(), then config.METRICS_OUTPUT.
+    """
+    if _registry is None:
+        return
+    output = output or _settings["output"] or config.METRICS_OUTPUT
+    profiler = _settings["profiler"]
+    base, extension = os.path.splitext(output)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(f"{base}.prof")
+    report = _registry.to_json()
+    if _settings["trace_memory"] and tracemalloc.is_tracing():
+        snapshot = tracemalloc.take_snapshot()
+        snapshot.dump(f"{base}.tracemalloc")
+        current, peak = tracemalloc.get_traced_memory()
+        report["memory"] = {
+            "current_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top": [{"location": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:20]],
+        }
+    with open(output, "w") as f:
+        if extension in (".prom", ".txt"):
+            f.write(_registry.to_prometheus(report.get("memory")))
+        else:
+            json.dump(report, f, indent=2)
+    print(f"Metrics written to {output}", file=sys.stderr)
+
+
+if config.METRICS_ENABLED:
+    enable(profile=config.METRICS_PROFILE, trace_memory=config.METRICS_TRACE_MEMORY)
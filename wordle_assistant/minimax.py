@@ -0,0 +1,284 @@
+"""
+Worst-case analysis of the answers by minimax over feedback-pattern buckets.
+
+Each state (the set of answers still possible) is split by the guess whose largest
+feedback bucket is smallest, and every bucket is solved recursively. The resulting
+decision tree gives the number of guesses each answer needs in the worst case and a
+minimax guess for every state. WordleGame uses the per-answer depths for
+difficulty-weighted answer selection.
+
+Usage:
+    python -m wordle_assistant.minimax --workers 4 [--breadth 3]
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.entropy import bucket_counts
+from wordle_assistant.feedback import pattern_count, pattern_id
+from wordle_assistant.opening_book import HistoryKey, encode_key
+from wordle_assistant.pattern_matrix import word_list_hash
+from wordle_assistant.ranking import top_k_order
+
+# A solved state: the guess played there and, for each answer of the state, the guesses needed
+Solution = Tuple[int, np.ndarray]
+
+
+class MinimaxSolver:
+    """
+    Memoized minimax search over the common answers of a corpus.
+
+    States are sorted arrays of answer columns (positions in corpus.answer_ids) and are
+    memoized by their contents, so identical candidate sets reached through different
+    histories are solved once.
+    """
+
+    def __init__(self, corpus, breadth: int = 1):
+        """
+        Args:
+          corpus (WordCorpus): The word corpus; every word may be guessed.
+          breadth (int): Guesses searched per state, best largest-bucket first. 1 plays the
+            greedy minimax guess; larger values search more guesses for a shallower worst case.
+        """
+        self.corpus = corpus
+        self.breadth = breadth
+        self.solved_pattern = pattern_id((1,) * corpus.length)  # All green
+        self.memo: Dict[bytes, Solution] = {}
+        self.hits = 0
+
+    def ranked_guesses(self, columns: np.ndarray) -> np.ndarray:
+        """
+        Returns up to `breadth` guess ids for a state, smallest largest bucket first.
+
+        Candidates win ties since they may be the answer. Guesses that cannot split the
+        state are left out, so the search always makes progress.
+        """
+        largest = bucket_counts(np.asarray(self.corpus.patterns[:, columns]), pattern_count(self.corpus.length)).max(axis=1)
+        is_candidate = np.zeros(self.corpus.size, dtype=bool)
+        is_candidate[self.corpus.answer_ids[columns]] = True
+        useful = np.flatnonzero((largest < len(columns)) | is_candidate)
+        order = top_k_order(-largest[useful].astype(np.float64), self.breadth, (~is_candidate[useful],))
+        return useful[order]
+
+    def split(self, guess: int, columns: np.ndarray) -> np.ndarray:
+        """
+        Solves every bucket a guess splits a state into.
+
+        Returns:
+          np.ndarray: Guesses needed for each answer of the state, this guess included.
+        """
+        patterns = np.asarray(self.corpus.patterns[guess, columns])
+        depths = np.empty(len(columns), dtype=np.int16)
+        for pattern in np.unique(patterns):
+            members = patterns == pattern
+            depths[members] = 1 if pattern == self.solved_pattern else 1 + self.solve(columns[members])[1]
+        return depths
+
+    def solve(self, columns: np.ndarray) -> Solution:
+        """
+        Returns the minimax guess of a state and the guesses each of its answers needs.
+
+        Among the searched guesses the one with the smallest worst case wins, then the
+        smallest total number of guesses.
+        """
+        key = columns.tobytes()
+        solution = self.memo.get(key)
+        if solution is not None:
+            self.hits += 1
+            return solution
+        if len(columns) == 1:
+            solution = (int(self.corpus.answer_ids[columns[0]]), np.ones(1, dtype=np.int16))
+        else:
+            for guess in self.ranked_guesses(columns):
+                depths = self.split(int(guess), columns)
+                if solution is None or (depths.max(), depths.sum()) < (solution[1].max(), solution[1].sum()):
+                    solution = (int(guess), depths)
+                if solution[1].max() <= 2:
+                    break  # Nothing beats solving every answer by the next guess
+        self.memo[key] = solution
+        return solution
+
+    def policy(self, columns: np.ndarray, history: HistoryKey = ()) -> Dict[str, str]:
+        """
+        Walks the solved tree below a state and returns its minimax guess for every history.
+
+        Returns:
+          Dict[str, str]: Guess keyed by encode_key(history).
+        """
+        policy = {}
+        stack = [(columns, history)]
+        while stack:
+            columns, history = stack.pop()
+            guess = (self.memo.get(columns.tobytes()) or self.solve(columns))[0]
+            word = str(self.corpus.words[guess])
+            policy[encode_key(history)] = word
+            if len(columns) == 1:
+                continue
+            patterns = np.asarray(self.corpus.patterns[guess, columns])
+            for pattern in np.unique(patterns):
+                if pattern != self.solved_pattern:
+                    stack.append((columns[patterns == pattern], history + ((word, int(pattern)),)))
+        return policy
+
+
+@lru_cache(maxsize=config.CORPUS_CACHE_SIZE)
+def get_solver(word_length: int, language: str, version: str, breadth: int) -> MinimaxSolver:
+    """
+    Returns the process-wide solver of a corpus version, so memoized states are reused across tasks.
+    """
+    return MinimaxSolver(get_corpus(word_length, language, version), breadth)
+
+
+def solve_subtree(
+    word_length: int, language: str, version: str, breadth: int, columns: np.ndarray, history: HistoryKey
+) -> Tuple[np.ndarray, Dict[str, str], int]:
+    """
+    Executor entry point: solves one bucket below the first guess.
+
+    The parent's corpus version is passed along, so the bucket's columns index the same
+    answers even if the word lists are updated while the analysis runs.
+
+    Returns:
+      Tuple[np.ndarray, Dict[str, str], int]: Depths of the bucket's answers, its policy and the memo hits it took.
+    """
+    solver = get_solver(word_length, language, version, breadth)
+    hits = solver.hits
+    _, depths = solver.solve(columns)
+    return depths, solver.policy(columns, history), solver.hits - hits
+
+
+def analyze(corpus, breadth: int = 1, executor: Executor = None) -> Dict[str, Any]:
+    """
+    Solves every common answer of a corpus and summarizes the worst cases.
+
+    The first guesses are ranked here; the buckets below each of them are independent
+    subtrees, solved in parallel when an executor is given. Worker processes load the same
+    corpus version themselves through get_corpus(), so an executor only works with a shared corpus.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      breadth (int): Guesses searched per state, see MinimaxSolver.
+      executor (Executor): Optional process pool for the subtrees.
+
+    Returns:
+      Dict[str, Any]: The analysis report, see save_analysis().
+    """
+    start = time.perf_counter()
+    solver = MinimaxSolver(corpus, breadth)
+    root = np.arange(len(corpus.answer_ids))
+    best: Optional[Tuple[int, np.ndarray, Dict[str, str]]] = None
+    hits = 0
+
+    for guess in solver.ranked_guesses(root):
+        guess = int(guess)
+        word = str(corpus.words[guess])
+        patterns = np.asarray(corpus.patterns[guess, root])
+        depths = np.ones(len(root), dtype=np.int16)
+        policy = {encode_key(()): word}
+        buckets = [(pattern, root[patterns == pattern]) for pattern in np.unique(patterns) if pattern != solver.solved_pattern]
+        if executor is None:
+            results = [(solver.solve(columns)[1], solver.policy(columns, ((word, int(pattern)),)), 0) for pattern, columns in buckets]
+        else:
+            futures = [
+                executor.submit(solve_subtree, corpus.length, corpus.language, corpus.version, breadth, columns, ((word, int(pattern)),))
+                for pattern, columns in buckets
+            ]
+            results = [future.result() for future in futures]
+        for (pattern, columns), (bucket_depths, bucket_policy, bucket_hits) in zip(buckets, results):
+            depths[np.searchsorted(root, columns)] = 1 + bucket_depths
+            policy.update(bucket_policy)
+            hits += bucket_hits
+        if best is None or (depths.max(), depths.sum()) < (best[1].max(), best[1].sum()):
+            best = (guess, depths, policy)
+
+    guess, depths, policy = best
+    answers = corpus.words[corpus.answer_ids].tolist()
+    return {
+        "version": config.MINIMAX_VERSION,
+        "word_lists": word_list_hash(corpus.words, answers),
+        "breadth": breadth,
+        "first_guess": str(corpus.words[guess]),
+        "worst_case": int(depths.max()),
+        "mean_depth": round(float(depths.mean()), 4),
+        "distribution": {str(depth): count for depth, count in sorted(Counter(depths.tolist()).items())},
+        "states": len(policy),
+        "memo_hits": hits + solver.hits,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+        "depths": dict(zip(answers, depths.tolist())),
+        "policy": policy,
+    }
+
+
+def answer_difficulty_path(corpus) -> str:
+    """
+    Returns the cache path of the analysis of a corpus, named by a hash of its word lists.
+    """
+    digest = word_list_hash(corpus.words, corpus.words[corpus.answer_ids])
+    return os.path.join(config.CACHE_DIR, f"answer-difficulty-v{config.MINIMAX_VERSION}-{digest}.json")
+
+
+def save_analysis(corpus, report: Dict[str, Any], path: str = None) -> str:
+    """
+    Writes an analysis report atomically and returns its path.
+    """
+    path = path or answer_difficulty_path(corpus)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f)
+    os.replace(tmp_path, path)
+    _depth_cache.pop(path, None)
+    return path
+
+
+_depth_cache: Dict[str, np.ndarray] = {}
+
+
+def answer_depths(corpus) -> Optional[np.ndarray]:
+    """
+    Returns the worst-case guess count of every common answer, aligned with corpus.answer_ids.
+
+    Returns:
+      Optional[np.ndarray]: The depths, or None if the corpus has not been analyzed.
+    """
+    path = answer_difficulty_path(corpus)
+    if path not in _depth_cache:
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            depths = json.load(f)["depths"]
+        _depth_cache[path] = np.array([depths[word] for word in corpus.words[corpus.answer_ids].tolist()], dtype=np.int16)
+    return _depth_cache[path]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the worst-case guess count of every answer by minimax over feedback buckets.")
+    parser.add_argument("--breadth", type=int, default=1, help="Guesses searched per state (1 = greedy minimax).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the subtrees (defaults to the CPU count, 0 runs inline).")
+    parser.add_argument("--length", type=int, default=config.DEFAULT_WORD_LENGTH, help="Word length of the variant.")
+    parser.add_argument("--language", type=str, default=config.DEFAULT_LANGUAGE, help="Language of the variant.")
+    args = parser.parse_args()
+
+    corpus = get_corpus(args.length, args.language)
+    corpus.patterns  # Build the pattern matrix once before workers map it
+    if args.workers == 0:
+        report = analyze(corpus, args.breadth)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers or os.cpu_count() or 1) as executor:
+            report = analyze(corpus, args.breadth, executor)
+    path = save_analysis(corpus, report)
+    print(
+        f"First guess {report['first_guess']}: worst case {report['worst_case']} guesses, mean {report['mean_depth']}, "
+        f"distribution {report['distribution']} ({report['states']} states, {report['elapsed_s']}s) written to {path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.core import wordle_filter_mask
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.feedback import feedback_patterns, pattern_id, pattern_to_state
+from wordle_assistant.metrics import instrument
+from wordle_assistant.pattern_matrix import word_list_hash
+from wordle_assistant.ranking import rank_candidates
+
+# A feedback history: ((guess, pattern id), ...) in the order the guesses were made
+HistoryKey = Tuple[Tuple[str, int], ...]
+Shortlist = List[Tuple[str, float]]
+
+
+def history_key(guesses: List[str], letter_states: List[Tuple[int, ...]]) -> HistoryKey:
+    """
+    Builds the opening book key of a game from its guesses and letter states.
+    """
+    return tuple((guess, pattern_id(letter_state)) for guess, letter_state in zip(guesses, letter_states))
+
+
+def encode_key(key: HistoryKey) -> str:
+    """
+    Serializes a history key as 'guess:pattern|guess:pattern' for JSON storage.
+    """
+    return "|".join(f"{guess}:{pattern}" for guess, pattern in key)
+
+
+def decode_key(text: str) -> HistoryKey:
+    """
+    Parses a key produced by encode_key().
+    """
+    if not text:
+        return ()
+    return tuple((guess, int(pattern)) for guess, pattern in (item.split(":") for item in text.split("|")))
+
+
+class OpeningBook:
+    """
+    Memoized recommendations keyed by feedback history.
+
+    Every game starts from the same corpus, so the ranking after a given sequence of
+    (guess, feedback) pairs is the same for every user. Shallow states are precomputed
+    and stored on disk; deeper states are computed on demand and kept in an LRU cache.
+    """
+
+    def __init__(self, corpus, strategy: str = config.DEFAULT_RANK_STRATEGY, entries: Dict[HistoryKey, Shortlist] = None):
+        self.corpus = corpus
+        self.strategy = strategy
+        self.entries: Dict[HistoryKey, Shortlist] = dict(entries or {})
+        self.hits = 0
+        self.misses = 0
+        self._lru: "OrderedDict[HistoryKey, Shortlist]" = OrderedDict()  # Deeper states computed on demand
+
+    def _compute(self, key: HistoryKey, candidates: np.ndarray = None) -> Shortlist:
+        """
+        Ranks the remaining words after a history and returns the top of the ranking.
+        """
+        if candidates is None:
+            guesses = [guess for guess, _ in key]
+            letter_states = [pattern_to_state(pattern, len(guess)) for guess, pattern in key]
+            candidates = wordle_filter_mask(self.corpus.codes, guesses, letter_states, alphabet=self.corpus.alphabet)
+        ids, scores = rank_candidates(self.corpus, candidates, self.strategy, config.OPENING_BOOK_SHORTLIST)
+        return [(str(word), round(float(score), 6)) for word, score in zip(self.corpus.words[ids], scores)]
+
+    @instrument("opening_book.shortlist")
+    def shortlist(self, key: HistoryKey, candidates: np.ndarray = None) -> Shortlist:
+        """
+        Returns the ranked shortlist after a feedback history, best guess first.
+
+        Args:
+          key (HistoryKey): The feedback history, see history_key().
+          candidates (np.ndarray): Optional candidate mask of that history, to skip replaying it on a miss.
+
+        Returns:
+          Shortlist: (word, rank) pairs, best first.
+        """
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+        if key in self._lru:
+            self.hits += 1
+            self._lru.move_to_end(key)
+            return self._lru[key]
+
+        self.misses += 1
+        shortlist = self._compute(key, candidates)
+        self._lru[key] = shortlist
+        if len(self._lru) > config.OPENING_BOOK_CACHE_SIZE:
+            self._lru.popitem(last=False)  # Evict the least recently used state
+        return shortlist
+
+    def recommend(self, key: HistoryKey, candidates: np.ndarray = None) -> Optional[str]:
+        """
+        Returns the recommended next guess after a feedback history, or None if no word remains.
+        """
+        shortlist = self.shortlist(key, candidates)
+        return shortlist[0][0] if shortlist else None
+
+    def precompute(self, depth: int = None):
+        """
+        Fills the book down to the given depth by following the recommended guess.
+
+        Depth 1 stores the opening guess; depth 2 also stores the best second guess for
+        every feedback pattern the opening guess can produce, and so on.
+
+        Args:
+          depth (int): Number of turns to precompute. Defaults to config.OPENING_BOOK_DEPTH.
+        """
+        depth = config.OPENING_BOOK_DEPTH if depth is None else depth
+        frontier: List[Tuple[HistoryKey, np.ndarray]] = [((), self.corpus.full_mask())]
+        for turn in range(depth):
+            next_frontier = []
+            for key, candidates in frontier:
+                shortlist = self.entries.get(key) or self._compute(key, candidates)
+                self.entries[key] = shortlist
+                if turn + 1 == depth or not shortlist or candidates.sum() <= 1:
+                    continue
+                # Branch on every pattern the recommended guess can produce among the candidates
+                guess = shortlist[0][0]
+                solved = pattern_id((1,) * len(guess))
+                candidate_ids = np.flatnonzero(candidates)
+                patterns = feedback_patterns(self.corpus.encode([guess])[0], self.corpus.codes[candidate_ids])
+                for pattern in np.unique(patterns):
+                    if pattern == solved:
+                        continue  # Solved, nothing left to recommend
+                    branch = np.zeros_like(candidates)
+                    branch[candidate_ids[patterns == pattern]] = True
+                    next_frontier.append((key + ((guess, int(pattern)),), branch))
+            frontier = next_frontier
+
+    def save(self, path: str = None):
+        """
+        Writes the precomputed entries to disk atomically.
+        """
+        path = path or opening_book_path(self.corpus, self.strategy)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({encode_key(key): shortlist for key, shortlist in self.entries.items()}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, corpus, strategy: str = config.DEFAULT_RANK_STRATEGY, path: str = None) -> "OpeningBook":
+        """
+        Loads the precomputed book for a corpus and strategy; starts empty if none was built.
+        """
+        path = path or opening_book_path(corpus, strategy)
+        entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                entries = {decode_key(text): [tuple(item) for item in shortlist] for text, shortlist in json.load(f).items()}
+        return cls(corpus, strategy, entries)
+
+
+def opening_book_path(corpus, strategy: str) -> str:
+    """
+    Returns the cache file path of the opening book for a corpus and ranking strategy.
+
+    The name includes everything that changes the rankings: the word lists, the strategy,
+    the entropy sample size and the shortlist length.
+    """
+    digest = word_list_hash(corpus.words, corpus.words[corpus.answer_ids])
+    filename = (
+        f"opening-book-v{config.OPENING_BOOK_VERSION}-{strategy}-{digest}"
+        f"-s{config.ENTROPY_SAMPLE_SIZE}-k{config.OPENING_BOOK_SHORTLIST}.json"
+    )
+    return os.path.join(config.CACHE_DIR, filename)
+
+
+def update_opening_book(previous, corpus, strategy: str, changed: Iterable[str]) -> Optional[Tuple[str, int, int]]:
+    """
+    Carries the saved opening book of a previous corpus version over to a new one.
+
+    A state's ranking only depends on its remaining words, so an entry is kept unless one
+    of the changed words (added, removed or with a new rarity) is consistent with its
+    feedback history. Entries whose history guesses a removed word are dropped; the others
+    touched by the change are recomputed, and the book is filled back to its depth
+    (following the possibly new recommendations) before it is saved for the new version.
+
+    Args:
+      previous (WordCorpus): The previous version of the corpus.
+      corpus (WordCorpus): The new version.
+      strategy (str): The ranking strategy of the book.
+      changed (Iterable[str]): The words the diff added, removed or changed the rarity of.
+
+    Returns:
+      Optional[Tuple[str, int, int]]: Path of the new book, entries kept and entries computed,
+        or None if the previous version has no saved book.
+    """
+    old_path = opening_book_path(previous, strategy)
+    if not os.path.exists(old_path):
+        return None
+    old = OpeningBook.load(previous, strategy, old_path)
+    changed = sorted(set(changed))
+    changed_codes = corpus.encode(changed)
+    removed = {word for word in changed if word not in corpus}
+    patterns: Dict[str, np.ndarray] = {}  # Feedback of each history guess on the changed words
+
+    def touched(key: HistoryKey) -> bool:
+        if not changed:
+            return False
+        consistent = np.ones(len(changed), dtype=bool)
+        for guess, pattern in key:
+            if guess not in patterns:
+                patterns[guess] = feedback_patterns(corpus.encode([guess])[0], changed_codes)
+            consistent &= patterns[guess] == pattern
+        return bool(consistent.any())
+
+    kept = {
+        key: shortlist for key, shortlist in old.entries.items()
+        if not removed.intersection(guess for guess, _ in key) and not touched(key)
+    }
+    book = OpeningBook(corpus, strategy, kept)
+    book.precompute(max(map(len, old.entries), default=0) + 1)
+    path = opening_book_path(corpus, strategy)
+    book.save(path)
+    return path, len(kept), len(book.entries) - len(kept)
+
+
+def get_opening_book(
+    strategy: str = config.DEFAULT_RANK_STRATEGY,
+    word_length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE,
+    version: str = None
+) -> OpeningBook:
+    """
+    Returns the process-wide opening book of a ranking strategy and variant, loading it on first use.
+
+    The book follows get_corpus(): a new corpus version gets its own book, and `version`
+    picks the book of an earlier version still in use. Books are kept in the corpus cache,
+    so they are freed together with their corpus version.
+    """
+    corpus = get_corpus(word_length, language, version)
+    books = corpus.cache.setdefault("opening_books", {})
+    if strategy not in books:
+        books[strategy] = OpeningBook.load(corpus, strategy)
+    return books[strategy]
+
+
+def ensure_opening_book(
+    strategy: str = config.DEFAULT_RANK_STRATEGY,
+    word_length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE,
+    depth: int = None
+) -> OpeningBook:
+    """
+    Returns the process-wide opening book, precomputing and saving it first if none was saved.
+
+    Without a saved book every state of the first turns is ranked on demand, separately in
+    each process that meets it; servers call this once at startup instead.
+    """
+    book = get_opening_book(strategy, word_length, language)
+    if not book.entries:
+        book.precompute(depth)
+        book.save()
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the opening book for a ranking strategy.")
+    parser.add_argument("--strategy", type=str, choices=config.RANK_STRATEGIES, default=config.DEFAULT_RANK_STRATEGY, help="Word ranking strategy.")
+    parser.add_argument("--depth", type=int, default=config.OPENING_BOOK_DEPTH, help="Number of turns to precompute.")
+    parser.add_argument("--length", type=int, default=config.DEFAULT_WORD_LENGTH, help="Word length of the variant.")
+    parser.add_argument("--language", type=str, default=config.DEFAULT_LANGUAGE, help="Language of the variant.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    book = OpeningBook(get_corpus(args.length, args.language), args.strategy)
+    book.precompute(args.depth)
+    book.save()
+    print(f"Opening book with {len(book.entries)} states written to {opening_book_path(book.corpus, args.strategy)} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
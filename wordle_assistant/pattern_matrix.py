@@ -0,0 +1,154 @@
+import argparse
+import hashlib
+import os
+import time
+import numpy as np
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.feedback import feedback_patterns, pattern_dtype
+
+
+def word_list_hash(guesses: Sequence[str], answers: Sequence[str]) -> str:
+    """
+    Returns a short content hash identifying a (guesses, answers) pair of word lists.
+
+    Args:
+      guesses (Sequence[str]): The allowed guesses, in matrix row order.
+      answers (Sequence[str]): The possible answers, in matrix column order.
+
+    Returns:
+      str: A 16 character hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update("\n".join(guesses).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update("\n".join(answers).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def pattern_matrix_path(guesses: Sequence[str], answers: Sequence[str]) -> str:
+    """
+    Returns the versioned cache file path of the pattern matrix for two word lists.
+    """
+    filename = f"patterns-v{config.PATTERN_MATRIX_VERSION}-{word_list_hash(guesses, answers)}.npy"
+    return os.path.join(config.CACHE_DIR, filename)
+
+
+def build_pattern_matrix(guess_codes: np.ndarray, answer_codes: np.ndarray, chunk_size: int = 512) -> np.ndarray:
+    """
+    Computes the feedback pattern id of every (guess, answer) pair.
+
+    Args:
+      guess_codes (np.ndarray): Encoded guesses of shape (G, L).
+      answer_codes (np.ndarray): Encoded answers of shape (N, L).
+      chunk_size (int): Number of guesses scored per vectorized batch. Defaults to 512.
+
+    Returns:
+      np.ndarray: Pattern ids of shape (G, N).
+    """
+    matrix = np.empty((len(guess_codes), len(answer_codes)), dtype=pattern_dtype(answer_codes.shape[1]))
+    for start in range(0, len(guess_codes), chunk_size):
+        matrix[start:start + chunk_size] = feedback_patterns(guess_codes[start:start + chunk_size], answer_codes)
+    return matrix
+
+
+def save_pattern_matrix(matrix: np.ndarray, path: str):
+    """
+    Writes a pattern matrix atomically so concurrent readers never see a partial file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, matrix)
+    os.replace(tmp_path, path)
+
+
+def load_pattern_matrix(corpus, build: bool = True) -> np.ndarray:
+    """
+    Memory-maps the guess x answer pattern matrix of a corpus, building it first if missing.
+
+    Rows follow the corpus word ids and columns follow corpus.answer_ids (the common words).
+    The file is opened read-only with numpy.memmap, so every process shares the same pages.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      build (bool): Whether to build and cache the matrix when no cached file exists. Defaults to True.
+
+    Returns:
+      np.ndarray: A read-only memory-mapped array of shape (corpus size, number of answers).
+    """
+    answers = corpus.words[corpus.answer_ids]
+    path = pattern_matrix_path(corpus.words, answers)
+    if not os.path.exists(path):
+        if not build:
+            raise FileNotFoundError(f"No cached pattern matrix at {path}.")
+        save_pattern_matrix(build_pattern_matrix(corpus.codes, corpus.codes[corpus.answer_ids]), path)
+    return np.load(path, mmap_mode="r")
+
+
+def update_pattern_matrix(previous, corpus, chunk_size: int = 512) -> Optional[str]:
+    """
+    Builds the pattern matrix of a new corpus version from the cached matrix of the previous one.
+
+    Rows of kept guesses and columns of kept answers are copied from the old matrix; only
+    the rows of added words and the columns of new answers (added words or words that
+    became common) are computed.
+
+    Args:
+      previous (WordCorpus): The previous version of the corpus.
+      corpus (WordCorpus): The new version.
+      chunk_size (int): Number of guesses scored per vectorized batch. Defaults to 512.
+
+    Returns:
+      Optional[str]: Path of the new matrix, or None if the previous version has no cached matrix.
+    """
+    path = pattern_matrix_path(corpus.words, corpus.words[corpus.answer_ids])
+    if os.path.exists(path):
+        return path
+    try:
+        old = load_pattern_matrix(previous, build=False)
+    except FileNotFoundError:
+        return None
+    rows = corpus.id_map(previous)
+    old_columns = np.full(previous.size, -1, dtype=np.intp)
+    old_columns[previous.answer_ids] = np.arange(len(previous.answer_ids))
+    columns = np.where(rows[corpus.answer_ids] >= 0, old_columns[np.maximum(rows[corpus.answer_ids], 0)], -1)
+
+    new_rows = np.flatnonzero(rows < 0)
+    kept_rows = np.flatnonzero(rows >= 0)
+    new_columns = np.flatnonzero(columns < 0)
+    kept_columns = np.flatnonzero(columns >= 0)
+    matrix = np.empty((corpus.size, len(corpus.answer_ids)), dtype=old.dtype)
+    for start in range(0, len(kept_rows), chunk_size):
+        chunk = kept_rows[start:start + chunk_size]
+        matrix[np.ix_(chunk, kept_columns)] = old[rows[chunk]][:, columns[kept_columns]]
+    answer_codes = corpus.codes[corpus.answer_ids]
+    if len(new_columns):
+        matrix[:, new_columns] = build_pattern_matrix(corpus.codes, answer_codes[new_columns], chunk_size)
+    if len(new_rows):
+        matrix[new_rows] = build_pattern_matrix(corpus.codes[new_rows], answer_codes, chunk_size)
+    save_pattern_matrix(matrix, path)
+    return path
+
+
+def main():
+    from wordle_assistant.corpus import get_corpus
+
+    parser = argparse.ArgumentParser(description="Build the cached guess x answer pattern matrix.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if a cached matrix exists.")
+    parser.add_argument("--length", type=int, default=config.DEFAULT_WORD_LENGTH, help="Word length of the variant.")
+    parser.add_argument("--language", type=str, default=config.DEFAULT_LANGUAGE, help="Language of the variant.")
+    args = parser.parse_args()
+
+    corpus = get_corpus(args.length, args.language)
+    path = pattern_matrix_path(corpus.words, corpus.words[corpus.answer_ids])
+    if args.force and os.path.exists(path):
+        os.remove(path)
+
+    start = time.perf_counter()
+    matrix = load_pattern_matrix(corpus)
+    print(f"Pattern matrix {matrix.shape[0]} x {matrix.shape[1]} ready at {path} ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import numpy as np
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.metrics import candidates_arg, instrument
+
+
+def top_k_order(scores: np.ndarray, k: int = None, tiebreak: Sequence[np.ndarray] = ()) -> np.ndarray:
+    """
+    Returns the positions of the k highest scores, best first, without sorting everything.
+
+    np.partition finds the k-th best score in linear time; only the scores at or above it
+    are sorted. Ties are broken by the tiebreak keys (ascending, in priority order), then
+    by position.
+
+    Args:
+      scores (np.ndarray): Scores, higher is better.
+      k (int): Number of positions to return; None sorts every score.
+      tiebreak (Sequence[np.ndarray]): Secondary sort keys aligned with scores.
+
+    Returns:
+      np.ndarray: Up to k positions into scores.
+    """
+    n = len(scores)
+    selected = np.arange(n)
+    if k is not None and k < n:
+        if k <= 0:
+            return selected[:0]
+        kth_best = np.partition(scores, n - k)[n - k]
+        selected = np.flatnonzero(scores >= kth_best)
+    keys = [key[selected] for key in reversed(tiebreak)]
+    return selected[np.lexsort((selected, *keys, -scores[selected]))][:k]
+
+
+def frequency_scores(corpus, candidates: np.ndarray) -> np.ndarray:
+    """
+    Array version of the letter-frequency ranking of get_word_rank().
+
+    Letter frequencies are computed separately over the remaining common and uncommon
+    words; each word scores the summed frequency of its unique letters, plus 1 for
+    common words so they always rank above uncommon ones.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      candidates (np.ndarray): Boolean mask of words that are still possible.
+
+    Returns:
+      np.ndarray: float32 scores over every corpus word id (only candidates are meaningful).
+    """
+    contains = corpus.index.contains  # (26, N) unique letters of each word
+    counts = corpus.index.counts  # (26, N) letter copies in each word
+    scores = np.zeros(corpus.size, dtype=np.float32)
+    for group, boost in ((corpus.common, 1.0), (~corpus.common, 0.0)):
+        members = candidates & group
+        if not members.any():
+            continue
+        letter_counts = counts[:, members].sum(axis=1, dtype=np.int64)
+        letter_freq = (letter_counts / letter_counts.sum()).astype(np.float32)
+        scores[group] = letter_freq @ contains[:, group] + boost
+    return scores
+
+
+def score_words(
+    corpus,
+    candidates: np.ndarray,
+    strategy: str = config.DEFAULT_RANK_STRATEGY,
+    guess_ids: np.ndarray = None
+) -> np.ndarray:
+    """
+    Scores words as guesses with a ranking strategy, without building DataFrames.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      candidates (np.ndarray): Boolean mask of words that are still possible.
+      strategy (str): One of config.RANK_STRATEGIES.
+      guess_ids (np.ndarray): Corpus ids of the words to score; defaults to every word.
+
+    Returns:
+      np.ndarray: float32 scores, one per guess, higher is better.
+    """
+    if strategy == "frequency":
+        scores = frequency_scores(corpus, candidates)
+        return scores if guess_ids is None else scores[guess_ids]
+    elif strategy in ("entropy", "remaining"):
+        from wordle_assistant.entropy import expected_information
+        return expected_information(corpus, candidates, guess_ids, metric=strategy)
+    raise ValueError(f"Unknown ranking strategy '{strategy}'.")
+
+
+@instrument("rank_guesses", size=candidates_arg)
+def rank_guesses(
+    corpus,
+    candidates: np.ndarray,
+    strategy: str = config.DEFAULT_RANK_STRATEGY,
+    allowed: np.ndarray = None,
+    limit: int = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ranks the legal guesses, best first (ties go to common words, then alphabetical order).
+
+    Only the allowed words are scored, so a smaller allowed set (e.g. in hard mode) makes
+    the information strategies proportionally cheaper.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      candidates (np.ndarray): Boolean mask of words that are still possible.
+      strategy (str): One of config.RANK_STRATEGIES.
+      allowed (np.ndarray): Boolean mask of the words that may be guessed; defaults to every word.
+      limit (int): Optional number of top words to return.
+
+    Returns:
+      Tuple[np.ndarray, np.ndarray]: Corpus word ids and their float32 scores.
+    """
+    if allowed is None:
+        ids = np.arange(corpus.size)
+        scores = score_words(corpus, candidates, strategy)
+    else:
+        ids = np.flatnonzero(allowed)
+        scores = score_words(corpus, candidates, strategy, ids)
+    order = top_k_order(scores, limit, (~corpus.common[ids], ids))
+    return ids[order], scores[order]
+
+
+def rank_candidates(
+    corpus,
+    candidates: np.ndarray,
+    strategy: str = config.DEFAULT_RANK_STRATEGY,
+    limit: int = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ranks the remaining words, best first (ties go to common words, then alphabetical order).
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      candidates (np.ndarray): Boolean mask of words that are still possible.
+      strategy (str): One of config.RANK_STRATEGIES.
+      limit (int): Optional number of top words to return.
+
+    Returns:
+      Tuple[np.ndarray, np.ndarray]: Corpus word ids and their float32 scores.
+    """
+    # Remaining words are always legal guesses, even in hard mode
+    return rank_guesses(corpus, candidates, strategy, candidates, limit)
+
+
+def board_frequency_scores(corpus, boards: np.ndarray) -> np.ndarray:
+    """
+    Sum of frequency_scores() over several boards, with one matrix product for all of them.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      boards (np.ndarray): Boolean candidate masks of shape (B, N), one row per board.
+
+    Returns:
+      np.ndarray: float32 scores over every corpus word id.
+    """
+    contains = corpus.index.contains
+    counts = corpus.index.counts
+    scores = np.zeros(corpus.size, dtype=np.float32)
+    for group, boost in ((corpus.common, 1.0), (~corpus.common, 0.0)):
+        letter_counts = boards[:, group].astype(np.float32) @ counts[:, group].T.astype(np.float32)  # (B, letters)
+        totals = letter_counts.sum(axis=1)
+        present = totals > 0
+        if not present.any():
+            continue
+        letter_freq = (letter_counts[present] / totals[present, None]).sum(axis=0)
+        scores[group] = letter_freq @ contains[:, group] + boost * present.sum()
+    return scores
+
+
+@instrument("rank_board_guesses", size=candidates_arg)
+def rank_board_guesses(
+    corpus,
+    boards: np.ndarray,
+    strategy: str = config.DEFAULT_RANK_STRATEGY,
+    allowed: np.ndarray = None,
+    limit: int = None,
+    shortlist: int = config.MULTI_BOARD_SHORTLIST
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ranks guesses for a multi-board game by their combined score over the unsolved boards.
+
+    The score of a guess is the sum of its per-board scores, i.e. its total expected
+    information for the information strategies. Boards with the same candidates are
+    scored once and counted with their multiplicity. With several distinct boards, every
+    guess is first scored against the union of their candidates and only the best
+    `shortlist` guesses are scored board by board, so the cost stays close to a single
+    board's instead of growing with the number of boards.
+
+    Args:
+      corpus (WordCorpus): The word corpus.
+      boards (np.ndarray): Boolean candidate masks of the unsolved boards, shape (B, N).
+      strategy (str): One of config.RANK_STRATEGIES.
+      allowed (np.ndarray): Boolean mask of the words that may be guessed; defaults to every word.
+      limit (int): Optional number of top words to return.
+      shortlist (int): Guesses scored per board when the boards differ. Defaults to config.MULTI_BOARD_SHORTLIST.
+
+    Returns:
+      Tuple[np.ndarray, np.ndarray]: Corpus word ids and their float32 scores.
+    """
+    ids = np.arange(corpus.size) if allowed is None else np.flatnonzero(allowed)
+    if strategy == "frequency":
+        scores = board_frequency_scores(corpus, boards)[ids]
+    elif strategy in ("entropy", "remaining"):
+        from wordle_assistant.entropy import board_information, expected_information
+        first: Dict[bytes, int] = {}  # Boards with the same candidates are scored once
+        multiplicity: Dict[bytes, int] = {}
+        for board, row in enumerate(np.packbits(boards, axis=1)):
+            key = row.tobytes()
+            first.setdefault(key, board)
+            multiplicity[key] = multiplicity.get(key, 0) + 1
+        distinct = boards[list(first.values())]
+        multiplicity = np.array(list(multiplicity.values()))
+        depth = max(shortlist, limit or 0)
+        if len(distinct) > 1 and len(ids) > depth:
+            union_scores = expected_information(corpus, distinct.any(axis=0), ids, metric=strategy)
+            ids = ids[top_k_order(union_scores, depth, (~corpus.common[ids], ids))]
+        scores = board_information(corpus, distinct, ids, multiplicity, metric=strategy)
+    else:
+        raise ValueError(f"Unknown ranking strategy '{strategy}'.")
+    order = top_k_order(scores, limit, (~corpus.common[ids], ids))
+    return ids[order], scores[order]
@@ -0,0 +1,313 @@
+"""
+Append-only session log, so games survive a restart of the CLI or the server.
+
+Each change to a user's game is appended as one JSON line:
+"join" (variant, hard mode, answer), "guess" (the guess, its letter states and the packed
+candidate and hard-mode masks after it), "undo", "done" and "leave". Records are written and
+flushed by a writer thread, so appending never waits on the disk. Restoring reads the log
+once and rebuilds every user from the stored masks, so no guess is filtered again (only a
+session whose word lists changed since it was logged is replayed). Compaction rewrites the
+log without finished, idle or undone records, in a background thread.
+"""
+import base64
+import json
+import os
+import threading
+import time
+import warnings
+import zlib
+import numpy as np
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.game_manager import WordleGame, WordleUser
+from wordle_assistant.pattern_matrix import word_list_hash
+
+Record = Dict[str, Any]
+
+
+def corpus_fingerprint(corpus) -> str:
+    """
+    Returns the word list hash of a corpus, so masks are only reused with the same word ids.
+    """
+    if "fingerprint" not in corpus.cache:
+        corpus.cache["fingerprint"] = word_list_hash(corpus.words, corpus.words[corpus.answer_ids])
+    return corpus.cache["fingerprint"]
+
+
+def encode_mask(packed: Optional[np.ndarray]) -> Optional[str]:
+    """
+    Encodes a packed mask as base64 text, or None for a missing mask.
+
+    Masks are deflated first: after a guess or two nearly every bit is 0, so a mask of
+    thousands of words shrinks to a few dozen bytes.
+    """
+    return None if packed is None else base64.b64encode(zlib.compress(packed.tobytes(), 1)).decode("ascii")
+
+
+def decode_mask(text: Optional[str]) -> Optional[np.ndarray]:
+    """
+    Decodes a mask written by encode_mask().
+    """
+    return None if text is None else np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=np.uint8)
+
+
+class Session:
+    """
+    The records of one user that are still live: the join, the guesses not undone and the completion.
+    """
+
+    __slots__ = ("join", "guesses", "done", "updated")
+
+    def __init__(self, join: Record):
+        self.join = join
+        self.guesses: List[Record] = []
+        self.done: Optional[Record] = None
+        self.updated = join["t"]
+
+    def records(self) -> List[Record]:
+        return [self.join, *self.guesses] + ([self.done] if self.done else [])
+
+
+def read_sessions(lines: Iterable[str]) -> Dict[str, Session]:
+    """
+    Folds log lines into the live session of every user.
+
+    Lines that are not valid JSON (e.g. a write cut short by a crash) and records of
+    users without a join are skipped.
+
+    Args:
+      lines (Iterable[str]): An open log file or any iterable of lines.
+
+    Returns:
+      Dict[str, Session]: Sessions by username, in join order.
+    """
+    sessions: Dict[str, Session] = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        op, username = record.get("op"), record.get("user")
+        if op == "join":
+            sessions[username] = Session(record)
+            continue
+        session = sessions.get(username)
+        if session is None:
+            continue
+        session.updated = record.get("t", session.updated)
+        if op == "guess":
+            session.guesses.append(record)
+            session.done = None
+        elif op == "undo" and session.guesses:
+            session.guesses.pop()
+            session.done = None
+        elif op == "done":
+            session.done = record
+        elif op == "leave":
+            del sessions[username]
+    return sessions
+
+
+class SessionLog:
+    """
+    Append-only log of every game of a WordleGame, see the module docstring.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compact_every: int = config.SESSION_COMPACT_EVERY,
+        completed_ttl: float = config.SESSION_COMPLETED_TTL,
+        idle_ttl: float = config.SESSION_IDLE_TTL
+    ):
+        """
+        Args:
+          path (str): The log file, created if missing.
+          compact_every (int): Appended records after which a background compaction starts (0 never).
+          completed_ttl (float): Seconds a completed session is kept after its last record.
+          idle_ttl (float): Seconds an unfinished session is kept without new records.
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.completed_ttl = completed_ttl
+        self.idle_ttl = idle_ttl
+        self.lock = threading.Lock()  # Guards the file; held while writing, compacting or restoring
+        self.ready = threading.Condition()  # Guards the pending lines; held only briefly by appends
+        self.pending: List[str] = []
+        self.closed = False
+        self.appended = 0
+        self.compactor: Optional[threading.Thread] = None
+        self.skipped: Dict[str, str] = {}  # Users whose session could not be restored, with the reason
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        self.writer = threading.Thread(target=self.write_loop, name="session-writer", daemon=True)
+        self.writer.start()
+
+    def append(self, op: str, username: str, **fields):
+        """
+        Queues one record for the writer thread.
+        """
+        line = json.dumps({"op": op, "user": username, "t": round(time.time(), 3), **fields}) + "\n"
+        with self.ready:
+            self.pending.append(line)
+            self.ready.notify()
+
+    def write_pending(self) -> bool:
+        """
+        Writes and flushes the queued records; the caller holds `lock`.
+
+        Returns:
+          bool: Whether `compact_every` records were written since the last compaction.
+        """
+        with self.ready:
+            lines, self.pending = self.pending, []
+        if lines:
+            self.file.writelines(lines)
+            self.file.flush()  # Flushed to the OS per batch; a crash can only lose the batch being written
+            self.appended += len(lines)
+        return bool(self.compact_every and self.appended >= self.compact_every)
+
+    def write_loop(self):
+        """
+        Writer thread: writes records as they are queued, and starts a background compaction every `compact_every` records.
+        """
+        while True:
+            with self.ready:
+                while not self.pending and not self.closed:
+                    self.ready.wait()
+                if not self.pending:
+                    return
+            with self.lock:
+                due = self.write_pending()
+            if due:
+                self.compact_in_background()
+
+    def record_join(self, user: WordleUser):
+        self.append(
+            "join", user.username, length=user.corpus.length, language=user.corpus.language,
+            hard_mode=user.hard_mode, answer=user.answer, word_lists=corpus_fingerprint(user.corpus)
+        )
+
+    def record_guess(self, user: WordleUser):
+        self.append(
+            "guess", user.username, guess=user.guesses[-1], state="".join(map(str, user.letter_states[-1])),
+            candidates=encode_mask(user.packed_candidates), allowed=encode_mask(user.packed_allowed)
+        )
+
+    def record_undo(self, user: WordleUser):
+        self.append("undo", user.username)
+
+    def record_done(self, user: WordleUser):
+        self.append("done", user.username, word_found=user.word_found)
+
+    def record_leave(self, username: str):
+        self.append("leave", username)
+
+    def restore(self, game: WordleGame, usernames: Collection[str] = None) -> int:
+        """
+        Rebuilds every live session of the log (or only those of some users) into a game's users.
+
+        Candidate and hard-mode masks, including the undo history, come straight from the
+        log. A session logged against other word lists is replayed guess by guess instead.
+        Sessions of a variant whose word lists are gone are skipped with a warning and kept
+        in `skipped`, so one stale session does not stop the others from being restored.
+
+        Args:
+          game (WordleGame): The game the users are added to.
+          usernames (Collection[str]): Only restore these users; all if omitted.
+
+        Returns:
+          int: Number of sessions restored.
+        """
+        with self.lock:
+            self.write_pending()
+            with open(self.path, encoding="utf-8") as f:
+                sessions = read_sessions(f)
+        if usernames is not None:
+            sessions = {username: session for username, session in sessions.items() if username in usernames}
+        restored = 0
+        for username, session in sessions.items():
+            join = session.join
+            try:
+                corpus = get_corpus(join["length"], join["language"])
+                user = WordleUser(username, join["hard_mode"], corpus)
+                user.answer = join["answer"]
+                if join.get("word_lists") == corpus_fingerprint(corpus):
+                    for record in session.guesses:
+                        user.restore_guess(
+                            record["guess"], tuple(map(int, record["state"])), decode_mask(record["candidates"]), decode_mask(record["allowed"])
+                        )
+                else:
+                    for record in session.guesses:
+                        user.add_guess(record["guess"], tuple(map(int, record["state"])))
+            except ValueError as e:
+                self.skipped[username] = str(e)
+                continue
+            if session.done is not None:
+                user.mark_completed(session.done["word_found"])
+            user.session_log = self
+            game.users[username] = user
+            self.skipped.pop(username, None)
+            restored += 1
+        skipped = [username for username in sessions if username in self.skipped]
+        if skipped:
+            warnings.warn(f"Skipped {len(skipped)} logged sessions that cannot be restored: {', '.join(skipped)}")
+        return restored
+
+    def compact(self, now: float = None) -> int:
+        """
+        Rewrites the log with only the live records of the sessions worth keeping.
+
+        Completed sessions are dropped `completed_ttl` seconds after their last record and
+        unfinished ones after `idle_ttl`. The writer thread only waits while the records written
+        during the rewrite are copied over and the files are swapped.
+
+        Returns:
+          int: Number of sessions kept.
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            self.write_pending()
+            end = self.file.tell()
+            self.appended = 0
+        with open(self.path, "rb") as f:
+            sessions = read_sessions(f.read(end).decode("utf-8").splitlines())
+        kept = [
+            session for session in sessions.values()
+            if now - session.updated < (self.completed_ttl if session.done else self.idle_ttl)
+        ]
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as tmp:
+            for session in kept:
+                tmp.writelines((json.dumps(record) + "\n").encode("utf-8") for record in session.records())
+            with self.lock:
+                self.write_pending()
+                with open(self.path, "rb") as f:
+                    f.seek(end)
+                    tmp.write(f.read())  # Records appended while the rewrite ran
+                tmp.flush()
+                os.replace(tmp_path, self.path)
+                self.file.close()
+                self.file = open(self.path, "a", encoding="utf-8")
+        return len(kept)
+
+    def compact_in_background(self) -> threading.Thread:
+        """
+        Starts a compaction in a daemon thread, unless one is already running.
+        """
+        if self.compactor is None or not self.compactor.is_alive():
+            self.compactor = threading.Thread(target=self.compact, name="session-compactor", daemon=True)
+            self.compactor.start()
+        return self.compactor
+
+    def close(self):
+        with self.ready:
+            self.closed = True
+            self.ready.notify()
+        self.writer.join()  # Writes every queued record first
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            self.file.close()
@@ -1,50 +1,179 @@
 import argparse
-from wordle_assistant.core import get_word_rank
+import atexit
+import sys
+from wordle_assistant import core_config as config
+from wordle_assistant import metrics
+from wordle_assistant.batch import replay_file
 from wordle_assistant.game_manager import WordleGame
-from wordle_cli.display import display_feedback, display_game_result, display_ranked_words, command_prompt
+from wordle_assistant.opening_book import get_opening_book
+from wordle_assistant.sessions import SessionLog
+from wordle_cli.display import (
+    display_board_feedback, display_boards_result, display_feedback, display_game_result, display_ranked_words,
+    command_prompt, get_board_ranked_df, get_ranked_df, ranked_pages
+)
+
+def play_boards(game, book, mode: str, boards: int):
+    """
+    Plays a multi-board game (e.g. --boards 4 for Quordle): each guess goes to every unsolved board.
+
+    Type 'undo' to take back a guess or 'quit' to stop.
+    """
+    length = book.corpus.length
+    username = input("Enter your username: ")
+    answers = None
+    if mode == "game":
+        print(f"Game mode: {boards} random common words have been assigned.")
+    elif mode == "test":
+        answers = [input(f"Enter the correct answer for board {board}: ").strip().lower() for board in range(1, boards + 1)]
+    else:
+        print("Blind mode: You will manually enter feedback for each board.")
+    game.add_multi_board_user(username, boards, answers=answers)
+    user = game.users[username]
+    book = get_opening_book(book.strategy, user.corpus.length, user.corpus.language, user.corpus.version)  # Same word list version as the game
+
+    print("\nSuggested opening guesses:")
+    display_ranked_words(get_board_ranked_df(book, user), 5)
+
+    while not user.completed:
+        guess = input(f"Enter your guess ({len(user.guesses) + 1}/{user.max_guesses}): ").strip().lower()
+        if guess in ("quit", "exit"):
+            print("Exiting the game. Goodbye!")
+            return
+        if guess == "undo":
+            if user.guesses:
+                print(f"Removed guess '{user.undo_guess()[0]}'.")
+                display_ranked_words(get_board_ranked_df(book, user))
+            else:
+                print("No guesses to undo.")
+            continue
+        if len(guess) != length:
+            print(f"Invalid guess. Please enter a {length}-letter word.")
+            continue
+        if not set(guess) <= set(user.corpus.alphabet):
+            print(f"Invalid guess. Please only use the letters {user.corpus.alphabet}.")
+            continue
+
+        if mode == "blind":
+            print("Legend: | 0 = ⬜ Gray | 1 = 🟩 Green | 2 = 🟨 Yellow | ")
+            letter_states = [None] * boards
+            for board in range(boards):
+                while user.solved_at[board] is None and letter_states[board] is None:
+                    feedback = input(f"Enter feedback for board {board + 1} ({length} numbers): ")
+                    if len(feedback) == length and set(feedback) <= set("012"):
+                        letter_states[board] = tuple(map(int, feedback))
+                    else:
+                        print(f"Invalid feedback. Please enter exactly {length} numbers (0, 1, or 2).")
+            game.add_board_feedback(username, guess, letter_states)
+        else:
+            letter_states = game.process_guess_feedback(username, guess)
+
+        display_board_feedback(letter_states)
+        if not user.completed:
+            display_ranked_words(get_board_ranked_df(book, user))
+    display_boards_result(username, user)
 
 def main():
     parser = argparse.ArgumentParser(description="Wordle Assistant CLI")
-    parser.add_argument("--mode", type=str, choices=["game", "test", "blind"], required=True, help="Select mode: game, test, or blind.")
+    parser.add_argument("--mode", type=str, choices=["game", "test", "blind", "batch"], required=True, help="Select mode: game, test, blind, or batch.")
+    parser.add_argument("--strategy", type=str, choices=config.RANK_STRATEGIES, default=config.DEFAULT_RANK_STRATEGY, help="Word ranking strategy.")
+    parser.add_argument("--length", type=int, default=config.DEFAULT_WORD_LENGTH, help="Word length of the variant to play.")
+    parser.add_argument("--language", type=str, default=config.DEFAULT_LANGUAGE, help="Language of the variant to play.")
+    parser.add_argument("--difficulty", type=float, default=config.ANSWER_DIFFICULTY, help="Game mode: favour answers that take more guesses (0 = uniform; needs the minimax analysis).")
+    parser.add_argument("--boards", type=int, default=1, help="Number of boards played at once (2 = Dordle, 4 = Quordle, up to 16).")
+    parser.add_argument("--hard", action="store_true", help="Hard mode: every guess must reuse the revealed hints.")
+    parser.add_argument("--sessions", type=str, default=None, help="Append-only session log; an unfinished game of the same username is resumed (default: $WORDLE_SESSION_LOG).")
+    parser.add_argument("--input", type=str, default="-", help="Batch mode: JSONL file of recorded games ('-' for stdin).")
+    parser.add_argument("--output", type=str, default="-", help="Batch mode: JSONL file for the results ('-' for stdout).")
+    parser.add_argument("--no-audit", action="store_true", help="Batch mode: only filter, skip ranking the recommended guesses.")
+    parser.add_argument("--metrics", type=str, nargs="?", const=config.METRICS_OUTPUT, default=None, help="Record timings of the hot paths and write a report at exit (.json, or .prom for Prometheus text).")
+    parser.add_argument("--profile", action="store_true", help="With --metrics: also save a cProfile profile next to the report.")
+    parser.add_argument("--trace-memory", action="store_true", help="With --metrics: also record allocations with tracemalloc.")
     args = parser.parse_args()
+    if args.boards != 1:
+        if not 2 <= args.boards <= config.MULTI_BOARD_MAX:
+            parser.error(f"--boards must be 1 or from 2 to {config.MULTI_BOARD_MAX}.")
+        if args.hard or args.sessions:
+            parser.error("--hard and --sessions are not supported with --boards.")
+    elif args.sessions is None:
+        args.sessions = config.SESSION_LOG
+
+    if args.metrics or args.profile or args.trace_memory:
+        metrics.enable(args.metrics, profile=args.profile, trace_memory=args.trace_memory)
+
+    if args.mode == "batch":
+        count = replay_file(
+            args.input, args.output, None if args.no_audit else args.strategy, word_length=args.length, language=args.language
+        )
+        print(f"Replayed {count} games.", file=sys.stderr)
+        return
     
-    game = WordleGame()
+    try:
+        book = get_opening_book(args.strategy, args.length, args.language) # Rankings shared by every game, cached by feedback history
+    except ValueError as e:
+        parser.error(str(e))
+    if args.boards > 1:
+        play_boards(WordleGame(args.hard, args.length, args.language, difficulty=args.difficulty), book, args.mode, args.boards)
+        return
+
+    session_log = SessionLog(args.sessions) if args.sessions else None
+    game = WordleGame(args.hard, args.length, args.language, difficulty=args.difficulty, session_log=session_log)
+    if session_log is not None:
+        atexit.register(session_log.close)  # Writes the records still queued, however the game ends
+        session_log.restore(game)
+    length = book.corpus.length
     username = input("Enter your username: ")
-    game.add_user(username)
+    user = game.users.get(username)
 
-    if args.mode == "game":
-        print("Game mode: A random common word has been assigned.")
-    elif args.mode == "test":
-        answer = input("Enter the correct Wordle answer for this game: ").strip().lower()
-        game.users[username].answer = answer
+    if user is not None and not user.completed and user.corpus is book.corpus:
+        print(f"Resuming your game after {len(user.guesses)} guesses: {', '.join(user.guesses) or 'none yet'}.")
     else:
-        print("Blind mode: You will manually enter feedback.")
+        game.remove_user(username)  # A finished game (or one of another variant) starts over
+        answer = None
+        if args.mode == "game":
+            print("Game mode: A random common word has been assigned.")
+        elif args.mode == "test":
+            answer = input("Enter the correct Wordle answer for this game: ").strip().lower()
+        else:
+            print("Blind mode: You will manually enter feedback.")
+        game.add_user(username, answer=answer)
+    corpus = game.users[username].corpus
+    book = get_opening_book(args.strategy, corpus.length, corpus.language, corpus.version)  # Same word list version as the game, even after a reload
+
+    print("\nSuggested guesses:" if game.users[username].guesses else "\nSuggested opening guesses:")
+    display_ranked_words(get_ranked_df(book, game.users[username]), 5)
         
     while game.active and not game.users[username].completed:
       guess = input("Enter your guess: ").strip().lower()
 
-      if len(guess) != 5:
-          print("Invalid guess. Please enter a 5-letter word.")
+      if len(guess) != length:
+          print(f"Invalid guess. Please enter a {length}-letter word.")
+          continue
+
+      if not set(guess) <= set(corpus.alphabet):
+          print(f"Invalid guess. Please only use the letters {corpus.alphabet}.")
+          continue
+
+      if not game.users[username].is_allowed(guess):
+          print("Hard mode: guesses must be known words that use every revealed hint.")
           continue
 
       if args.mode == "blind":
           print("Legend: | 0 = ⬜ Gray | 1 = 🟩 Green | 2 = 🟨 Yellow | ")
-          feedback = input("Enter feedback (5 numbers): ")
-          if len(feedback) != 5 or not feedback.isdigit():
-              print("Invalid feedback. Please enter exactly 5 numbers (0, 1, or 2).")
+          feedback = input(f"Enter feedback ({length} numbers): ")
+          if len(feedback) != length or not set(feedback) <= set("012"):
+              print(f"Invalid feedback. Please enter exactly {length} numbers (0, 1, or 2).")
               continue
           letter_state = tuple(map(int, feedback))
+          game.users[username].add_guess(guess, letter_state) # Step 1: Add the guess (which auto-filters the word list)
       else:
-          letter_state = game.process_guess_feedback(username, guess)
+          letter_state = game.process_guess_feedback(username, guess) # Step 1: Scores and adds the guess
 
-     # !! Need to trace letter state & create add_letter_state(): to use users[username].add_letter_state() 
       display_feedback(letter_state) # Display feedback (colors)
-      game.users[username].add_guess(guess, letter_state) # Step 1: Add the guess (which auto-filters the word list)
-      game.users[username].word_list_df = get_word_rank(game.users[username].word_list_df) # Step 2: Rank only the remaining valid words
-      display_ranked_words(game.users[username].word_list_df) # Display ranked words based on updated rankings
+      pages = ranked_pages(book, game.users[username]) # Step 2: Rank only the remaining valid words, a page at a time
+      display_ranked_words(next(pages)[1]) # Display ranked words based on updated rankings
       
       # Handle post-guess commands
-      if not command_prompt(game, username):
+      if not command_prompt(game, username, pages, book):
           break  # Exit the game if the user chooses to quit
 
       # Check if game is completed
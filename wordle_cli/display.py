@@ -1,5 +1,14 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, Tuple
 from wordle_assistant.core import get_possible_words, get_possible_common, sort_words
+from wordle_assistant.metrics import input_rows, instrument
+from wordle_assistant import core_config as config
+from wordle_assistant.opening_book import history_key
+from wordle_assistant.ranking import rank_board_guesses, rank_candidates, rank_guesses, top_k_order
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def format_possible_common(word_list_df: pd.DataFrame) -> str:
@@ -25,6 +34,19 @@ def display_feedback(letter_state: tuple):
     feedback_display = ''.join(['🟩' if s == 1 else '🟨' if s == 2 else '⬜' for s in letter_state])
     print(f"Feedback: {feedback_display}")
 
+
+def display_board_feedback(letter_states: list):
+    """
+    Displays the feedback of every board of a multi-board guess, skipping boards solved earlier.
+
+    Args:
+      letter_states (list): One letter state tuple per board, None for boards already solved.
+    """
+    for board, letter_state in enumerate(letter_states, start=1):
+        if letter_state is not None:
+            feedback_display = ''.join(['🟩' if s == 1 else '🟨' if s == 2 else '⬜' for s in letter_state])
+            print(f"Board {board}: {feedback_display}")
+
         
 def display_sorted_words(word_list_df: pd.DataFrame, max_uncommon: int = 10):
     """
@@ -61,6 +83,20 @@ def display_sorted_words(word_list_df: pd.DataFrame, max_uncommon: int = 10):
         print(f"\nUncommon words ({len(uncommon_words)} total, showing up to {max_uncommon}):")
         print(", ".join(uncommon_words[:max_uncommon]) + ("..." if len(uncommon_words) > max_uncommon else ""))
 
+def display_boards_result(username: str, user):
+    """
+    Displays the result of a multi-board game.
+
+    Args:
+      username (str): The player's username.
+      user: The MultiBoardUser instance.
+    """
+    solved = sum(turn is not None for turn in user.solved_at)
+    if user.word_found:
+        print(f"🎉 Congratulations {username}! You solved all {user.boards} boards in {len(user.guesses)} guesses! 🎉")
+    else:
+        print(f"❌ Game over. You solved {solved} of {user.boards} boards. The words were: {', '.join(user.answers)}")
+
 def display_game_result(username: str, user):
     """
     Displays the game result (win/lose) for the user.
@@ -74,13 +110,15 @@ def display_game_result(username: str, user):
     else:
         print(f"❌ Game over. The correct word was: {user.answer}")
 
-def display_ranked_words(word_list_df: pd.DataFrame, max_words: int = 10):
+@instrument("display_ranked_words", size=input_rows)
+def display_ranked_words(word_list_df: pd.DataFrame, max_words: int = 10, start: int = 1):
     """
     Displays the top-ranked words in order with their rank scores, excluding eliminated words.
 
     Args:
       word_list_df (pd.DataFrame): The word list DataFrame.
       max_words (int): Maximum number of words to display. Defaults to 10.
+      start (int): Position shown for the first word, for pages after the first. Defaults to 1.
     """
     # Ensure ranking is calculated
     if "rank" not in word_list_df.columns:
@@ -90,18 +128,121 @@ def display_ranked_words(word_list_df: pd.DataFrame, max_words: int = 10):
     # Filter out eliminated words
     valid_words_df = word_list_df[word_list_df["eliminated"] == False]
 
-    # Sort by rank (higher rank first) and limit display count
-    ranked_df = valid_words_df.sort_values(by="rank", ascending=False).head(max_words).reset_index(drop=True)
+    # Select the top words by rank (higher rank first) without sorting the rest
+    ranked_df = valid_words_df.iloc[top_k_order(valid_words_df["rank"].to_numpy(dtype=float), max_words)]
 
     if ranked_df.empty:
-        print("\nNo valid words remaining.")
+        print("\nNo valid words remaining." if start == 1 else "\nNo more words.")
         return
 
-    print("\nTop Ranked Words:")
-    for rank_position, row in enumerate(ranked_df.itertuples(index=False), start=1):
+    print("\nTop Ranked Words:" if start == 1 else "\nMore Ranked Words:")
+    for rank_position, row in enumerate(ranked_df.itertuples(index=False), start=start):
         print(f"{rank_position}. {row.word} - Rank: {row.rank:.3f}")
 
-def command_prompt(game, username):
+def ranked_words_df(corpus, shortlist) -> pd.DataFrame:
+    """
+    Converts a ranked shortlist of (word, rank) pairs into the DataFrame display_ranked_words() expects.
+
+    Args:
+      corpus (WordCorpus): The word corpus, used to look up rarity.
+      shortlist (List[Tuple[str, float]]): Ranked words, best first.
+
+    Returns:
+      pd.DataFrame: A DataFrame with 'word', 'rarity', 'eliminated' and 'rank' columns.
+    """
+    import pandas as pd  # Deferred until something is actually displayed
+
+    words = [word for word, _ in shortlist]
+    is_common = [bool(corpus.common[corpus.index_of(word)]) for word in words]
+    return pd.DataFrame({
+        "word": words,
+        "rarity": ["common" if common else "uncommon" for common in is_common],
+        "eliminated": False,
+        "rank": [rank for _, rank in shortlist],
+    })
+
+def get_ranked_df(book, user) -> pd.DataFrame:
+    """
+    Ranks the user's remaining words through the opening book and converts them for display.
+
+    Args:
+      book (OpeningBook): The opening book of the chosen ranking strategy.
+      user: The WordleUser instance.
+
+    Returns:
+      pd.DataFrame: The ranked shortlist as a DataFrame.
+    """
+    shortlist = book.shortlist(history_key(user.guesses, user.letter_states), user.candidates)
+    return ranked_words_df(book.corpus, shortlist)
+
+def get_guesses_df(book, user, limit: int = 10) -> pd.DataFrame:
+    """
+    Ranks every word the user may guess next, including words that cannot be the answer.
+
+    In hard mode only the legal guesses are scored.
+
+    Args:
+      book (OpeningBook): The opening book of the chosen ranking strategy.
+      user: The WordleUser instance.
+      limit (int): Number of guesses to rank. Defaults to 10.
+
+    Returns:
+      pd.DataFrame: The ranked guesses as a DataFrame.
+    """
+    corpus = book.corpus
+    allowed = user.allowed if user.hard_mode else None
+    ids, scores = rank_guesses(corpus, user.candidates, book.strategy, allowed, limit)
+    return ranked_words_df(corpus, list(zip(corpus.words[ids].tolist(), scores.tolist())))
+
+def get_board_ranked_df(book, user, limit: int = 10) -> pd.DataFrame:
+    """
+    Ranks guesses for a multi-board user by their combined score over the unsolved boards.
+
+    Args:
+      book (OpeningBook): The opening book of the chosen ranking strategy (for its corpus and strategy).
+      user: The MultiBoardUser instance.
+      limit (int): Number of guesses to rank. Defaults to 10.
+
+    Returns:
+      pd.DataFrame: The ranked guesses as a DataFrame.
+    """
+    corpus = book.corpus
+    ids, scores = rank_board_guesses(corpus, user.candidates[user.unsolved], book.strategy, limit=limit)
+    return ranked_words_df(corpus, list(zip(corpus.words[ids].tolist(), scores.round(6).tolist())))
+
+def ranked_pages(book, user, page_size: int = 10) -> Iterator[Tuple[int, pd.DataFrame]]:
+    """
+    Yields the user's remaining words ranked best first, one page at a time.
+
+    The first pages come from the opening book's shortlist. Deeper pages are only ranked
+    when asked for, with a top-k selection twice as deep as the previous one, so paging
+    never sorts the whole word list. The first page is always yielded, even if empty.
+
+    Args:
+      book (OpeningBook): The opening book of the chosen ranking strategy.
+      user: The WordleUser instance.
+      page_size (int): Words per page. Defaults to 10.
+
+    Yields:
+      Tuple[int, pd.DataFrame]: Position of the page's first word and the page as a DataFrame.
+    """
+    corpus = book.corpus
+    candidates = user.candidates  # Snapshot, later guesses or undos start a new ranking
+    shortlist = book.shortlist(history_key(user.guesses, user.letter_states), candidates)
+    depth = config.OPENING_BOOK_SHORTLIST
+    shown = 0
+    while True:
+        while shown + page_size > len(shortlist) and len(shortlist) >= depth:
+            depth = max(depth * 2, shown + page_size)
+            ids, scores = rank_candidates(corpus, candidates, book.strategy, depth)
+            shortlist = list(zip(corpus.words[ids].tolist(), scores.round(6).tolist()))
+        page = shortlist[shown:shown + page_size]
+        if not page and shown:
+            return
+        yield shown + 1, ranked_words_df(corpus, page)
+        shown += len(page)
+
+def command_prompt(game, username, pages: Iterator[Tuple[int, pd.DataFrame]], book):
     """Handles post-guess commands from the user."""
     while True:
         print("Press Enter to continue or type a command (e.g., help):")
@@ -109,10 +250,27 @@ def command_prompt(game, username):
 
         if command == "help":
             print('''List of Commands:
-    more: Displays more possible answers
+    more: Displays the next possible answers
+    guesses: Displays the best guesses, including words that cannot be the answer
+    undo: Removes your last guess and its feedback
     quit: Exits the game''')
         elif command == "more":
-            display_ranked_words(game.users[username].word_list_df, 100)
+            start, page = next(pages, (0, None))
+            if page is None:
+                print("No more words.")
+            else:
+                display_ranked_words(page, start=start)
+        elif command == "guesses":
+            display_ranked_words(get_guesses_df(book, game.users[username]))
+        elif command == "undo":
+            user = game.users[username]
+            if not user.guesses:
+                print("No guesses to undo.")
+                continue
+            guess, _ = user.undo_guess()
+            print(f"Removed guess '{guess}'.")
+            pages = ranked_pages(book, user)
+            display_ranked_words(next(pages)[1])
         elif command == "quit" or command == "exit":
             print("Exiting the game. Goodbye!")
             return False  # Signal to exit the game
@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+import json
+from wordle_assistant import core_config as config
+from wordle_assistant import metrics
+from wordle_assistant.sessions import SessionLog
+from wordle_server.loadgen import run_load
+from wordle_server.server import DEFAULT_HOST, DEFAULT_PORT, GameServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wordle Assistant multiplayer server (localhost only)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the game server.")
+    serve_parser.add_argument("--strategy", type=str, choices=config.RANK_STRATEGIES, default=config.DEFAULT_RANK_STRATEGY, help="Word ranking strategy.")
+    serve_parser.add_argument("--hard", action="store_true", help="Play in hard mode unless a user opts out when joining.")
+    serve_parser.add_argument("--metrics", type=str, nargs="?", const=config.METRICS_OUTPUT, default=None, help="Record timings of the hot paths and write a report when the server stops.")
+    serve_parser.add_argument("--sessions", type=str, default=config.SESSION_LOG, help="Append-only session log; games are restored from it at startup.")
+    serve_parser.add_argument("--workers", type=int, default=None, help="Ranking worker processes (defaults to the CPU count).")
+
+    loadgen_parser = subparsers.add_parser("loadgen", help="Play many games against a running server and report throughput and latency.")
+    loadgen_parser.add_argument("--clients", type=int, default=100, help="Concurrent connections.")
+    loadgen_parser.add_argument("--games", type=int, default=1000, help="Total games to play.")
+    loadgen_parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this path.")
+
+    for subparser in (serve_parser, loadgen_parser):
+        subparser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port on localhost.")
+        subparser.add_argument("--unix", type=str, default=None, help="Use a Unix socket at this path instead of TCP.")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        if args.metrics:
+            metrics.enable(args.metrics)
+        session_log = SessionLog(args.sessions) if args.sessions else None
+        server = GameServer(args.strategy, workers=args.workers, hard_mode=args.hard, session_log=session_log)
+        try:
+            asyncio.run(server.serve(DEFAULT_HOST, args.port, args.unix))
+        except KeyboardInterrupt:
+            print("Server stopped.")
+        finally:
+            server.close()
+    else:
+        report = asyncio.run(run_load(args.clients, args.games, DEFAULT_HOST, args.port, args.unix))
+        print(json.dumps(report, indent=2))
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import random
+import time
+import numpy as np
+from collections import defaultdict
+from typing import *
+from wordle_assistant.corpus import get_corpus
+from wordle_server.server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class Client:
+    """
+    Minimal client for the line-based JSON protocol, recording the latency of every request.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latencies: Dict[str, List[float]]):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    @classmethod
+    async def connect(cls, latencies: Dict[str, List[float]], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None) -> "Client":
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, latencies)
+
+    async def request(self, **request) -> Dict[str, Any]:
+        """
+        Sends one request and waits for its response.
+        """
+        start = time.perf_counter()
+        self.writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies[request["op"]].append((time.perf_counter() - start) * 1000)
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play(client: Client, username: str, answer: str, max_turns: int = 6) -> int:
+    """
+    Plays one game through the server, always taking the top suggestion.
+
+    Returns:
+      int: Number of guesses made.
+    """
+    await client.request(op="join", user=username, answer=answer)
+    turns = 0
+    while turns < max_turns:
+        suggestions = (await client.request(op="suggest", user=username, limit=1)).get("suggestions")
+        if not suggestions:
+            break
+        response = await client.request(op="guess", user=username, guess=suggestions[0][0])
+        turns += 1
+        if not response.get("ok") or response.get("completed"):
+            break
+    await client.request(op="leave", user=username)
+    return turns
+
+
+async def run_load(clients: int, games: int, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Plays `games` games from `clients` concurrent connections and summarizes throughput and latency.
+
+    Args:
+      clients (int): Number of concurrent connections.
+      games (int): Total number of games to play.
+      host (str): Server host. Defaults to localhost.
+      port (int): Server port.
+      unix_path (str): Unix socket path, used instead of host/port if given.
+      seed (int): Seed for picking answers.
+
+    Returns:
+      Dict[str, Any]: The load test report.
+    """
+    corpus = get_corpus()
+    rng = random.Random(seed)
+    answers = [str(word) for word in corpus.words[corpus.answer_ids]]
+    queue: asyncio.Queue = asyncio.Queue()
+    for game_number in range(games):
+        queue.put_nowait((f"load-{game_number}", rng.choice(answers)))
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    turns: List[int] = []
+
+    async def worker():
+        client = await Client.connect(latencies, host, port, unix_path)
+        try:
+            while not queue.empty():
+                username, answer = queue.get_nowait()
+                turns.append(await play(client, username, answer))
+        finally:
+            await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [ms for samples in latencies.values() for ms in samples]
+    return {
+        "clients": clients,
+        "games": len(turns),
+        "requests": len(all_latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1) if elapsed else None,
+        "games_per_s": round(len(turns) / elapsed, 2) if elapsed else None,
+        "latency_ms": {op: summarize(samples) for op, samples in [("all", all_latencies), *sorted(latencies.items())]},
+    }
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarizes latency samples in ms.
+    """
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples)
+    return {
+        "count": len(values),
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p99": round(float(np.percentile(values, 99)), 3),
+        "p999": round(float(np.percentile(values, 99.9)), 3),
+        "max": round(float(values.max()), 3),
+    }
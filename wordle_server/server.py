@@ -0,0 +1,299 @@
+import asyncio
+import json
+import os
+import time
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import *
+from wordle_assistant import core_config as config
+from wordle_assistant.corpus import get_corpus
+from wordle_assistant.game_manager import WordleGame
+from wordle_assistant.opening_book import ensure_opening_book, get_opening_book, history_key
+from wordle_assistant.ranking import rank_guesses
+from wordle_assistant.sessions import SessionLog
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class ProtocolError(Exception):
+    """
+    A request that cannot be served; reported back to the client as {"ok": false, "error": ...}.
+    """
+
+
+def request_field(request: Dict[str, Any], name: str, kinds: Tuple[type, ...], default: Any = None) -> Any:
+    """
+    Returns a request field, or the default if it is missing or null.
+
+    Raises:
+      ProtocolError: If the field has another JSON type (true/false only count as bool).
+    """
+    value = request.get(name)
+    if value is None:
+        return default
+    if not isinstance(value, kinds) or (isinstance(value, bool) and bool not in kinds):
+        raise ProtocolError(f"Field '{name}' must be of type {' or '.join(kind.__name__ for kind in kinds)}.")
+    return value
+
+
+def rank_shortlist(
+    strategy: str,
+    key,
+    packed_candidates: np.ndarray,
+    limit: int,
+    word_length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE,
+    version: str = None
+) -> List[Tuple[str, float]]:
+    """
+    Executor entry point: ranks one user's remaining words through the process-wide opening book.
+
+    Runs in a worker process, so the corpus, pattern matrix and opening book of each variant
+    are loaded once per worker and the event loop never does ranking work itself. The
+    user's corpus version is passed along, so a worker ranks with the same word ids as the
+    game even while the word lists are being hot-reloaded.
+    """
+    corpus = get_corpus(word_length, language, version)
+    candidates = np.unpackbits(packed_candidates, count=corpus.size).view(bool)
+    return get_opening_book(strategy, word_length, language, version).shortlist(key, candidates)[:limit]
+
+
+def rank_allowed(
+    strategy: str,
+    packed_candidates: np.ndarray,
+    packed_allowed: Optional[np.ndarray],
+    limit: int,
+    word_length: int = config.DEFAULT_WORD_LENGTH,
+    language: str = config.DEFAULT_LANGUAGE,
+    version: str = None
+) -> List[Tuple[str, float]]:
+    """
+    Executor entry point: ranks every word one user may guess, not only the remaining ones.
+
+    In hard mode only the legal guesses are scored, so the work shrinks with the allowed set.
+    """
+    corpus = get_corpus(word_length, language, version)
+    candidates = np.unpackbits(packed_candidates, count=corpus.size).view(bool)
+    allowed = None if packed_allowed is None else np.unpackbits(packed_allowed, count=corpus.size).view(bool)
+    ids, scores = rank_guesses(corpus, candidates, strategy, allowed, limit)
+    return [(str(word), round(float(score), 6)) for word, score in zip(corpus.words[ids], scores)]
+
+
+def warm_up(strategy: str):
+    """
+    Executor initializer: loads the default corpus and opening book before the first request arrives.
+
+    Other word lengths and languages are loaded by each worker the first time they are played.
+    """
+    get_opening_book(strategy).shortlist(())
+
+
+class GameServer:
+    """
+    Hosts many concurrent WordleUser sessions over a line-based JSON protocol.
+
+    Each request and response is one JSON object per line. Requests carry an "op"
+    ("join", "guess", "suggest", "undo", "leave", "stats") and, except for "stats",
+    a "user" name. An optional "id" is echoed back so clients can pipeline requests.
+    "join" may set "hard_mode", "length" and "language" (the variant's word lists are
+    loaded the first time anyone plays it), and "suggest" may rank the whole "pool": "guesses"
+    (every legal guess) instead of the default "candidates" (remaining words).
+
+    With a session log, games outlive their connection and the server: the log is restored
+    at startup, and joining as a user whose connection is gone resumes their game. Games
+    without a connection are only kept in memory until they are completed or idle for
+    config.SESSION_DETACHED_TTL seconds; joining again restores them from the log.
+    """
+
+    def __init__(
+        self,
+        strategy: str = config.DEFAULT_RANK_STRATEGY,
+        executor: Executor = None,
+        workers: int = None,
+        hard_mode: bool = False,
+        session_log: SessionLog = None
+    ):
+        self.strategy = strategy
+        self.game = WordleGame(hard_mode, session_log=session_log)
+        self.session_log = session_log
+        self.attached: Set[str] = set()  # Users joined on a live connection
+        self.detached: "OrderedDict[str, float]" = OrderedDict()  # Other users in memory, by the time their connection closed
+        self.evicted: Set[str] = set()  # Logged users dropped from memory, restored when they join again
+        if session_log is not None:
+            session_log.restore(self.game)
+            session_log.compact_in_background()
+            self.detach(list(self.game.users), time.monotonic())
+        ensure_opening_book(strategy)  # Saved before the workers start, so every worker serves the first turns from it
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1, initializer=warm_up, initargs=(strategy,)
+        )
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+
+    async def dispatch(self, request: Dict[str, Any], owned: Set[str]) -> Dict[str, Any]:
+        """
+        Serves one decoded request.
+
+        Args:
+          request (Dict[str, Any]): The request object.
+          owned (Set[str]): Users joined on this connection, removed when it closes.
+
+        Returns:
+          Dict[str, Any]: The response object.
+        """
+        op = request.get("op")
+        if op == "stats":
+            return {"ok": True, "users": len(self.game.users), "connections": self.connections, "requests": self.requests, "errors": self.errors}
+
+        username = request.get("user")
+        if not isinstance(username, str) or not username:
+            raise ProtocolError("Missing 'user'.")
+
+        if op == "join":
+            if username in self.evicted and username not in self.game.users:
+                self.evicted.discard(username)
+                await asyncio.get_running_loop().run_in_executor(None, self.session_log.restore, self.game, {username})
+            if username in self.game.users:
+                if self.session_log is None or username in self.attached:
+                    raise ProtocolError(f"User '{username}' already joined.")
+                user = self.game.users[username]  # Resume a logged game
+                owned.add(username)
+                self.attached.add(username)
+                self.detached.pop(username, None)
+                return {"ok": True, "user": username, "hard_mode": user.hard_mode, "resumed": True, "guesses": user.guesses, "completed": user.completed}
+            word_length = request_field(request, "length", (int,), self.game.word_length)
+            language = request_field(request, "language", (str,), self.game.language)
+            corpus = get_corpus(word_length, language)
+            answer = request_field(request, "answer", (str,))
+            if answer is not None and answer not in corpus:
+                raise ProtocolError(f"Unknown answer '{answer}'.")
+            hard_mode = request_field(request, "hard_mode", (bool,))
+            self.game.add_user(username, hard_mode, word_length, language, answer)
+            owned.add(username)
+            self.attached.add(username)
+            return {"ok": True, "user": username, "hard_mode": self.game.users[username].hard_mode}
+
+        user = self.game.users.get(username)
+        if user is None or username not in owned:
+            raise ProtocolError(f"User '{username}' has not joined on this connection.")
+
+        if op == "guess":
+            guess = request_field(request, "guess", (str,), "").strip().lower()
+            if guess not in user.corpus:
+                raise ProtocolError(f"'{guess}' is not a valid word.")
+            if user.completed:
+                raise ProtocolError("Game already completed.")
+            # Filtering and the session log append run in a thread, so a guess never blocks the event loop
+            letter_state = await asyncio.get_running_loop().run_in_executor(None, self.game.process_guess_feedback, username, guess)
+            response = {"ok": True, "letter_state": list(letter_state), "completed": user.completed, "word_found": user.word_found}
+            if user.completed:
+                response["answer"] = user.answer
+            return response
+        elif op == "suggest":
+            limit = request_field(request, "limit", (int,), 10)
+            pool = request_field(request, "pool", (str,), "candidates")
+            loop = asyncio.get_running_loop()
+            if pool == "candidates":
+                key = history_key(user.guesses, user.letter_states)
+                shortlist = await loop.run_in_executor(
+                    self.executor, rank_shortlist, self.strategy, key, user.packed_candidates, limit, user.corpus.length, user.corpus.language, user.corpus.version
+                )
+            elif pool == "guesses":
+                shortlist = await loop.run_in_executor(
+                    self.executor, rank_allowed, self.strategy, user.packed_candidates, user.packed_allowed, limit, user.corpus.length, user.corpus.language, user.corpus.version
+                )
+            else:
+                raise ProtocolError(f"Unknown pool '{pool}'.")
+            return {"ok": True, "suggestions": [[word, rank] for word, rank in shortlist]}
+        elif op == "undo":
+            if not user.guesses:
+                raise ProtocolError("No guesses to undo.")
+            guess, _ = user.undo_guess()
+            return {"ok": True, "removed": guess}
+        elif op == "leave":
+            self.game.remove_user(username)
+            owned.discard(username)
+            self.attached.discard(username)
+            return {"ok": True}
+        raise ProtocolError(f"Unknown op '{op}'.")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Reads requests line by line from one client until it disconnects.
+        """
+        self.connections += 1
+        owned: Set[str] = set()
+        try:
+            while line := await reader.readline():
+                self.requests += 1
+                request: Dict[str, Any] = {}
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("Request must be a JSON object.")
+                    response = await self.dispatch(request, owned)
+                except (ProtocolError, ValueError, TypeError) as e:
+                    self.errors += 1
+                    response = {"ok": False, "error": str(e)}
+                if "id" in request:
+                    response["id"] = request["id"]
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            self.attached -= owned
+            if self.session_log is None:
+                for username in owned:
+                    self.game.users.pop(username, None)
+            else:
+                self.detach(owned, time.monotonic())
+            writer.close()
+
+    def detach(self, usernames: Iterable[str], now: float):
+        """
+        Keeps the games of users without a connection in memory for a while, then leaves them to the session log.
+
+        Completed games are dropped from memory at once, unfinished ones once they have been
+        detached for config.SESSION_DETACHED_TTL seconds. Both stay in the log, so joining
+        again restores them.
+        """
+        for username in usernames:
+            user = self.game.users.get(username)
+            if user is not None and user.completed:
+                self.evict(username)
+            elif user is not None:
+                self.detached[username] = now
+                self.detached.move_to_end(username)
+        while self.detached:
+            username, since = next(iter(self.detached.items()))
+            if now - since < config.SESSION_DETACHED_TTL:
+                break
+            self.evict(username)
+
+    def evict(self, username: str):
+        self.detached.pop(username, None)
+        if self.game.users.pop(username, None) is not None:
+            self.evicted.add(username)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None):
+        """
+        Serves clients on a localhost TCP port, or a Unix socket if unix_path is given, until cancelled.
+        """
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path, limit=2 ** 16)
+            print(f"Serving on {unix_path} ({self.strategy} ranking)")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port, limit=2 ** 16, backlog=4096)
+            print(f"Serving on {host}:{port} ({self.strategy} ranking)")
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        if self.session_log is not None:
+            self.session_log.close()